@@ -14,10 +14,90 @@ import click
 @click.option(
     "--query", "-q",
     "user_query",
-    required=True,
+    default=None,
     help="Natural language query to run against the OCI tenancy",
 )
-def main(profile: str | None, user_query: str) -> None:
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Threads for concurrent OCI SDK calls (overrides OCI_MAX_WORKERS, default: 8)",
+)
+@click.option(
+    "--verbose", "-v",
+    is_flag=True,
+    help="Log tool progress (e.g. per-bucket fetches) to stderr",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Print per-tool wall time, OCI request counts/latency, retries and payload sizes to stderr",
+)
+@click.option(
+    "--metrics-file",
+    default=None,
+    help="Write per-tool metrics in Prometheus text format to this file (env: METRICS_FILE)",
+)
+@click.option(
+    "--interactive", "-i",
+    is_flag=True,
+    help="Interactive session: keep one conversation and warm caches across queries (Ctrl-C stops a reply)",
+)
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Answer every query in a JSONL or YAML file concurrently, writing one JSON line per query to stdout",
+)
+@click.option(
+    "--batch-concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Queries answered at once in --batch mode (overrides BATCH_CONCURRENCY, default: 4)",
+)
+@click.option(
+    "--daemon",
+    is_flag=True,
+    help="Run as a long-lived daemon answering queries on a Unix socket, keeping sessions and caches warm",
+)
+@click.option(
+    "--connect",
+    is_flag=True,
+    help="Send the query to a running daemon (falls back to running in-process if none is listening)",
+)
+@click.option(
+    "--stop-daemon",
+    is_flag=True,
+    help="Ask the running daemon to shut down and exit",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    help="Daemon socket path (overrides DAEMON_SOCKET, default: ~/.cache/oci-agent/agent.sock)",
+)
+@click.option(
+    "--refresh-inventory",
+    is_flag=True,
+    help="Crawl the tenancy into the local inventory snapshot (for query_inventory) and exit",
+)
+def main(
+    profile: str | None,
+    user_query: str | None,
+    workers: int | None,
+    verbose: bool,
+    stats: bool,
+    metrics_file: str | None,
+    interactive: bool,
+    batch_file: str | None,
+    batch_concurrency: int | None,
+    daemon: bool,
+    connect: bool,
+    stop_daemon: bool,
+    socket_path: str | None,
+    refresh_inventory: bool,
+) -> None:
     """OCI DevOps Agent powered by Claude AI.
 
     Examples:
@@ -27,15 +107,102 @@ def main(profile: str | None, user_query: str) -> None:
       python main.py --profile DEFAULT -q "List all VCNs"
 
       python main.py -q "How many compute instances are running in compartment ocid1.compartment..."
+
+      python main.py --stats -q "Which buckets are largest?"
+
+      python main.py --refresh-inventory
+
+      python main.py -i
+
+      python main.py --batch compliance.yaml > results.jsonl
+
+      python main.py --daemon &  then  python main.py --connect -q "List all VCNs"
     """
-    # Import here so the OCI_PROFILE override takes effect before OCIAuth reads settings
+    if not user_query and not (refresh_inventory or interactive or batch_file or daemon or stop_daemon):
+        raise click.UsageError(
+            "Provide a query with -q/--query or use -i/--interactive, --batch, --refresh-inventory or --daemon."
+        )
+    if sum(map(bool, (interactive, batch_file, daemon or connect))) > 1:
+        raise click.UsageError("-i/--interactive, --batch and --daemon/--connect cannot be combined.")
+    if batch_file and user_query:
+        raise click.UsageError("--batch reads its queries from the file; drop -q/--query.")
+
+    # Apply the overrides before anything reads settings: the environment for settings built on
+    # first import, and the shared instance in case a module has already imported it.
+    import os
+
+    from src.oci_agent.config import settings
+
     if profile:
-        import os
         os.environ["OCI_PROFILE"] = profile
+        settings.oci_profile = profile
+    if workers is not None:
+        os.environ["OCI_MAX_WORKERS"] = str(workers)
+        settings.oci_max_workers = workers
+
+    batch_queries = None
+    if batch_file:
+        from src.oci_agent.batch import load_queries
+
+        try:
+            batch_queries = load_queries(batch_file)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--batch")
+
+    if stop_daemon or connect:
+        # Thin client: talk to the daemon without importing the agent, oci or the Claude SDK.
+        from src.oci_agent.daemon import request, run_query, socket_path as resolve_socket
+
+        if stop_daemon:
+            try:
+                list(request({"op": "shutdown"}, socket_path))
+            except OSError:
+                raise click.ClickException(f"No agent daemon is listening on {resolve_socket(socket_path)}")
+            click.echo("Agent daemon stopped.")
+            return
+        try:
+            ok = run_query(user_query, socket_path, profile=profile, stats=stats)
+        except OSError:
+            click.echo(f"[daemon] none listening on {resolve_socket(socket_path)}; running in-process", err=True)
+        else:
+            if not ok:
+                raise SystemExit(1)
+            return
+
+    if verbose:
+        import logging
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+
+    if refresh_inventory:
+        import json
+
+        from src.oci_agent.inventory import InventoryCrawler, get_store
+
+        report = asyncio.run(InventoryCrawler(get_store()).refresh())
+        click.echo(json.dumps(report, indent=2))
+        return
 
     from src.oci_agent.agent import OCIAgent
 
-    agent = OCIAgent(profile=profile)
+    agent = OCIAgent(profile=profile, stats=stats, metrics_file=metrics_file)
+    if daemon:
+        from src.oci_agent.daemon import AgentDaemon
+
+        asyncio.run(AgentDaemon(agent, socket_path).serve())
+        return
+    if batch_queries:
+        from src.oci_agent.batch import BatchRunner
+
+        records = asyncio.run(BatchRunner(agent, batch_concurrency).run(batch_queries))
+        agent.report()
+        if any(r["is_error"] for r in records):
+            raise SystemExit(1)
+        return
+    if interactive:
+        from src.oci_agent.session import InteractiveSession
+
+        asyncio.run(InteractiveSession(agent, first_query=user_query).run())
+        return
     asyncio.run(agent.run(user_query))
 
 
@@ -0,0 +1,255 @@
+"""Address-space analysis over VCN and subnet CIDR blocks.
+
+``AddressSpace`` loads every VCN and subnet CIDR block as an integer address
+interval into an ``IntervalIndex`` (blocks sorted by start, annotated with
+the largest end), so after loading, overlap and conflict checks are interval
+queries rather than pairwise comparisons. It reports:
+
+* overlaps between VCNs (in any compartment or region) and between subnets;
+* which existing blocks a candidate CIDR would clash with;
+* free, aligned blocks of a requested prefix length inside a VCN or CIDR;
+* per-VCN utilization — addresses covered by subnets and the largest free block.
+"""
+
+import ipaddress
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from .netindex import IntervalIndex, parse_network
+
+ADDRESS_BITS = {4: 32, 6: 128}
+
+
+@dataclass(frozen=True)
+class AddressBlock:
+    """One CIDR block of a VCN or subnet."""
+
+    kind: str  # "vcn" or "subnet"
+    id: str
+    display_name: str
+    cidr: str
+    first: int
+    last: int
+    version: int
+    vcn_id: str
+    region: str | None = None
+    compartment_id: str | None = None
+
+    @property
+    def size(self) -> int:
+        return self.last - self.first + 1
+
+    def to_dict(self) -> dict:
+        row = {
+            "kind": self.kind,
+            "id": self.id,
+            "display_name": self.display_name,
+            "cidr": self.cidr,
+            "compartment_id": self.compartment_id,
+        }
+        if self.kind == "subnet":
+            row["vcn_id"] = self.vcn_id
+        if self.region is not None:
+            row["region"] = self.region
+        return row
+
+
+def _format_cidr(first: int, prefix_len: int, version: int) -> str:
+    network = ipaddress.IPv4Network if version == 4 else ipaddress.IPv6Network
+    return str(network((first, prefix_len)))
+
+
+def merge_intervals(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping or adjacent closed intervals into sorted, disjoint ones."""
+    merged: list[tuple[int, int]] = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def gaps(container: tuple[int, int], used: Iterable[tuple[int, int]]) -> Iterator[tuple[int, int]]:
+    """Yield the sub-intervals of *container* not covered by *used*."""
+    cursor, end = container
+    for first, last in merge_intervals(used):
+        if last < cursor:
+            continue
+        if first > end:
+            break
+        if first > cursor:
+            yield cursor, first - 1
+        cursor = max(cursor, last + 1)
+    if cursor <= end:
+        yield cursor, end
+
+
+def aligned_blocks(first: int, last: int, bits: int) -> Iterator[tuple[int, int]]:
+    """Split ``[first, last]`` into the fewest aligned CIDR blocks, as ``(start, prefix_len)``."""
+    while first <= last:
+        size = first & -first if first else 1 << bits
+        while size > last - first + 1:
+            size >>= 1
+        yield first, bits - size.bit_length() + 1
+        first += size
+
+
+class AddressSpace:
+    """Interval index over the CIDR blocks of a set of VCNs and their subnets."""
+
+    def __init__(self, vcns: list[dict], subnets: list[dict]):
+        self.vcns = {v["id"]: v for v in vcns}
+        self.blocks: list[AddressBlock] = []
+        for v in vcns:
+            cidrs = [*(v.get("cidr_blocks") or [v.get("cidr_block")]), *(v.get("ipv6_cidr_blocks") or [])]
+            self.blocks += self._blocks("vcn", v, cidrs, v["id"])
+        for s in subnets:
+            cidrs = [s.get("cidr_block"), *(s.get("ipv6_cidr_blocks") or [])]
+            self.blocks += self._blocks("subnet", s, cidrs, s["vcn_id"])
+        self._index = {
+            kind: IntervalIndex((b.first, b.last, b) for b in self.blocks if b.kind == kind)
+            for kind in ("vcn", "subnet")
+        }
+        self._vcn_blocks: dict[str, list[AddressBlock]] = {}
+        self._subnets_by_vcn: dict[str, list[AddressBlock]] = {}
+        for b in self.blocks:
+            by_vcn = self._vcn_blocks if b.kind == "vcn" else self._subnets_by_vcn
+            by_vcn.setdefault(b.vcn_id, []).append(b)
+
+    @staticmethod
+    def _blocks(kind: str, row: dict, cidrs: list[str | None], vcn_id: str) -> list[AddressBlock]:
+        blocks = []
+        for cidr in dict.fromkeys(c for c in cidrs if c):
+            net = parse_network(cidr)
+            if net is None:
+                continue
+            blocks.append(
+                AddressBlock(
+                    kind=kind,
+                    id=row["id"],
+                    display_name=row.get("display_name") or "",
+                    cidr=cidr,
+                    first=net[0],
+                    last=net[1],
+                    version=net[2],
+                    vcn_id=vcn_id,
+                    region=row.get("region"),
+                    compartment_id=row.get("compartment_id"),
+                )
+            )
+        return blocks
+
+    def _overlapping(
+        self, first: int, last: int, version: int, kinds: Iterable[str] = ("vcn", "subnet")
+    ) -> list[AddressBlock]:
+        return [b for kind in kinds for b in self._index[kind].overlapping(first, last) if b.version == version]
+
+    def overlaps(self) -> list[dict]:
+        """Pairs of VCNs, or of subnets, whose CIDR blocks overlap."""
+        found = []
+        for a in self.blocks:
+            for b in self._overlapping(a.first, a.last, a.version, (a.kind,)):
+                if b.id == a.id or (b.first, b.cidr, b.id) <= (a.first, a.cidr, a.id):
+                    continue
+                relation = "identical" if (a.first, a.last) == (b.first, b.last) else (
+                    "contains" if a.first <= b.first and b.last <= a.last
+                    else "contained_by" if b.first <= a.first and a.last <= b.last
+                    else "partial"
+                )
+                found.append({"kind": a.kind, "a": a.to_dict(), "b": b.to_dict(), "relation": relation})
+        return sorted(found, key=lambda o: (o["kind"] != "vcn", o["a"]["cidr"], o["b"]["cidr"]))
+
+    def conflicts(self, cidr: str) -> list[dict]:
+        """Existing VCN and subnet blocks that overlap *cidr*.
+
+        Raises:
+            ValueError: if *cidr* is not an IP network.
+        """
+        net = parse_network(cidr)
+        if net is None:
+            raise ValueError(f"Invalid CIDR {cidr!r}")
+        blocks = self._overlapping(*net)
+        return [b.to_dict() for b in sorted(blocks, key=lambda b: (b.kind != "vcn", b.first, b.cidr))]
+
+    def free_blocks(self, within: str, prefix_len: int, limit: int = 16) -> list[str]:
+        """Up to *limit* free, aligned ``/prefix_len`` blocks in a VCN (OCID) or a CIDR.
+
+        For a VCN, free means not used by any of its subnets; for a CIDR, not
+        used by any VCN in the address space. Blocks of an address family too
+        small for the prefix (IPv4 when asking for a /64) are skipped.
+
+        Raises:
+            ValueError: if *within* is neither a known VCN nor a CIDR, or the
+                prefix is out of range for every one of its address families.
+        """
+        if within in self.vcns:
+            containers = [(b.first, b.last, b.version) for b in self._vcn_blocks.get(within, [])]
+            used = self._subnets_by_vcn.get(within, [])
+        else:
+            net = parse_network(within)
+            if net is None:
+                raise ValueError(f"{within!r} is neither a loaded VCN OCID nor a CIDR")
+            containers = [net]
+            used = self._overlapping(*net, ("vcn",))
+        versions = {version for _, _, version in containers}
+        if versions and not any(0 <= prefix_len <= ADDRESS_BITS[v] for v in versions):
+            bits = max(ADDRESS_BITS[v] for v in versions)
+            families = "/".join(f"IPv{v}" for v in sorted(versions))
+            raise ValueError(f"prefix_len must be between 0 and {bits} for {families}")
+        found: list[str] = []
+        for first, last, version in containers:
+            bits = ADDRESS_BITS[version]
+            if prefix_len > bits:
+                continue
+            size = 1 << (bits - prefix_len)
+            spans = [(b.first, b.last) for b in used if b.version == version]
+            for gap_first, gap_last in gaps((first, last), spans):
+                start = -(-gap_first // size) * size
+                while start + size - 1 <= gap_last:
+                    found.append(_format_cidr(start, prefix_len, version))
+                    if len(found) >= limit:
+                        return found
+                    start += size
+        return found
+
+    def utilization(self) -> list[dict]:
+        """Per-VCN address totals, addresses covered by subnets and the largest free block."""
+        rows = []
+        for vcn_id, vcn in self.vcns.items():
+            total = used = 0
+            largest: tuple[int, int, int] | None = None  # (size, start, version)
+            subnets = self._subnets_by_vcn.get(vcn_id, [])
+            for block in self._vcn_blocks.get(vcn_id, []):
+                spans = [(s.first, s.last) for s in subnets if s.version == block.version]
+                covered = [
+                    (max(a, block.first), min(b, block.last))
+                    for a, b in merge_intervals(spans)
+                    if a <= block.last and b >= block.first
+                ]
+                total += block.size
+                used += sum(b - a + 1 for a, b in covered)
+                for gap_first, gap_last in gaps((block.first, block.last), covered):
+                    for start, prefix_len in aligned_blocks(gap_first, gap_last, ADDRESS_BITS[block.version]):
+                        size = 1 << (ADDRESS_BITS[block.version] - prefix_len)
+                        if largest is None or size > largest[0]:
+                            largest = (size, start, block.version)
+            if total == 0:
+                continue
+            row = {
+                "vcn_id": vcn_id,
+                "display_name": vcn.get("display_name"),
+                "cidr_blocks": [b.cidr for b in self._vcn_blocks.get(vcn_id, [])],
+                "subnets": len({s.id for s in subnets}),
+                "addresses": total,
+                "used_addresses": used,
+                "utilization_pct": round(100 * used / total, 2),
+                "largest_free_block": (
+                    _format_cidr(largest[1], ADDRESS_BITS[largest[2]] - largest[0].bit_length() + 1, largest[2])
+                    if largest else None
+                ),
+            }
+            if vcn.get("region") is not None:
+                row["region"] = vcn["region"]
+            rows.append(row)
+        return sorted(rows, key=lambda r: r["utilization_pct"], reverse=True)
@@ -1,6 +1,7 @@
 """OCI DevOps Agent — main agent loop using claude_agent_sdk."""
 
-import asyncio
+import sys
+from collections.abc import Callable
 
 from claude_agent_sdk import (
     AssistantMessage,
@@ -11,10 +12,16 @@ from claude_agent_sdk import (
     create_sdk_mcp_server,
 )
 
+from .auth import preload_sdk
+from .cache import response_cache
 from .config import settings
+from .metrics import tool_metrics
+from .ratelimit import rate_limiter
 from .tools.compute import ALL_TOOLS as COMPUTE_TOOLS
 from .tools.identity import ALL_TOOLS as IDENTITY_TOOLS
+from .tools.inventory import ALL_TOOLS as INVENTORY_TOOLS
 from .tools.network import ALL_TOOLS as NETWORK_TOOLS
+from .tools.results import ALL_TOOLS as RESULT_TOOLS
 from .tools.storage import ALL_TOOLS as STORAGE_TOOLS
 
 SYSTEM_PROMPT = """\
@@ -23,13 +30,33 @@ You are an OCI DevOps agent that helps manage Oracle Cloud Infrastructure tenanc
 Guidelines:
 - Always include OCIDs in your responses when referencing resources.
 - Present structured data (instances, compartments, etc.) in a readable format.
-- Before executing any state-changing operation (start_instance, stop_instance), \
-clearly state what you are about to do and confirm the action with the user.
+- Before executing any state-changing operation (start_instance, stop_instance, \
+batch_start_instances, batch_stop_instances), clearly state what you are about to do and confirm \
+the action with the user. For batch actions selected by filter, call the tool with dry_run=true \
+first and show the instances that would be affected.
 - When listing resources, summarise counts and key attributes.
 - If an error occurs, report the OCI error code and message.
+- To cover a whole compartment tree (or the tenancy), call a list tool once with \
+include_subtree=true instead of once per compartment; compartments can be given by name or path.
+- For questions spanning regions, pass regions=["all"] (or a list of region names) to the \
+list tool once instead of calling it per region; every row carries its region.
+- Narrow list calls with lifecycle_state, name_prefix/name_regex, time_created_after/before and \
+fields (e.g. only id and display_name) instead of fetching everything and filtering yourself.
+- Tool results are compact JSON; a {"columns": [...], "rows": [[...]]} block is a list of \
+objects with one array per row. If a result reports output_truncated, call continue_output with \
+its output_token only when the omitted rows are needed to answer.
+- For questions about open ports or what can reach what, use find_security_exposure (e.g. port \
+22 from 0.0.0.0/0 across a compartment) or check_security_reachability rather than reading \
+security lists rule by rule. For CIDR planning (overlaps, free blocks, utilization) use \
+analyze_cidr_space over the whole tenancy (include_subtree, regions=["all"]).
+- For "who can do what where" IAM questions, call query_policies (group, verb, resource, \
+compartment_id) instead of reading list_policies output compartment by compartment; resolve who \
+is in a group (or a user's groups) with query_group_membership.
+- For broad inventory or reporting questions, query_inventory answers from the local snapshot; \
+mention its refreshed_at stamp, and fall back to the live tools if it is missing or too old.
 """
 
-STATE_CHANGING_TOOLS = {"start_instance", "stop_instance"}
+STATE_CHANGING_TOOLS = {"start_instance", "stop_instance", "batch_start_instances", "batch_stop_instances"}
 
 ALL_TOOL_NAMES = [
     # compute
@@ -37,32 +64,60 @@ ALL_TOOL_NAMES = [
     "get_instance",
     "start_instance",
     "stop_instance",
+    "batch_start_instances",
+    "batch_stop_instances",
     # network
     "list_vcns",
     "list_subnets",
     "list_security_lists",
+    "find_security_exposure",
+    "check_security_reachability",
+    "analyze_cidr_space",
     # storage
     "list_buckets",
     "get_bucket",
     "list_objects",
     "list_block_volumes",
     "get_bucket_sizes_by_user",
+    "scan_bucket_usage",
     # identity
     "list_compartments",
     "list_users",
     "list_groups",
     "list_policies",
+    "resolve_compartment",
+    "query_policies",
+    "query_group_membership",
+    # inventory snapshot
+    "query_inventory",
+    # truncated results
+    "continue_output",
 ]
 
 
 class OCIAgent:
     """Claude-powered OCI DevOps agent."""
 
-    def __init__(self, profile: str | None = None, model: str | None = None):
+    def __init__(
+        self,
+        profile: str | None = None,
+        model: str | None = None,
+        stats: bool = False,
+        metrics_file: str | None = None,
+    ):
         self.profile = profile or settings.oci_profile
         self.model = model or settings.model
-
-        all_tools = COMPUTE_TOOLS + NETWORK_TOOLS + STORAGE_TOOLS + IDENTITY_TOOLS
+        self.stats = stats
+        self.metrics_file = metrics_file or settings.metrics_file or None
+
+        # Instrumentation is outermost so cache hits are timed (with no OCI requests) too.
+        all_tools = tool_metrics.wrap_tools(
+            response_cache.wrap_tools(
+                COMPUTE_TOOLS + NETWORK_TOOLS + STORAGE_TOOLS + IDENTITY_TOOLS + INVENTORY_TOOLS,
+                state_changing=STATE_CHANGING_TOOLS,
+            )
+            + RESULT_TOOLS
+        )
         self._mcp_server = create_sdk_mcp_server(
             name="oci-tools",
             version="1.0.0",
@@ -86,26 +141,71 @@ class OCIAgent:
             env=env,
         )
 
+    async def connect(self) -> ClaudeSDKClient:
+        """Start a ``ClaudeSDKClient`` session with this agent's tools, ready for ``ask``."""
+        preload_sdk()
+        client = ClaudeSDKClient(self._build_options())
+        await client.connect()
+        return client
+
+    async def ask(
+        self,
+        client: ClaudeSDKClient,
+        user_query: str,
+        on_text: Callable[[str], None] | None = None,
+    ) -> ResultMessage | None:
+        """Send *user_query* on a connected *client*, passing reply text to *on_text* as it streams.
+
+        Returns the turn's ``ResultMessage`` (None if the stream ended without one).
+        """
+        result = None
+        await client.query(user_query)
+        async for message in client.receive_response():
+            if isinstance(message, AssistantMessage):
+                for block in message.content:
+                    if isinstance(block, TextBlock) and on_text is not None:
+                        on_text(block.text)
+            elif isinstance(message, ResultMessage):
+                tool_metrics.record_session(
+                    duration_ms=message.duration_ms,
+                    duration_api_ms=message.duration_api_ms,
+                    num_turns=message.num_turns,
+                    total_cost_usd=message.total_cost_usd,
+                )
+                result = message
+        return result
+
+    def report(self) -> None:
+        """Print cache, rate-limit and (with ``stats``) per-tool summaries; write the metrics file."""
+        cache_stats = response_cache.stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            print(response_cache.summary(), file=sys.stderr)
+        if rate_limiter.stats()["requests"]:
+            print(rate_limiter.summary(), file=sys.stderr)
+        if self.stats:
+            print(tool_metrics.summary(), file=sys.stderr)
+        if self.metrics_file:
+            tool_metrics.write_prometheus(self.metrics_file)
+
     async def run(self, user_query: str) -> str:
         """Run a single query through the agent and print the response.
 
         Uses ClaudeSDKClient (streaming mode) so that in-process SDK MCP servers
         can complete their control-protocol handshake before stdin is closed.
         """
-        options = self._build_options()
         full_response: list[str] = []
 
-        async with ClaudeSDKClient(options) as client:
-            await client.query(user_query)
-            async for message in client.receive_response():
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            print(block.text, end="", flush=True)
-                            full_response.append(block.text)
-                elif isinstance(message, ResultMessage):
-                    print()
-                    if message.is_error:
-                        print(f"\n[Error] Session ended with error: {message.result}")
+        def emit(text: str) -> None:
+            print(text, end="", flush=True)
+            full_response.append(text)
+
+        # The OCI SDK loads while the claude subprocess starts, not during the first tool call.
+        preload_sdk()
+        async with ClaudeSDKClient(self._build_options()) as client:
+            result = await self.ask(client, user_query, emit)
+        print()
+        if result is not None and result.is_error:
+            print(f"\n[Error] Session ended with error: {result.result}")
 
+        self.report()
         return "".join(full_response)
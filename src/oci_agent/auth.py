@@ -1,37 +1,202 @@
-"""OCI authentication and client factory."""
+"""OCI authentication and client factory.
 
-import oci
+The ``oci`` SDK is imported when the first config or client is needed rather
+than at module import, so importing the agent (or running ``--help``) stays
+fast; ``preload_sdk`` warms it in the background once a session is starting.
+"""
+
+import importlib
+import os
+import sys
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from .config import settings
+from .ratelimit import RateLimitedClient
+
+if TYPE_CHECKING:
+    import oci
+
+
+def _file_fingerprint(path: str | None) -> tuple | None:
+    """Return (mtime_ns, size) for *path*, or None if it cannot be stat'ed."""
+    if not path:
+        return None
+    try:
+        st = os.stat(os.path.expanduser(path))
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ClientRegistry:
+    """Process-wide cache of OCI configs and service clients.
+
+    Clients are keyed by ``(profile, region, service)`` so each one keeps its
+    HTTP session (and connection pool) alive across tool calls. The config file
+    and the files it references (signing key, session token) are fingerprinted
+    on every lookup; if any of them changes, the profile's config is re-read and
+    its clients are dropped so they are rebuilt with the new credentials.
+    """
+
+    _WATCHED_KEYS = ("key_file", "security_token_file")
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._configs: dict[str, tuple[dict, tuple]] = {}
+        self._clients: dict[tuple[str, str, str], Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _fingerprint(self, config: dict | None) -> tuple:
+        paths = [settings.resolved_oci_config_path]
+        if config:
+            paths.extend(config.get(k) for k in self._WATCHED_KEYS)
+        return tuple(_file_fingerprint(p) for p in paths)
+
+    def get_config(self, profile: str) -> dict:
+        """Return the parsed config for *profile*, re-reading it if its files changed."""
+        with self._lock:
+            cached = self._configs.get(profile)
+            if cached is not None:
+                config, fingerprint = cached
+                if self._fingerprint(config) == fingerprint:
+                    return config
+                self.reloads += 1
+                self._drop_profile(profile)
+
+            import oci
+
+            config = oci.config.from_file(
+                file_location=settings.resolved_oci_config_path,
+                profile_name=profile,
+            )
+            oci.config.validate_config(config)
+            self._configs[profile] = (config, self._fingerprint(config))
+            return config
+
+    def get_client(
+        self,
+        profile: str,
+        region: str | None,
+        service: str,
+        factory: Callable[[dict], Any],
+    ) -> Any:
+        """Return the cached client for ``(profile, region, service)``, building it on a miss."""
+        with self._lock:
+            config = self.get_config(profile)
+            region = region or config.get("region", "")
+            key = (profile, region, service)
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
+            client_config = config if region == config.get("region") else {**config, "region": region}
+            client = factory(client_config)
+            self._clients[key] = client
+            return client
+
+    def _drop_profile(self, profile: str) -> None:
+        self._configs.pop(profile, None)
+        for key in [k for k in self._clients if k[0] == profile]:
+            del self._clients[key]
+
+    def clear(self) -> None:
+        """Drop every cached config and client and reset the counters."""
+        with self._lock:
+            self._configs.clear()
+            self._clients.clear()
+            self.hits = self.misses = self.reloads = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "clients": len(self._clients),
+            }
+
+
+registry = ClientRegistry()
+
+
+# SDK service modules used by OCIAuth's clients.
+SDK_MODULES = ("oci", "oci.core", "oci.identity", "oci.object_storage")
+
+
+def preload_sdk() -> threading.Thread | None:
+    """Import the OCI SDK modules in a background thread, off the first tool call's critical path.
+
+    Returns the loading thread, or None if the modules are already imported.
+    """
+    if all(name in sys.modules for name in SDK_MODULES):
+        return None
+
+    def load() -> None:
+        for name in SDK_MODULES:
+            importlib.import_module(name)
+
+    thread = threading.Thread(target=load, name="oci-sdk-preload", daemon=True)
+    thread.start()
+    return thread
 
 
 class OCIAuth:
-    """Factory for authenticated OCI service clients."""
+    """Factory for authenticated OCI service clients.
 
-    def __init__(self, profile: str | None = None):
+    Instances are cheap: configs and clients live in the shared ``registry``,
+    so building an ``OCIAuth`` per tool call reuses warm clients. Every client
+    is wrapped in a ``RateLimitedClient`` (see ratelimit.py) with the SDK's own
+    retry strategy disabled.
+    """
+
+    def __init__(self, profile: str | None = None, region: str | None = None):
         self.profile = profile or settings.oci_profile
-        self._config: dict | None = None
+        self.region = region
 
     def get_config(self) -> dict:
-        if self._config is None:
-            self._config = oci.config.from_file(
-                file_location=settings.resolved_oci_config_path,
-                profile_name=self.profile,
-            )
-            oci.config.validate_config(self._config)
-        return self._config
+        return registry.get_config(self.profile)
+
+    def for_region(self, region: str | None) -> "OCIAuth":
+        """Return an ``OCIAuth`` for the same profile whose clients target *region*."""
+        if region == self.region:
+            return self
+        return OCIAuth(self.profile, region)
+
+    def _client(self, service: str, factory: Callable[..., Any]) -> Any:
+        def build(config: dict) -> RateLimitedClient:
+            import oci
+
+            client = factory(config, retry_strategy=oci.retry.NoneRetryStrategy())
+            return RateLimitedClient(client, service, config.get("region", ""))
+
+        return registry.get_client(self.profile, self.region, service, build)
+
+    def compute_client(self) -> "oci.core.ComputeClient":
+        import oci
+
+        return self._client("compute", oci.core.ComputeClient)
+
+    def virtual_network_client(self) -> "oci.core.VirtualNetworkClient":
+        import oci
+
+        return self._client("virtual_network", oci.core.VirtualNetworkClient)
+
+    def object_storage_client(self) -> "oci.object_storage.ObjectStorageClient":
+        import oci
 
-    def compute_client(self) -> oci.core.ComputeClient:
-        return oci.core.ComputeClient(self.get_config())
+        return self._client("object_storage", oci.object_storage.ObjectStorageClient)
 
-    def virtual_network_client(self) -> oci.core.VirtualNetworkClient:
-        return oci.core.VirtualNetworkClient(self.get_config())
+    def blockstorage_client(self) -> "oci.core.BlockstorageClient":
+        import oci
 
-    def object_storage_client(self) -> oci.object_storage.ObjectStorageClient:
-        return oci.object_storage.ObjectStorageClient(self.get_config())
+        return self._client("blockstorage", oci.core.BlockstorageClient)
 
-    def blockstorage_client(self) -> oci.core.BlockstorageClient:
-        return oci.core.BlockstorageClient(self.get_config())
+    def identity_client(self) -> "oci.identity.IdentityClient":
+        import oci
 
-    def identity_client(self) -> oci.identity.IdentityClient:
-        return oci.identity.IdentityClient(self.get_config())
+        return self._client("identity", oci.identity.IdentityClient)
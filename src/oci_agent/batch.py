@@ -0,0 +1,152 @@
+"""Batch mode: answer a file of queries concurrently, streaming JSONL results.
+
+Queries come from a JSON-lines file (one string, or one object with
+``query`` and optional ``id``, per line) or a YAML file (a list of the same,
+or a mapping with a ``queries`` list). Up to ``settings.batch_concurrency``
+queries run at once, each in its own agent session, all in one process so
+they share the OCI client registry, rate limiter, response cache and
+metadata/index caches: the second question about a compartment tree is
+answered from what the first one fetched.
+
+One JSON line per query is written in input order as soon as it and every
+query before it have finished, with the answer, per-query wall time, model
+API time, turns and cost (``ResultMessage.total_cost_usd``).
+"""
+
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+import yaml
+
+from .config import settings
+
+if TYPE_CHECKING:
+    from .agent import OCIAgent
+
+YAML_SUFFIXES = {".yaml", ".yml"}
+
+
+@dataclass
+class BatchQuery:
+    id: str
+    query: str
+
+
+def _query(entry: Any, index: int, where: str) -> BatchQuery:
+    if isinstance(entry, str):
+        entry = {"query": entry}
+    if not isinstance(entry, dict) or not isinstance(entry.get("query"), str) or not entry["query"].strip():
+        raise ValueError(f"{where}: expected a query string or an object with a non-empty 'query'")
+    return BatchQuery(id=str(entry.get("id", index)), query=entry["query"].strip())
+
+
+def load_queries(path: str | Path) -> list[BatchQuery]:
+    """Read the queries in *path* (YAML by ``.yaml``/``.yml`` suffix, otherwise JSON lines).
+
+    Raises:
+        ValueError: if the file is malformed or contains no queries.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    queries: list[BatchQuery] = []
+    if path.suffix.lower() in YAML_SUFFIXES:
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"{path}: invalid YAML: {e}") from e
+        if isinstance(data, dict):
+            data = data.get("queries")
+        if not isinstance(data, list):
+            raise ValueError(f"{path}: expected a list of queries or a mapping with a 'queries' list")
+        for n, entry in enumerate(data, 1):
+            queries.append(_query(entry, n, f"{path}: entry {n}"))
+    else:
+        for line_no, line in enumerate(text.splitlines(), 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON: {e}") from e
+            queries.append(_query(entry, len(queries) + 1, f"{path}:{line_no}"))
+    if not queries:
+        raise ValueError(f"{path}: no queries")
+    ids = [q.id for q in queries]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"{path}: duplicate query ids")
+    return queries
+
+
+class BatchRunner:
+    """Run queries through one ``OCIAgent`` under a concurrency limit, writing ordered JSONL."""
+
+    def __init__(self, agent: "OCIAgent", concurrency: int | None = None, out: TextIO = sys.stdout):
+        self.agent = agent
+        self.concurrency = max(1, concurrency or settings.batch_concurrency)
+        self.out = out
+
+    async def _answer(self, item: BatchQuery) -> dict[str, Any]:
+        text: list[str] = []
+        record: dict[str, Any] = {"id": item.id, "query": item.query}
+        started = time.monotonic()
+        client = None
+        try:
+            client = await self.agent.connect()
+            result = await self.agent.ask(client, item.query, text.append)
+        except Exception as e:
+            record.update(answer="".join(text), is_error=True, error=f"{type(e).__name__}: {e}")
+        else:
+            record.update(answer="".join(text), is_error=result is None or result.is_error)
+            if result is None:
+                record["error"] = "Session ended without a result"
+            else:
+                if result.is_error:
+                    record["error"] = result.result
+                record.update(
+                    duration_ms=result.duration_ms,
+                    duration_api_ms=result.duration_api_ms,
+                    num_turns=result.num_turns,
+                    total_cost_usd=result.total_cost_usd,
+                )
+        finally:
+            if client is not None:
+                with contextlib.suppress(Exception):
+                    await client.disconnect()
+        record["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+        return record
+
+    async def run(self, queries: list[BatchQuery]) -> list[dict[str, Any]]:
+        """Answer every query and return the records; each is also written to ``out`` in input order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.monotonic()
+
+        async def answer(item: BatchQuery) -> dict[str, Any]:
+            async with semaphore:
+                return await self._answer(item)
+
+        tasks = [asyncio.ensure_future(answer(item)) for item in queries]
+        records = []
+        try:
+            # Awaiting in input order writes each record as soon as everything before it is done.
+            for task in tasks:
+                record = await task
+                self.out.write(json.dumps(record, default=str) + "\n")
+                self.out.flush()
+                records.append(record)
+        finally:
+            for task in tasks:
+                task.cancel()
+        failed = sum(1 for r in records if r["is_error"])
+        cost = sum(r.get("total_cost_usd") or 0.0 for r in records)
+        print(
+            f"[batch] queries={len(records)} failed={failed} concurrency={self.concurrency} "
+            f"wall={time.monotonic() - started:.1f}s cost=${cost:.4f}",
+            file=sys.stderr,
+        )
+        return records
@@ -0,0 +1,163 @@
+"""Read-through TTL response cache for read-only tools.
+
+Tool results are memoised per ``(tool, profile, arguments)`` with a TTL and
+an LRU bound for each tool. State-changing tools don't get cached; instead
+they invalidate the read-only tools whose answers they may have changed.
+"""
+
+import dataclasses
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from .config import settings
+
+if TYPE_CHECKING:
+    from claude_agent_sdk import SdkMcpTool
+
+# Per-tool TTL overrides (seconds); other tools use settings.response_cache_ttl_seconds.
+TOOL_TTLS: dict[str, float] = {
+    "list_compartments": 900.0,
+    "list_policies": 900.0,
+    "get_instance": 30.0,
+    "list_instances": 60.0,
+}
+
+# Read-only tools whose cached results a state-changing tool makes stale.
+INVALIDATES: dict[str, set[str]] = {
+    "start_instance": {"list_instances", "get_instance"},
+    "stop_instance": {"list_instances", "get_instance"},
+    "batch_start_instances": {"list_instances", "get_instance"},
+    "batch_stop_instances": {"list_instances", "get_instance"},
+}
+
+
+def _result_bytes(result: dict) -> int:
+    return sum(len(block.get("text", "")) for block in result.get("content", []))
+
+
+class ResponseCache:
+    """Per-tool LRU of tool results with TTL expiry and hit/miss accounting."""
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[str, OrderedDict[tuple, tuple[float, dict]]] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def ttl_for(self, tool_name: str) -> float:
+        if tool_name in TOOL_TTLS:
+            return TOOL_TTLS[tool_name]
+        return self._ttl if self._ttl is not None else settings.response_cache_ttl_seconds
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries if self._max_entries is not None else settings.response_cache_max_entries
+
+    @staticmethod
+    def make_key(args: dict) -> tuple:
+        return (settings.oci_profile, json.dumps(args, sort_keys=True, default=str))
+
+    def _tool_stats(self, tool_name: str) -> dict[str, int]:
+        return self._stats.setdefault(
+            tool_name, {"hits": 0, "misses": 0, "bytes_saved": 0, "invalidations": 0}
+        )
+
+    def get(self, tool_name: str, key: tuple) -> dict | None:
+        with self._lock:
+            stats = self._tool_stats(tool_name)
+            entries = self._entries.get(tool_name)
+            entry = entries.get(key) if entries else None
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    del entries[key]
+                stats["misses"] += 1
+                return None
+            entries.move_to_end(key)
+            stats["hits"] += 1
+            stats["bytes_saved"] += _result_bytes(entry[1])
+            return entry[1]
+
+    def put(self, tool_name: str, key: tuple, result: dict) -> None:
+        with self._lock:
+            entries = self._entries.setdefault(tool_name, OrderedDict())
+            entries[key] = (time.monotonic() + self.ttl_for(tool_name), result)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def invalidate(self, tool_names: Iterable[str] | None = None) -> None:
+        """Drop cached results for *tool_names*, or for every tool if None."""
+        with self._lock:
+            names = list(self._entries) if tool_names is None else list(tool_names)
+            for name in names:
+                dropped = self._entries.pop(name, None)
+                if dropped:
+                    self._tool_stats(name)["invalidations"] += len(dropped)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+    def stats(self) -> dict:
+        """Return per-tool counters plus totals and the overall hit ratio."""
+        with self._lock:
+            per_tool = {name: dict(s) for name, s in self._stats.items()}
+        hits = sum(s["hits"] for s in per_tool.values())
+        misses = sum(s["misses"] for s in per_tool.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "bytes_saved": sum(s["bytes_saved"] for s in per_tool.values()),
+            "tools": per_tool,
+        }
+
+    def wrap(self, tool_def: "SdkMcpTool", state_changing: bool = False) -> "SdkMcpTool":
+        """Return *tool_def* with a caching (or, if *state_changing*, invalidating) handler."""
+        handler = tool_def.handler
+        name = tool_def.name
+
+        if state_changing:
+            async def invalidating_handler(args: dict) -> dict:
+                try:
+                    return await handler(args)
+                finally:
+                    self.invalidate(INVALIDATES.get(name, ()))
+
+            return dataclasses.replace(tool_def, handler=invalidating_handler)
+
+        async def caching_handler(args: dict) -> dict:
+            # refresh=true asks the tool to rebuild its own index, so it must reach the handler, and
+            # answers cached before the rebuild are stale; the fresh one serves later plain calls.
+            key = self.make_key({k: v for k, v in args.items() if k != "refresh"})
+            if args.get("refresh"):
+                self.invalidate([name])
+            else:
+                cached = self.get(name, key)
+                if cached is not None:
+                    return cached
+            result = await handler(args)
+            if not result.get("is_error"):
+                self.put(name, key, result)
+            return result
+
+        return dataclasses.replace(tool_def, handler=caching_handler)
+
+    def wrap_tools(self, tools: Iterable["SdkMcpTool"], state_changing: set[str]) -> list["SdkMcpTool"]:
+        return [self.wrap(t, state_changing=t.name in state_changing) for t in tools]
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (
+            f"[cache] hits={s['hits']} misses={s['misses']} "
+            f"hit_ratio={s['hit_ratio']:.0%} bytes_saved={s['bytes_saved']}"
+        )
+
+
+response_cache = ResponseCache()
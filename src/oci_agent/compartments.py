@@ -0,0 +1,143 @@
+"""Cached compartment hierarchy index.
+
+``CompartmentTree`` is built from one subtree listing of the tenancy and
+answers parent/child/subtree lookups and name-to-OCID resolution locally.
+``compartment_index`` caches one tree per profile for
+``settings.compartment_index_ttl_seconds``.
+"""
+
+import threading
+import time
+from collections import deque
+
+from .auth import OCIAuth
+from .config import settings
+from .executor import run_blocking
+from .metadata import metadata
+from .pagination import Pager
+
+
+class CompartmentTree:
+    """In-memory parent/child index over a tenancy's compartments."""
+
+    def __init__(self, tenancy_id: str, compartments: list[dict]):
+        self.tenancy_id = tenancy_id
+        self.nodes: dict[str, dict] = {
+            tenancy_id: {"id": tenancy_id, "name": "root", "compartment_id": None, "lifecycle_state": "ACTIVE"}
+        }
+        self._children: dict[str, list[str]] = {tenancy_id: []}
+        self._by_name: dict[str, list[str]] = {}
+        for c in compartments:
+            self.nodes[c["id"]] = c
+        for c in compartments:
+            self._children.setdefault(c["compartment_id"], []).append(c["id"])
+            self._children.setdefault(c["id"], [])
+            self._by_name.setdefault(c["name"].lower(), []).append(c["id"])
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def parent(self, ocid: str) -> str | None:
+        node = self.nodes.get(ocid)
+        return node.get("compartment_id") if node else None
+
+    def children(self, ocid: str) -> list[str]:
+        return list(self._children.get(ocid, []))
+
+    def subtree(self, ocid: str, active_only: bool = True) -> list[str]:
+        """Return *ocid* and every descendant, breadth-first."""
+        result = []
+        queue = deque([ocid])
+        while queue:
+            current = queue.popleft()
+            node = self.nodes.get(current)
+            if node is None or (active_only and node.get("lifecycle_state") != "ACTIVE"):
+                continue
+            result.append(current)
+            queue.extend(self._children.get(current, []))
+        return result
+
+    def path(self, ocid: str) -> str:
+        """Return the slash-separated name path from the root, e.g. ``prod/app``."""
+        names = []
+        current: str | None = ocid
+        while current and current != self.tenancy_id:
+            node = self.nodes.get(current)
+            if node is None:
+                break
+            names.append(node["name"])
+            current = node.get("compartment_id")
+        return "/".join(reversed(names))
+
+    def resolve(self, name_or_ocid: str) -> str:
+        """Resolve an OCID, a compartment name or a ``parent/child`` name path to an OCID.
+
+        Raises:
+            ValueError: if the name is unknown or matches more than one compartment.
+        """
+        if name_or_ocid.startswith("ocid1."):
+            return name_or_ocid
+        if name_or_ocid in ("", "/", "root"):
+            return self.tenancy_id
+        parts = [p for p in name_or_ocid.strip("/").split("/") if p]
+        suffix = "/".join(parts).lower()
+        matches = [
+            ocid for ocid in self._by_name.get(parts[-1].lower(), [])
+            if (path := self.path(ocid).lower()) == suffix or path.endswith("/" + suffix)
+        ]
+        if not matches:
+            raise ValueError(f"Unknown compartment: {name_or_ocid!r}")
+        if len(matches) > 1:
+            paths = ", ".join(sorted(self.path(m) for m in matches))
+            raise ValueError(f"Compartment name {name_or_ocid!r} is ambiguous ({paths}); use a path or OCID")
+        return matches[0]
+
+
+class CompartmentIndex:
+    """Per-profile TTL cache of ``CompartmentTree`` objects."""
+
+    def __init__(self, ttl: float | None = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._trees: dict[str, tuple[float, CompartmentTree]] = {}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.compartment_index_ttl_seconds
+
+    async def get(self, auth: OCIAuth, refresh: bool = False) -> CompartmentTree:
+        with self._lock:
+            entry = self._trees.get(auth.profile)
+        if entry is not None and not refresh and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+
+        from .tools.identity import _make_compartment_dict
+
+        tenancy_id = await metadata.tenancy_id(auth)
+        client = await run_blocking(auth.identity_client)
+        pager = Pager(
+            client.list_compartments,
+            compartment_id=tenancy_id,
+            compartment_id_in_subtree=True,
+            access_level="ACCESSIBLE",
+        )
+        tree = CompartmentTree(tenancy_id, await pager.collect(_make_compartment_dict))
+        with self._lock:
+            self._trees[auth.profile] = (time.monotonic(), tree)
+        return tree
+
+    async def resolve(self, auth: OCIAuth, name_or_ocid: str) -> str:
+        """Resolve without building the tree when *name_or_ocid* is already an OCID."""
+        if name_or_ocid.startswith("ocid1."):
+            return name_or_ocid
+        return (await self.get(auth)).resolve(name_or_ocid)
+
+    def invalidate(self, profile: str | None = None) -> None:
+        with self._lock:
+            if profile is None:
+                self._trees.clear()
+            else:
+                self._trees.pop(profile, None)
+
+
+compartment_index = CompartmentIndex()
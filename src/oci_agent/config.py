@@ -16,6 +16,52 @@ class Settings(BaseSettings):
     # OCI
     oci_profile: str = "CVM"
     oci_config_path: str = "~/.oci/config"
+    # Threads available for blocking OCI SDK calls (see executor.run_blocking)
+    oci_max_workers: int = 8
+    # Concurrent get_bucket calls in get_bucket_sizes_by_user
+    bucket_fetch_concurrency: int = 8
+    # Default wall-clock budget for paginated list_* tools before they return a resume token
+    list_time_budget_seconds: float = 120.0
+    # Default record cap for list_* tools, and the largest page requested from OCI
+    list_max_items: int = 1000
+    list_page_size: int = 1000
+    # Namespace / tenancy / region metadata cache (see metadata.py); empty file disables persistence
+    metadata_ttl_seconds: float = 86400.0
+    metadata_cache_file: str = ""
+    # Read-only tool response cache (see cache.py)
+    response_cache_ttl_seconds: float = 300.0
+    response_cache_max_entries: int = 128
+    # SQLite inventory snapshot (see inventory.py)
+    inventory_db_path: str = "~/.cache/oci-agent/inventory.db"
+    # Compartment hierarchy index and subtree fan-out (see compartments.py, fanout.py)
+    compartment_index_ttl_seconds: float = 900.0
+    fanout_concurrency: int = 8
+    # Tenancy-wide parsed IAM policy index (see policies.py)
+    policy_index_ttl_seconds: float = 900.0
+    policy_index_max_policies: int = 10000
+    # User/group membership graph, refreshed by delta after the TTL (see membership.py)
+    membership_graph_ttl_seconds: float = 600.0
+    # Per-VCN security-list rule index, revalidated by content digest after the TTL (see netindex.py)
+    security_rule_index_ttl_seconds: float = 300.0
+    # Client-side rate limit per (service, region), adapted down on 429s; 0 disables it (see ratelimit.py)
+    rate_limit_per_second: float = 10.0
+    rate_limit_burst: int = 10
+    # Attempts per OCI call for throttled / transient failures
+    retry_max_attempts: int = 5
+    # Partitions listed in parallel by scan_bucket_usage (see objectscan.scan_objects)
+    object_scan_workers: int = 8
+    # Concurrent OCI calls made by batch_start_instances / batch_stop_instances
+    batch_action_concurrency: int = 10
+    # Tool output encoding ("table", "json" or "pretty") and per-result token budget; 0 disables it (see output.py)
+    output_format: str = "table"
+    output_max_tokens: int = 8000
+    # Write per-tool metrics in Prometheus text format to this file after each run (see metrics.py)
+    metrics_file: str = ""
+    # Unix socket of the long-lived agent daemon, and its pre-connected sessions / concurrent queries (see daemon.py)
+    daemon_socket: str = "~/.cache/oci-agent/agent.sock"
+    daemon_workers: int = 2
+    # Queries answered at once by --batch, each in its own agent session (see batch.py)
+    batch_concurrency: int = 4
 
     # Claude model
     model: str = "claude-sonnet-4-6"
@@ -0,0 +1,295 @@
+"""Long-lived agent daemon and its thin client, over a Unix socket.
+
+``AgentDaemon`` keeps one ``OCIAgent`` alive for the life of the process, so
+the MCP server, response cache, OCI client registry, rate limiter, metadata
+and index caches and the SDK thread pool stay warm across queries. It also
+runs ``settings.daemon_workers`` workers, each holding a pre-connected
+``ClaudeSDKClient``: a query is handed to an idle worker, answered in a fresh
+conversation with no subprocess start-up on the critical path, and the worker
+then connects its next client in the background.
+
+The protocol is one JSON object per line. Requests are
+``{"op": "query", "query": ..., "profile": ..., "stats": ...}``,
+``{"op": "status"}`` and ``{"op": "shutdown"}``. A query is answered with
+``{"event": "text", "text": ...}`` lines as the reply streams, then a single
+``{"event": "done", ...}`` line carrying timing and cost. If the client
+disconnects mid-query, the turn is interrupted.
+
+The client side (``request``, ``run_query``) uses only the standard library,
+so ``main.py --connect`` does not import ``oci`` or ``claude_agent_sdk``.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+from .config import settings
+
+if TYPE_CHECKING:
+    from .agent import OCIAgent
+
+logger = logging.getLogger(__name__)
+
+# Largest request line accepted from a client.
+MAX_REQUEST_BYTES = 1 << 20
+# Wait between attempts when a worker cannot start a session.
+CONNECT_RETRY_SECONDS = 5.0
+# ResultMessage fields reported in a query's done event and its --stats session line.
+SESSION_KEYS = ("duration_ms", "duration_api_ms", "num_turns", "total_cost_usd")
+
+
+def socket_path(path: str | None = None) -> Path:
+    return Path(path or settings.daemon_socket).expanduser()
+
+
+@dataclass
+class _Job:
+    query: str
+    stats: bool = False
+    events: asyncio.Queue = field(default_factory=asyncio.Queue)
+    client: Any = None
+    cancelled: bool = False
+
+    def emit(self, event: str, **values: Any) -> None:
+        self.events.put_nowait({"event": event, **values})
+
+
+class AgentDaemon:
+    """Serve queries for one ``OCIAgent`` on a Unix socket."""
+
+    def __init__(self, agent: "OCIAgent", path: str | None = None, workers: int | None = None):
+        self.agent = agent
+        self.path = socket_path(path)
+        self.workers = max(1, workers or settings.daemon_workers)
+        self.queries = 0
+        self.idle = 0
+        self._jobs: asyncio.Queue[_Job] = asyncio.Queue()
+        self._started = time.monotonic()
+        self._stop: asyncio.Event | None = None
+
+    def status(self) -> dict:
+        from .cache import response_cache
+        from .ratelimit import rate_limiter
+
+        limiter = rate_limiter.stats()
+        return {
+            "pid": os.getpid(),
+            "profile": self.agent.profile,
+            "model": self.agent.model,
+            "uptime_seconds": round(time.monotonic() - self._started, 1),
+            "queries": self.queries,
+            "workers": self.workers,
+            "idle_sessions": self.idle,
+            "queued": self._jobs.qsize(),
+            "cache": response_cache.stats(),
+            "ratelimit": {k: v for k, v in limiter.items() if k != "clients"},
+        }
+
+    async def _answer(self, client: Any, job: _Job) -> None:
+        from .metrics import tool_metrics
+
+        job.client = client
+        started = time.monotonic()
+        before = tool_metrics.stats()
+        try:
+            result = await self.agent.ask(client, job.query, lambda text: job.emit("text", text=text))
+        except Exception as e:
+            logger.exception("daemon: query failed")
+            job.emit("done", is_error=True, error=str(e))
+            return
+        done: dict[str, Any] = {
+            "is_error": bool(result is None or result.is_error),
+            "elapsed_ms": round((time.monotonic() - started) * 1000),
+        }
+        if result is not None:
+            done.update({key: getattr(result, key) for key in SESSION_KEYS})
+            if result.is_error:
+                done["error"] = result.result
+        if job.stats:
+            # Only what ran during this query (plus any concurrent ones), not the daemon's lifetime.
+            stats = tool_metrics.since(before, tool_metrics.stats())
+            stats["session"] = {k: done[k] for k in SESSION_KEYS if done.get(k) is not None}
+            done["stats"] = tool_metrics.summary(stats)
+        if self.agent.metrics_file:
+            tool_metrics.write_prometheus(self.agent.metrics_file)
+        job.emit("done", **done)
+
+    async def _worker(self, n: int) -> None:
+        """Keep one session connected; answer one query on it, then replace it."""
+        while True:
+            try:
+                client = await self.agent.connect()
+            except Exception as e:
+                logger.warning("daemon: worker %d could not start a session: %s", n, e)
+                # Fail a waiting query rather than leave its client hanging.
+                with contextlib.suppress(asyncio.QueueEmpty):
+                    self._jobs.get_nowait().emit("done", is_error=True, error=f"Could not start a session: {e}")
+                await asyncio.sleep(CONNECT_RETRY_SECONDS)
+                continue
+            try:
+                self.idle += 1
+                try:
+                    job = await self._jobs.get()
+                finally:
+                    self.idle -= 1
+                if not job.cancelled:
+                    await self._answer(client, job)
+            finally:
+                with contextlib.suppress(Exception):
+                    await client.disconnect()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        job: _Job | None = None
+
+        def send(message: dict) -> None:
+            writer.write((json.dumps(message, default=str) + "\n").encode())
+
+        try:
+            line = await reader.readline()
+            try:
+                message = json.loads(line)
+                op = message.get("op", "query")
+            except (ValueError, AttributeError):
+                send({"event": "done", "is_error": True, "error": "Malformed request"})
+                return
+            if op == "status":
+                send({"event": "status", **self.status()})
+            elif op == "shutdown":
+                send({"event": "bye"})
+                assert self._stop is not None
+                self._stop.set()
+            elif op != "query" or not message.get("query"):
+                send({"event": "done", "is_error": True, "error": f"Unknown request: {op!r}"})
+            elif message.get("profile") and message["profile"] != self.agent.profile:
+                send({
+                    "event": "done",
+                    "is_error": True,
+                    "error": f"This daemon serves profile {self.agent.profile!r}, not {message['profile']!r}",
+                })
+            else:
+                self.queries += 1
+                job = _Job(message["query"], stats=bool(message.get("stats")))
+                self._jobs.put_nowait(job)
+                # The client sends nothing more, so EOF on the socket means it went away.
+                gone = asyncio.ensure_future(reader.read())
+                try:
+                    while True:
+                        next_event = asyncio.ensure_future(job.events.get())
+                        await asyncio.wait({next_event, gone}, return_when=asyncio.FIRST_COMPLETED)
+                        if not next_event.done():
+                            next_event.cancel()
+                            raise ConnectionResetError("client disconnected")
+                        event = next_event.result()
+                        send(event)
+                        await writer.drain()
+                        if event["event"] == "done":
+                            break
+                finally:
+                    gone.cancel()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if job is not None:
+                job.cancelled = True
+                if job.client is not None:
+                    logger.info("daemon: client went away, interrupting its query")
+                    with contextlib.suppress(Exception):
+                        await job.client.interrupt()
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    def _claim_path(self) -> None:
+        """Remove a stale socket file, refusing to start if another daemon answers on it."""
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not self.path.exists():
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(self.path))
+            except OSError:
+                self.path.unlink()
+                return
+        raise RuntimeError(f"An agent daemon is already listening on {self.path}")
+
+    async def serve(self) -> None:
+        """Listen until a shutdown request, SIGINT or SIGTERM."""
+        self._stop = asyncio.Event()
+        self._claim_path()
+        # The agent can change instances, so other local users must never be able to connect,
+        # not even between bind() and chmod().
+        umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(self._handle, path=str(self.path), limit=MAX_REQUEST_BYTES)
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, 0o600)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError, RuntimeError):
+                loop.add_signal_handler(sig, self._stop.set)
+        workers = [asyncio.ensure_future(self._worker(n)) for n in range(self.workers)]
+        logger.info("daemon: listening on %s (profile %s, %d workers)", self.path, self.agent.profile, self.workers)
+        try:
+            async with server:
+                await self._stop.wait()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                with contextlib.suppress(NotImplementedError, RuntimeError):
+                    loop.remove_signal_handler(sig)
+
+
+def request(payload: dict, path: str | None = None) -> Iterator[dict]:
+    """Send one request to the daemon and yield its response lines as they arrive.
+
+    Raises:
+        OSError: if no daemon is listening on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path(path)))
+        sock.sendall((json.dumps(payload) + "\n").encode())
+        with sock.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                yield json.loads(line)
+
+
+def run_query(
+    query: str,
+    path: str | None = None,
+    profile: str | None = None,
+    stats: bool = False,
+    out: TextIO = sys.stdout,
+    err: TextIO = sys.stderr,
+) -> bool:
+    """Run *query* on the daemon, streaming the reply to *out*; return True if it succeeded.
+
+    Raises:
+        OSError: if no daemon is listening on the socket.
+    """
+    ok = False
+    for event in request({"op": "query", "query": query, "profile": profile, "stats": stats}, path):
+        if event["event"] == "text":
+            print(event["text"], end="", file=out, flush=True)
+        elif event["event"] == "done":
+            print(file=out)
+            ok = not event.get("is_error")
+            if event.get("error"):
+                print(f"\n[Error] {event['error']}", file=out)
+            if event.get("stats"):
+                print(event["stats"], file=err)
+    return ok
@@ -0,0 +1,69 @@
+"""Execution layer that runs the synchronous OCI SDK off the event loop.
+
+Every OCI SDK call blocks on HTTP I/O. Tool handlers are coroutines running on
+the ``ClaudeSDKClient`` event loop, so they hand each SDK call to a bounded
+thread pool via ``run_blocking`` instead of calling it inline. That keeps model
+streaming responsive and lets concurrent tool calls actually overlap.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .config import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_max_workers: int | None = None
+_lock = threading.Lock()
+
+
+def max_workers() -> int:
+    """Pool size: the value passed to ``configure``, else ``settings.oci_max_workers``."""
+    return max(1, _max_workers or settings.oci_max_workers)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared executor, creating it with ``max_workers()`` threads."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers(), thread_name_prefix="oci-sdk")
+        return _executor
+
+
+def configure(workers: int | None) -> None:
+    """Resize the pool (None reverts to settings). In-flight calls on the old pool finish."""
+    global _executor, _max_workers
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    with _lock:
+        previous, _executor = _executor, None
+        _max_workers = workers
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def shutdown() -> None:
+    """Shut the pool down; it is recreated lazily on the next call."""
+    global _executor
+    with _lock:
+        previous, _executor = _executor, None
+    if previous is not None:
+        previous.shutdown(wait=True)
+
+
+async def run_blocking(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(*args, **kwargs)`` on the shared pool and await its result.
+
+    The caller's ``contextvars`` context is propagated into the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
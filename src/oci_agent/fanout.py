@@ -0,0 +1,221 @@
+"""Fan a compartment-scoped listing out over a compartment subtree and regions.
+
+``list_in_scope`` is what the compartment-scoped list tools call. With neither
+``include_subtree`` nor ``regions`` set it is a plain paginated listing of one
+compartment in the profile's region. ``include_subtree`` treats the
+compartment (OCID, name or name path) as a subtree root and lists every active
+compartment below it; ``regions`` repeats the listing in each named region (or
+every subscribed region for ``"all"``). All ``(region, compartment)`` targets
+run concurrently and share a single ``max_items`` cap and time budget.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .auth import OCIAuth
+from .compartments import compartment_index
+from .config import settings
+from .executor import run_blocking
+from .metadata import metadata
+from .output import tool_result
+from .pagination import Pager
+
+SCOPE_PROPERTIES: dict[str, dict] = {
+    "include_subtree": {
+        "type": "boolean",
+        "description": (
+            "Treat compartment_id as a subtree root and list every compartment below it "
+            "concurrently in this one call (default false)"
+        ),
+    },
+    "regions": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": (
+            "Regions to query, e.g. ['us-ashburn-1', 'eu-frankfurt-1'], or ['all'] for every "
+            "subscribed region; rows are tagged with their region (default: the profile's region)"
+        ),
+    },
+}
+
+Target = tuple[str | None, str]
+
+COMPARTMENT_ID_DESCRIPTION = "OCID, name or name path (e.g. 'prod/app') of the compartment"
+
+
+@dataclass
+class FanOutResult:
+    """Merged rows from a fan-out plus what did not complete."""
+
+    rows: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    timed_out: list[dict] = field(default_factory=list)
+    truncated: bool = False
+    targets: list[Target] = field(default_factory=list)
+
+    def meta(self) -> dict:
+        meta: dict[str, Any] = {
+            "compartments_queried": len({cid for _, cid in self.targets}),
+            "returned": len(self.rows),
+        }
+        regions = list(dict.fromkeys(r for r, _ in self.targets if r is not None))
+        if regions:
+            meta["regions_queried"] = regions
+        if self.truncated:
+            meta["truncated"] = True
+            meta["hint"] = "Raise max_items or narrow the subtree or regions to see more."
+        if self.errors:
+            meta["errors"] = self.errors
+        if self.timed_out:
+            meta["timed_out"] = self.timed_out
+        return meta
+
+
+def _target_ref(target: Target) -> dict:
+    region, compartment_id = target
+    ref = {"compartment_id": compartment_id}
+    if region is not None:
+        ref["region"] = region
+    return ref
+
+
+async def fan_out(
+    targets: list[Target],
+    make_pager: Callable[[str | None, str], Pager],
+    transform: Callable[[Any], dict],
+    *,
+    max_items: int,
+    max_concurrency: int | None = None,
+    timeout: float | None = None,
+) -> FanOutResult:
+    """List every ``(region, compartment_id)`` target concurrently and merge the rows.
+
+    Each row is tagged with the ``compartment_id`` it came from and, when the
+    target names one, its ``region``. Listing stops once *max_items* rows are
+    collected in total; targets still running when *timeout* expires are
+    cancelled and reported in ``timed_out``.
+    """
+    result = FanOutResult(targets=list(targets))
+    semaphore = asyncio.Semaphore(max_concurrency or settings.fanout_concurrency)
+
+    async def run(target: Target) -> None:
+        region, compartment_id = target
+        async with semaphore:
+            if len(result.rows) >= max_items:
+                result.truncated = True
+                return
+            try:
+                pager = make_pager(region, compartment_id)
+                shape = pager.project(transform)
+                async for record in pager:
+                    if len(result.rows) >= max_items:
+                        result.truncated = True
+                        return
+                    row = shape(record)
+                    row.setdefault("compartment_id", compartment_id)
+                    if region is not None:
+                        row["region"] = region
+                    result.rows.append(row)
+            except Exception as e:
+                result.errors.append({**_target_ref(target), "error": str(e)})
+
+    tasks = {asyncio.ensure_future(run(t)): t for t in targets}
+    if not tasks:
+        return result
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+        result.timed_out.append(_target_ref(tasks[task]))
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    return result
+
+
+async def resolve_regions(auth: OCIAuth, regions: list[str] | str | None) -> list[str]:
+    """Expand a ``regions`` argument; ``"all"`` means every subscribed region."""
+    if not regions:
+        return []
+    if isinstance(regions, str):
+        regions = [regions]
+    if any(r.lower() == "all" for r in regions):
+        return await metadata.subscribed_regions(auth)
+    return list(dict.fromkeys(regions))
+
+
+async def collect_in_scope(
+    args: dict,
+    auth: OCIAuth,
+    client_name: str,
+    make_pager: Callable[[Any, str, dict], Pager],
+    transform: Callable[[Any], dict],
+) -> tuple[list[dict], Pager | None, dict | None]:
+    """Collect the rows a compartment-scoped list tool would return.
+
+    *client_name* is the ``OCIAuth`` client method the tool lists with (e.g.
+    ``"compute_client"``); one client is built per region. *make_pager* is
+    called as ``make_pager(client, compartment_id, args)`` and should return a
+    ``Pager.from_args`` for that compartment.
+
+    Returns ``(rows, pager, meta)``: the pager for a plain single-compartment
+    listing (for its continuation), or the fan-out meta otherwise.
+    """
+    compartment_id = await compartment_index.resolve(auth, args["compartment_id"])
+    regions = await resolve_regions(auth, args.get("regions"))
+    if not args.get("include_subtree") and not regions:
+        client = await run_blocking(getattr(auth, client_name))
+        pager = make_pager(client, compartment_id, args)
+        return await pager.collect(transform), pager, None
+
+    started = time.monotonic()
+    if args.get("include_subtree"):
+        compartments = (await compartment_index.get(auth)).subtree(compartment_id)
+    else:
+        compartments = [compartment_id]
+
+    region_errors: list[dict] = []
+    clients: dict[str | None, Any] = {}
+    built = await asyncio.gather(
+        *(run_blocking(getattr(auth.for_region(r) if r else auth, client_name)) for r in regions or [None]),
+        return_exceptions=True,
+    )
+    for region, client in zip(regions or [None], built):
+        if isinstance(client, BaseException):
+            region_errors.append({"region": region, "error": str(client)})
+        else:
+            clients[region] = client
+
+    max_items = int(args.get("max_items") or settings.list_max_items)
+    budget = float(args.get("time_budget_seconds") or settings.list_time_budget_seconds)
+    # Page tokens are per compartment and region, so resuming isn't offered here.
+    per_target_args = {k: v for k, v in args.items() if k != "page"}
+    result = await fan_out(
+        [(region, cid) for region in clients for cid in compartments],
+        lambda region, cid: make_pager(clients[region], cid, per_target_args),
+        transform,
+        max_items=max_items,
+        timeout=max(0.0, budget - (time.monotonic() - started)),
+    )
+    result.errors[:0] = region_errors
+    meta = result.meta()
+    if args.get("include_subtree"):
+        meta["subtree_root"] = compartment_id
+    meta["elapsed_seconds"] = round(time.monotonic() - started, 2)
+    return result.rows, None, meta
+
+
+async def list_in_scope(
+    args: dict,
+    auth: OCIAuth,
+    client_name: str,
+    make_pager: Callable[[Any, str, dict], Pager],
+    transform: Callable[[Any], dict],
+) -> dict:
+    """Run a compartment-scoped list tool over one compartment, a subtree and/or several regions.
+
+    Arguments are as for ``collect_in_scope``; the rows are returned as a tool result.
+    """
+    rows, pager, meta = await collect_in_scope(args, auth, client_name, make_pager, transform)
+    return tool_result(rows, pager, meta=meta)
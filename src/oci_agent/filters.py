@@ -0,0 +1,140 @@
+"""Common filtering and projection arguments for the list tools.
+
+``RecordFilter`` is built from a tool's arguments. Criteria the SDK list call
+accepts (``lifecycle_state`` on almost every OCI list operation) are passed
+down as request parameters; the rest — name prefix/regex and the
+``time_created`` range, which OCI list operations don't support — are checked
+against each SDK record as ``Pager`` streams it, so non-matching records are
+never transformed or kept. ``fields`` projects the transformed rows.
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+FILTER_PROPERTIES: dict[str, dict] = {
+    "lifecycle_state": {
+        "type": "string",
+        "description": "Only return resources in this lifecycle state, e.g. RUNNING, AVAILABLE, ACTIVE",
+    },
+    "name_prefix": {
+        "type": "string",
+        "description": "Only return resources whose display name (or name) starts with this (case-insensitive)",
+    },
+    "name_regex": {
+        "type": "string",
+        "description": "Only return resources whose display name (or name) matches this regular expression",
+    },
+    "time_created_after": {
+        "type": "string",
+        "description": "Only return resources created at or after this ISO 8601 date/time",
+    },
+    "time_created_before": {
+        "type": "string",
+        "description": "Only return resources created before this ISO 8601 date/time",
+    },
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Return only these fields of each row, e.g. ['id', 'display_name']",
+    },
+}
+
+
+def _parse_time(value: Any) -> datetime | None:
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _record_name(record: Any) -> str:
+    return getattr(record, "display_name", None) or getattr(record, "name", None) or ""
+
+
+class RecordFilter:
+    """Filter criteria and projection parsed from a list tool's arguments.
+
+    Raises:
+        ValueError: if ``name_regex`` or a ``time_created_*`` value doesn't parse.
+    """
+
+    def __init__(
+        self,
+        lifecycle_state: str | None = None,
+        name_prefix: str | None = None,
+        name_regex: str | None = None,
+        time_created_after: str | None = None,
+        time_created_before: str | None = None,
+        fields: list[str] | None = None,
+    ):
+        self.lifecycle_state = lifecycle_state.upper() if lifecycle_state else None
+        self.name_prefix = name_prefix.lower() if name_prefix else None
+        try:
+            self.name_regex = re.compile(name_regex) if name_regex else None
+        except re.error as e:
+            raise ValueError(f"Invalid name_regex {name_regex!r}: {e}") from e
+        try:
+            self.after = _parse_time(time_created_after)
+            self.before = _parse_time(time_created_before)
+        except ValueError as e:
+            raise ValueError(f"Invalid time_created range: {e}") from e
+        self.fields = list(fields) if fields else None
+        self._pushed: set[str] = set()
+
+    @classmethod
+    def from_args(cls, args: dict) -> "RecordFilter":
+        return cls(**{k: args.get(k) for k in FILTER_PROPERTIES})
+
+    def pushdown(self, supported: Iterable[str]) -> dict:
+        """Return SDK request parameters for the criteria the call *supported* accepts."""
+        params: dict[str, Any] = {}
+        if self.lifecycle_state and "lifecycle_state" in supported:
+            params["lifecycle_state"] = self.lifecycle_state
+        self._pushed = set(params)
+        return params
+
+    @property
+    def active(self) -> bool:
+        """True if any criterion has to be checked client-side."""
+        return bool(
+            (self.lifecycle_state and "lifecycle_state" not in self._pushed)
+            or self.name_prefix
+            or self.name_regex
+            or self.after
+            or self.before
+        )
+
+    def __call__(self, record: Any) -> bool:
+        if self.lifecycle_state and "lifecycle_state" not in self._pushed:
+            if str(getattr(record, "lifecycle_state", "")).upper() != self.lifecycle_state:
+                return False
+        if self.name_prefix or self.name_regex:
+            name = _record_name(record)
+            if self.name_prefix and not name.lower().startswith(self.name_prefix):
+                return False
+            if self.name_regex and not self.name_regex.search(name):
+                return False
+        if self.after or self.before:
+            created = _parse_time(getattr(record, "time_created", None))
+            if created is None:
+                return False
+            if self.after and created < self.after:
+                return False
+            if self.before and created >= self.before:
+                return False
+        return True
+
+    def project(self, transform: Callable[[Any], dict]) -> Callable[[Any], dict]:
+        """Wrap *transform* so it returns only the requested ``fields``."""
+        if not self.fields:
+            return transform
+        fields = self.fields
+
+        def projected(record: Any) -> dict:
+            row = transform(record)
+            return {f: row[f] for f in fields if f in row}
+
+        return projected
@@ -0,0 +1,418 @@
+"""Persistent SQLite inventory snapshot of a tenancy.
+
+``InventoryCrawler`` walks the compartment tree and lists compute, network,
+storage and identity resources through the same ``Pager`` and row builders
+the live tools use, writing the rows into an ``InventoryStore``. Refreshes are
+incremental:
+
+* every row is fingerprinted, so only rows whose content (lifecycle state,
+  size, ...) changed are rewritten and get a new ``last_changed`` stamp;
+* rows that disappear from a listing are marked deleted rather than dropped;
+* the expensive per-bucket ``get_bucket`` call (for sizes) is only made for
+  buckets that are new or whose etag changed since the last crawl;
+* each (kind, compartment) keeps a ``time_created`` high-water mark, so a
+  refresh can report how many resources are new since the previous one.
+
+The ``query_inventory`` tool answers from the snapshot with a freshness stamp
+instead of calling OCI.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .auth import OCIAuth
+from .config import settings
+from .executor import run_blocking
+from .metadata import metadata
+from .pagination import Pager
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    compartment_id TEXT,
+    region TEXT,
+    name TEXT,
+    lifecycle_state TEXT,
+    time_created TEXT,
+    data TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_changed REAL NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS resources_by_compartment ON resources (kind, compartment_id);
+CREATE TABLE IF NOT EXISTS crawls (
+    kind TEXT NOT NULL,
+    compartment_id TEXT NOT NULL,
+    region TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    watermark TEXT,
+    PRIMARY KEY (kind, compartment_id, region)
+);
+"""
+
+
+def _fingerprint(row: dict) -> str:
+    return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class RefreshStats:
+    """Counts of what a refresh touched, per kind."""
+
+    listed: dict[str, int] = field(default_factory=dict)
+    changed: dict[str, int] = field(default_factory=dict)
+    new: dict[str, int] = field(default_factory=dict)
+    deleted: dict[str, int] = field(default_factory=dict)
+    detail_calls: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add(self, bucket: dict[str, int], kind: str, n: int) -> None:
+        bucket[kind] = bucket.get(kind, 0) + n
+
+    def as_dict(self) -> dict:
+        return {
+            "listed": self.listed,
+            "changed": self.changed,
+            "new_since_last_refresh": self.new,
+            "deleted": self.deleted,
+            "detail_calls": self.detail_calls,
+            "errors": self.errors,
+        }
+
+
+class InventoryStore:
+    """Thread-safe wrapper around the SQLite snapshot database."""
+
+    def __init__(self, path: str | None = None):
+        raw = path if path is not None else settings.inventory_db_path
+        self.path = raw if raw == ":memory:" else str(Path(raw).expanduser())
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def existing(self, kind: str, compartment_id: str) -> dict[str, sqlite3.Row]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM resources WHERE kind = ? AND compartment_id IS ?",
+                (kind, compartment_id),
+            ).fetchall()
+        return {r["id"]: r for r in rows}
+
+    def apply(
+        self,
+        kind: str,
+        compartment_id: str,
+        region: str,
+        rows: list[dict],
+        watermark: str | None,
+        now: float,
+    ) -> tuple[int, int]:
+        """Upsert *rows* as the full current listing; return ``(changed, deleted)``."""
+        previous = self.existing(kind, compartment_id)
+        changed = 0
+        seen: set[str] = set()
+        with self._lock, self._conn:
+            for row in rows:
+                rid = row.get("id") or row.get("name")
+                seen.add(rid)
+                fp = _fingerprint(row)
+                old = previous.get(rid)
+                if old is not None and old["fingerprint"] == fp and not old["deleted"]:
+                    self._conn.execute(
+                        "UPDATE resources SET last_seen = ? WHERE kind = ? AND id = ?", (now, kind, rid)
+                    )
+                    continue
+                changed += 1
+                self._conn.execute(
+                    """
+                    INSERT INTO resources (kind, id, compartment_id, region, name, lifecycle_state,
+                        time_created, data, fingerprint, first_seen, last_seen, last_changed, deleted)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                    ON CONFLICT (kind, id) DO UPDATE SET
+                        compartment_id = excluded.compartment_id, region = excluded.region,
+                        name = excluded.name, lifecycle_state = excluded.lifecycle_state,
+                        time_created = excluded.time_created, data = excluded.data,
+                        fingerprint = excluded.fingerprint, last_seen = excluded.last_seen,
+                        last_changed = excluded.last_changed, deleted = 0
+                    """,
+                    (
+                        kind,
+                        rid,
+                        compartment_id,
+                        region,
+                        row.get("display_name") or row.get("name"),
+                        row.get("lifecycle_state"),
+                        row.get("time_created"),
+                        json.dumps(row, default=str),
+                        fp,
+                        now,
+                        now,
+                        now,
+                    ),
+                )
+            gone = [rid for rid, old in previous.items() if rid not in seen and not old["deleted"]]
+            self._conn.executemany(
+                "UPDATE resources SET deleted = 1, last_changed = ? WHERE kind = ? AND id = ?",
+                [(now, kind, rid) for rid in gone],
+            )
+            self._conn.execute(
+                """
+                INSERT INTO crawls (kind, compartment_id, region, completed_at, watermark)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, compartment_id, region) DO UPDATE SET
+                    completed_at = excluded.completed_at, watermark = excluded.watermark
+                """,
+                (kind, compartment_id, region, now, watermark),
+            )
+        return changed, len(gone)
+
+    def watermark(self, kind: str, compartment_id: str, region: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM crawls WHERE kind = ? AND compartment_id = ? AND region = ?",
+                (kind, compartment_id, region),
+            ).fetchone()
+        return row["watermark"] if row else None
+
+    def freshness(self, kind: str | None = None) -> float | None:
+        """Oldest ``completed_at`` across the crawls of *kind* (or of every kind)."""
+        sql = "SELECT MIN(completed_at) AS ts FROM crawls"
+        params: tuple = ()
+        if kind:
+            sql += " WHERE kind = ?"
+            params = (kind,)
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return row["ts"] if row else None
+
+    def query(
+        self,
+        kind: str,
+        compartment_ids: list[str] | None = None,
+        lifecycle_state: str | None = None,
+        name_contains: str | None = None,
+        include_deleted: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        sql = "SELECT data, compartment_id, region, deleted, last_changed FROM resources WHERE kind = ?"
+        params: list[Any] = [kind]
+        if compartment_ids:
+            sql += f" AND compartment_id IN ({','.join('?' * len(compartment_ids))})"
+            params.extend(compartment_ids)
+        if lifecycle_state:
+            sql += " AND lifecycle_state = ?"
+            params.append(lifecycle_state)
+        if name_contains:
+            sql += " AND name LIKE ?"
+            params.append(f"%{name_contains}%")
+        if not include_deleted:
+            sql += " AND deleted = 0"
+        sql += " ORDER BY time_created DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        result = []
+        for r in rows:
+            item = json.loads(r["data"])
+            item.setdefault("compartment_id", r["compartment_id"])
+            item["region"] = item.get("region") or r["region"]
+            if r["deleted"]:
+                item["deleted"] = True
+            result.append(item)
+        return result
+
+
+@dataclass
+class KindSpec:
+    """How to list one resource kind: client factory name, list method and row builder."""
+
+    client: str
+    method: str
+    row: Callable[[Any], dict]
+    tenancy_only: bool = False
+
+
+def _kind_specs() -> dict[str, KindSpec]:
+    # Imported lazily so the store can be used without importing every tool module.
+    from .tools.compute import _make_instance_dict
+    from .tools.identity import _make_group_dict, _make_policy_dict, _make_user_dict
+    from .tools.network import _make_security_list_dict, _make_subnet_dict, _make_vcn_dict
+    from .tools.storage import _make_volume_dict
+
+    return {
+        "instance": KindSpec("compute_client", "list_instances", _make_instance_dict),
+        "vcn": KindSpec("virtual_network_client", "list_vcns", _make_vcn_dict),
+        "subnet": KindSpec("virtual_network_client", "list_subnets", _make_subnet_dict),
+        "security_list": KindSpec("virtual_network_client", "list_security_lists", _make_security_list_dict),
+        "volume": KindSpec("blockstorage_client", "list_volumes", _make_volume_dict),
+        "policy": KindSpec("identity_client", "list_policies", _make_policy_dict),
+        "user": KindSpec("identity_client", "list_users", _make_user_dict, tenancy_only=True),
+        "group": KindSpec("identity_client", "list_groups", _make_group_dict, tenancy_only=True),
+    }
+
+
+INVENTORY_KINDS = ["compartment", "instance", "vcn", "subnet", "security_list", "volume", "bucket",
+                   "policy", "user", "group"]
+
+
+def _bucket_row(detail) -> dict:
+    return {
+        "id": detail.name,
+        "name": detail.name,
+        "compartment_id": detail.compartment_id,
+        "created_by": detail.created_by,
+        "storage_tier": detail.storage_tier,
+        "public_access_type": detail.public_access_type,
+        "approximate_size_bytes": detail.approximate_size or 0,
+        "approximate_object_count": detail.approximate_count or 0,
+        "etag": detail.etag,
+        "time_created": str(detail.time_created),
+    }
+
+
+class InventoryCrawler:
+    """Fills an ``InventoryStore`` from the live OCI APIs, one compartment at a time."""
+
+    def __init__(self, store: InventoryStore, auth: OCIAuth | None = None, max_concurrency: int | None = None):
+        self.store = store
+        self.auth = auth or OCIAuth()
+        self.max_concurrency = max_concurrency or settings.oci_max_workers
+
+    async def refresh(self, kinds: list[str] | None = None) -> dict:
+        """Crawl the whole tenancy for *kinds* (default: all) and return what changed."""
+        kinds = kinds or INVENTORY_KINDS
+        specs = _kind_specs()
+        stats = RefreshStats()
+        started = time.time()
+        region = self.auth.region or (await run_blocking(self.auth.get_config)).get("region", "")
+        tenancy_id = await metadata.tenancy_id(self.auth)
+
+        compartments = await self._refresh_compartments(tenancy_id, region, stats, started)
+        compartment_ids = [tenancy_id] + [c["id"] for c in compartments if c["lifecycle_state"] == "ACTIVE"]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        jobs = []
+        for kind in kinds:
+            if kind == "compartment":
+                continue
+            targets = [tenancy_id] if kind in specs and specs[kind].tenancy_only else compartment_ids
+            for compartment_id in targets:
+                jobs.append(self._guarded(semaphore, kind, compartment_id, region, specs, stats, started))
+        await asyncio.gather(*jobs)
+
+        return {
+            "refreshed_at": started,
+            "duration_seconds": round(time.time() - started, 2),
+            "compartments": len(compartment_ids),
+            **stats.as_dict(),
+        }
+
+    async def _refresh_compartments(self, tenancy_id: str, region: str, stats: RefreshStats, now: float) -> list:
+        from .tools.identity import _make_compartment_dict
+
+        client = await run_blocking(self.auth.identity_client)
+        pager = Pager(
+            client.list_compartments,
+            compartment_id=tenancy_id,
+            compartment_id_in_subtree=True,
+            access_level="ACCESSIBLE",
+        )
+        rows = await pager.collect(_make_compartment_dict)
+        self._apply(stats, "compartment", tenancy_id, region, rows, now)
+        return rows
+
+    async def _guarded(self, semaphore, kind, compartment_id, region, specs, stats, now) -> None:
+        async with semaphore:
+            try:
+                if kind == "bucket":
+                    await self._refresh_buckets(compartment_id, region, stats, now)
+                else:
+                    await self._refresh_kind(specs[kind], kind, compartment_id, region, stats, now)
+            except Exception as e:
+                # One inaccessible compartment must not abort the nightly crawl
+                logger.warning("inventory: %s in %s failed: %s", kind, compartment_id, e)
+                stats.errors.append({"kind": kind, "compartment_id": compartment_id, "error": str(e)})
+
+    async def _refresh_kind(self, spec: KindSpec, kind, compartment_id, region, stats, now) -> None:
+        client = await run_blocking(getattr(self.auth, spec.client))
+        pager = Pager(getattr(client, spec.method), compartment_id=compartment_id)
+        rows = await pager.collect(spec.row)
+        self._apply(stats, kind, compartment_id, region, rows, now)
+
+    async def _refresh_buckets(self, compartment_id, region, stats, now) -> None:
+        from .tools.storage import _fetch_bucket_details
+
+        client = await run_blocking(self.auth.object_storage_client)
+        namespace = await metadata.namespace(self.auth)
+        pager = Pager(client.list_buckets, namespace_name=namespace, compartment_id=compartment_id)
+        summaries = [(b.name, b.etag) async for b in pager]
+        previous = self.store.existing("bucket", compartment_id)
+
+        # Reuse the stored row for buckets whose etag is unchanged; fetch details for the rest
+        rows: dict[str, dict] = {}
+        stale: list[str] = []
+        for name, etag in summaries:
+            old = previous.get(name)
+            old_row = json.loads(old["data"]) if old is not None and not old["deleted"] else None
+            if old_row is not None and old_row.get("etag") == etag:
+                rows[name] = old_row
+            else:
+                stale.append(name)
+
+        details, failures = await _fetch_bucket_details(client, namespace, stale, self.max_concurrency)
+        stats.detail_calls += len(stale)
+        for name, detail in details.items():
+            rows[name] = _bucket_row(detail)
+        for failure in failures:
+            stats.errors.append({"kind": "bucket", "compartment_id": compartment_id, "error": failure})
+            old = previous.get(failure["name"])
+            if old is not None:
+                # Keep the last known row rather than marking the bucket deleted
+                rows[failure["name"]] = json.loads(old["data"])
+        self._apply(stats, "bucket", compartment_id, region, list(rows.values()), now)
+
+    def _apply(self, stats: RefreshStats, kind, compartment_id, region, rows, now) -> None:
+        old_watermark = self.store.watermark(kind, compartment_id, region)
+        created = [r.get("time_created") for r in rows if r.get("time_created")]
+        watermark = max(created, default=old_watermark)
+        if old_watermark is not None:
+            stats.add(stats.new, kind, sum(1 for c in created if c > old_watermark))
+        changed, deleted = self.store.apply(kind, compartment_id, region, rows, watermark, now)
+        stats.add(stats.listed, kind, len(rows))
+        stats.add(stats.changed, kind, changed)
+        stats.add(stats.deleted, kind, deleted)
+
+
+_store: InventoryStore | None = None
+
+
+def get_store() -> InventoryStore:
+    """Return the process-wide store at ``settings.inventory_db_path``."""
+    global _store
+    if _store is None:
+        _store = InventoryStore()
+    return _store
@@ -0,0 +1,183 @@
+"""In-memory user/group membership graph.
+
+``MembershipGraph`` keeps IAM group memberships as two adjacency maps
+(group -> users, user -> groups) plus name indexes, so "members of group X"
+and "groups of user Y" are dictionary lookups. ``membership_graph`` loads one
+graph per profile: users and groups are listed once each, and memberships
+are listed per group, with the groups fetched concurrently. After
+``settings.membership_graph_ttl_seconds`` (or on ``refresh``) the listings
+are repeated — OCI has no "changed since" filter for memberships — and only
+the difference is applied to the graph: new membership ids are added,
+vanished ones removed, and memberships created after the previous load's
+newest ``time_created`` are reported.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+from .auth import OCIAuth
+from .config import settings
+from .executor import run_blocking
+from .metadata import metadata
+from .pagination import Pager
+
+
+def _make_membership_dict(m) -> dict:
+    return {
+        "id": m.id,
+        "user_id": m.user_id,
+        "group_id": m.group_id,
+        "lifecycle_state": m.lifecycle_state,
+        "time_created": str(m.time_created),
+    }
+
+
+class MembershipGraph:
+    """Adjacency maps between users and groups, updated in place by ``sync``."""
+
+    def __init__(self) -> None:
+        self.users: dict[str, dict] = {}
+        self.groups: dict[str, dict] = {}
+        self._members: dict[str, set[str]] = {}
+        self._groups_of: dict[str, set[str]] = {}
+        self._memberships: dict[str, tuple[str, str]] = {}
+        self._user_names: dict[str, str] = {}
+        self._group_names: dict[str, str] = {}
+        # Newest membership time_created seen so far.
+        self.watermark: str = ""
+        self.loaded_at: str | None = None
+        self.last_delta: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._memberships)
+
+    def _add(self, membership_id: str, user_id: str, group_id: str) -> None:
+        self._memberships[membership_id] = (user_id, group_id)
+        self._members.setdefault(group_id, set()).add(user_id)
+        self._groups_of.setdefault(user_id, set()).add(group_id)
+
+    def _remove(self, membership_id: str) -> None:
+        user_id, group_id = self._memberships.pop(membership_id)
+        self._members.get(group_id, set()).discard(user_id)
+        self._groups_of.get(user_id, set()).discard(group_id)
+
+    def sync(self, users: list[dict], groups: list[dict], memberships: list[dict]) -> dict:
+        """Bring the graph up to date with full listings and return what changed."""
+        self.users = {u["id"]: u for u in users}
+        self.groups = {g["id"]: g for g in groups}
+        self._user_names = {}
+        for u in users:
+            for name in (u.get("name"), u.get("email")):
+                if name:
+                    self._user_names[name.lower()] = u["id"]
+        self._group_names = {g["name"].lower(): g["id"] for g in groups}
+
+        current = {m["id"]: m for m in memberships if m.get("lifecycle_state", "ACTIVE") == "ACTIVE"}
+        removed = [mid for mid in self._memberships if mid not in current]
+        for mid in removed:
+            self._remove(mid)
+        added = 0
+        for mid, m in current.items():
+            if mid in self._memberships:
+                continue
+            self._add(mid, m["user_id"], m["group_id"])
+            added += 1
+        new_since = sum(1 for m in current.values() if self.watermark and m["time_created"] > self.watermark)
+        self.watermark = max([self.watermark, *(m["time_created"] for m in current.values())])
+        self.loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.last_delta = {"added": added, "removed": len(removed), "created_since_last_load": new_since}
+        return self.last_delta
+
+    def user_id(self, name_or_id: str) -> str | None:
+        if name_or_id in self.users:
+            return name_or_id
+        return self._user_names.get(name_or_id.lower())
+
+    def group_id(self, name_or_id: str) -> str | None:
+        if name_or_id in self.groups:
+            return name_or_id
+        return self._group_names.get(name_or_id.lower())
+
+    def members(self, group: str) -> list[dict]:
+        """Users in *group* (name or OCID).
+
+        Raises:
+            ValueError: if the group is unknown.
+        """
+        group_id = self.group_id(group)
+        if group_id is None:
+            raise ValueError(f"Unknown group: {group!r}")
+        return [self.users.get(u, {"id": u}) for u in sorted(self._members.get(group_id, ()))]
+
+    def groups_of(self, user: str) -> list[dict]:
+        """Groups *user* (name, email or OCID) belongs to.
+
+        Raises:
+            ValueError: if the user is unknown.
+        """
+        user_id = self.user_id(user)
+        if user_id is None:
+            raise ValueError(f"Unknown user: {user!r}")
+        return [self.groups.get(g, {"id": g}) for g in sorted(self._groups_of.get(user_id, ()))]
+
+    def group_sizes(self) -> list[dict]:
+        return sorted(
+            ({"id": g["id"], "name": g["name"], "members": len(self._members.get(gid, ()))}
+             for gid, g in self.groups.items()),
+            key=lambda row: (-row["members"], row["name"]),
+        )
+
+
+class MembershipGraphCache:
+    """Per-profile ``MembershipGraph`` refreshed by delta after the TTL."""
+
+    def __init__(self, ttl: float | None = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._graphs: dict[str, tuple[float, MembershipGraph]] = {}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.membership_graph_ttl_seconds
+
+    async def _listings(self, auth: OCIAuth) -> tuple[list[dict], list[dict], list[dict]]:
+        from .tools.identity import _make_group_dict, _make_user_dict
+
+        tenancy_id = await metadata.tenancy_id(auth)
+        client = await run_blocking(auth.identity_client)
+        users, groups = await asyncio.gather(
+            Pager(client.list_users, compartment_id=tenancy_id).collect(_make_user_dict),
+            Pager(client.list_groups, compartment_id=tenancy_id).collect(_make_group_dict),
+        )
+        semaphore = asyncio.Semaphore(settings.fanout_concurrency)
+
+        async def memberships_of(group_id: str) -> list[dict]:
+            async with semaphore:
+                pager = Pager(client.list_user_group_memberships, compartment_id=tenancy_id, group_id=group_id)
+                return await pager.collect(_make_membership_dict)
+
+        per_group = await asyncio.gather(*(memberships_of(g["id"]) for g in groups))
+        return users, groups, [m for rows in per_group for m in rows]
+
+    async def get(self, auth: OCIAuth, refresh: bool = False) -> MembershipGraph:
+        with self._lock:
+            entry = self._graphs.get(auth.profile)
+        if entry is not None and not refresh and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        graph = entry[1] if entry is not None else MembershipGraph()
+        graph.sync(*await self._listings(auth))
+        with self._lock:
+            self._graphs[auth.profile] = (time.monotonic(), graph)
+        return graph
+
+    def invalidate(self, profile: str | None = None) -> None:
+        with self._lock:
+            if profile is None:
+                self._graphs.clear()
+            else:
+                self._graphs.pop(profile, None)
+
+
+membership_graph = MembershipGraphCache()
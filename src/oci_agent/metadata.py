@@ -0,0 +1,145 @@
+"""Per-profile cache of tenancy metadata that rarely or never changes.
+
+The Object Storage namespace, tenancy OCID, home and subscribed regions and
+availability domains are needed by many tools but are effectively static, so they are
+fetched once per profile, kept for ``settings.metadata_ttl_seconds`` and
+optionally persisted to ``settings.metadata_cache_file`` so a new process
+starts warm.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .auth import OCIAuth
+from .config import settings
+from .executor import run_blocking
+
+
+class MetadataCache:
+    """TTL cache of tenancy metadata keyed by ``(profile, field)``.
+
+    Availability domains are region-specific, so that field is keyed by region
+    as well; everything else is tenancy-wide.
+    """
+
+    def __init__(self, ttl: float | None = None, path: str | None = None):
+        self._ttl = ttl
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, tuple[Any, float]]] | None = None
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.metadata_ttl_seconds
+
+    @property
+    def path(self) -> Path | None:
+        path = self._path if self._path is not None else settings.metadata_cache_file
+        return Path(path).expanduser() if path else None
+
+    def _load(self) -> dict[str, dict[str, tuple[Any, float]]]:
+        if self._entries is None:
+            self._entries = {}
+            path = self.path
+            if path and path.exists():
+                try:
+                    raw = json.loads(path.read_text())
+                    self._entries = {
+                        profile: {field: (value, ts) for field, (value, ts) in fields.items()}
+                        for profile, fields in raw.items()
+                    }
+                except (OSError, ValueError, TypeError):
+                    self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        path = self.path
+        if not path:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".metadata-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, path)
+
+    def get(self, profile: str, field: str) -> Any | None:
+        """Return the cached value, or None if missing or older than the TTL."""
+        with self._lock:
+            entry = self._load().get(profile, {}).get(field)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        return value if time.time() - fetched_at < self.ttl else None
+
+    def put(self, profile: str, field: str, value: Any) -> None:
+        with self._lock:
+            self._load().setdefault(profile, {})[field] = (value, time.time())
+            self._save()
+
+    def invalidate(self, profile: str | None = None) -> None:
+        """Forget one profile's metadata, or everything if *profile* is None."""
+        with self._lock:
+            entries = self._load()
+            if profile is None:
+                entries.clear()
+            else:
+                entries.pop(profile, None)
+            self._save()
+
+    async def _get_or_fetch(self, auth: OCIAuth, field: str, fetch) -> Any:
+        value = self.get(auth.profile, field)
+        if value is None:
+            value = await run_blocking(fetch)
+            self.put(auth.profile, field, value)
+        return value
+
+    async def namespace(self, auth: OCIAuth) -> str:
+        def fetch() -> str:
+            return auth.object_storage_client().get_namespace().data
+
+        return await self._get_or_fetch(auth, "namespace", fetch)
+
+    async def tenancy_id(self, auth: OCIAuth) -> str:
+        def fetch() -> str:
+            return auth.get_config()["tenancy"]
+
+        return await self._get_or_fetch(auth, "tenancy_id", fetch)
+
+    async def home_region(self, auth: OCIAuth) -> str:
+        tenancy_id = await self.tenancy_id(auth)
+
+        def fetch() -> str:
+            subscriptions = auth.identity_client().list_region_subscriptions(tenancy_id).data
+            return next(s.region_name for s in subscriptions if s.is_home_region)
+
+        return await self._get_or_fetch(auth, "home_region", fetch)
+
+    async def subscribed_regions(self, auth: OCIAuth) -> list[str]:
+        """Names of the regions the tenancy is subscribed to (status READY), home region first."""
+        tenancy_id = await self.tenancy_id(auth)
+
+        def fetch() -> list[str]:
+            subscriptions = auth.identity_client().list_region_subscriptions(tenancy_id).data
+            ready = [s for s in subscriptions if s.status == "READY"]
+            ready.sort(key=lambda s: (not s.is_home_region, s.region_name))
+            return [s.region_name for s in ready]
+
+        return await self._get_or_fetch(auth, "subscribed_regions", fetch)
+
+    async def availability_domains(self, auth: OCIAuth) -> list[str]:
+        tenancy_id = await self.tenancy_id(auth)
+        region = auth.region or auth.get_config().get("region", "")
+
+        def fetch() -> list[str]:
+            ads = auth.identity_client().list_availability_domains(compartment_id=tenancy_id).data
+            return [ad.name for ad in ads]
+
+        return await self._get_or_fetch(auth, f"availability_domains:{region}", fetch)
+
+
+metadata = MetadataCache()
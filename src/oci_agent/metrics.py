@@ -0,0 +1,251 @@
+"""Per-tool instrumentation: wall time, OCI requests, retries and payload size.
+
+``tool_metrics.wrap_tools`` wraps every tool handler registered by
+``OCIAgent``. Each call runs with a ``_CallRecord`` in a context variable;
+``RateLimiter.call`` reports every OCI request attempt (and retry) to it via
+``record_oci_request`` / ``record_oci_retry``, and ``run_blocking`` carries
+the context into the SDK worker threads, so requests are attributed to the
+tool that made them even when several tools run at once. When the call
+returns, its wall time, request count and latency, retries, response bytes
+and estimated tokens are folded into per-tool totals.
+
+``summary`` renders the totals for ``main.py --stats``; ``prometheus`` renders
+them in the Prometheus text exposition format for ``--metrics-file``.
+"""
+
+import contextvars
+import dataclasses
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .output import estimate_tokens
+
+if TYPE_CHECKING:
+    from claude_agent_sdk import SdkMcpTool
+
+# Upper bounds (seconds) of the tool duration histogram buckets; +Inf is implied.
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_PREFIX = "oci_agent"
+
+
+@dataclass
+class _CallRecord:
+    oci_requests: int = 0
+    oci_errors: int = 0
+    oci_seconds: float = 0.0
+    retries: int = 0
+
+
+@dataclass
+class _ToolStats:
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    oci_requests: int = 0
+    oci_errors: int = 0
+    oci_seconds: float = 0.0
+    retries: int = 0
+    response_bytes: int = 0
+    response_tokens: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+
+
+_current: contextvars.ContextVar[_CallRecord | None] = contextvars.ContextVar("oci_agent_tool_call", default=None)
+_record_lock = threading.Lock()
+
+
+def record_oci_request(seconds: float, failed: bool = False) -> None:
+    """Attribute one OCI request attempt to the tool call running in this context, if any."""
+    record = _current.get()
+    if record is None:
+        return
+    with _record_lock:
+        record.oci_requests += 1
+        record.oci_seconds += seconds
+        if failed:
+            record.oci_errors += 1
+
+
+def record_oci_retry() -> None:
+    record = _current.get()
+    if record is None:
+        return
+    with _record_lock:
+        record.retries += 1
+
+
+def _result_text(result: dict) -> str:
+    return "".join(block.get("text", "") for block in result.get("content", []))
+
+
+class ToolMetrics:
+    """Per-tool call statistics plus the last agent session's totals."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolStats] = {}
+        self.session: dict = {}
+
+    def observe(self, tool_name: str, seconds: float, record: _CallRecord, result: dict | None) -> None:
+        text = _result_text(result) if result is not None else ""
+        with self._lock:
+            stats = self._tools.setdefault(tool_name, _ToolStats())
+            stats.calls += 1
+            stats.errors += 1 if result is None or result.get("is_error") else 0
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.oci_requests += record.oci_requests
+            stats.oci_errors += record.oci_errors
+            stats.oci_seconds += record.oci_seconds
+            stats.retries += record.retries
+            stats.response_bytes += len(text.encode())
+            stats.response_tokens += estimate_tokens(text) if text else 0
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    stats.buckets[i] += 1
+
+    def wrap(self, tool_def: "SdkMcpTool") -> "SdkMcpTool":
+        """Return *tool_def* with a handler that records each call."""
+        handler = tool_def.handler
+        name = tool_def.name
+
+        async def instrumented_handler(args: dict) -> dict:
+            record = _CallRecord()
+            token = _current.set(record)
+            started = time.monotonic()
+            result = None
+            try:
+                result = await handler(args)
+                return result
+            finally:
+                _current.reset(token)
+                self.observe(name, time.monotonic() - started, record, result)
+
+        return dataclasses.replace(tool_def, handler=instrumented_handler)
+
+    def wrap_tools(self, tools: Iterable["SdkMcpTool"]) -> list["SdkMcpTool"]:
+        return [self.wrap(t) for t in tools]
+
+    def record_session(self, **values) -> None:
+        """Keep the agent session's totals (duration, API time, turns, cost) for the summary."""
+        self.session = {k: v for k, v in values.items() if v is not None}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self.session = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            tools = {
+                name: {
+                    k: round(v, 3) if isinstance(v, float) else v
+                    for k, v in dataclasses.asdict(s).items()
+                    if k != "buckets"
+                }
+                for name, s in self._tools.items()
+            }
+        totals = {
+            k: round(sum(t[k] for t in tools.values()), 3)
+            for k in ("calls", "errors", "seconds", "oci_requests", "oci_seconds", "retries",
+                      "response_bytes", "response_tokens")
+        }
+        return {**totals, "tools": tools, "session": dict(self.session)}
+
+    @staticmethod
+    def since(before: dict, after: dict) -> dict:
+        """Return the ``stats()`` difference *after* - *before*: what happened between two snapshots.
+
+        ``max_seconds`` keeps *after*'s running maximum, tools without new calls are
+        dropped, and ``session`` is *after*'s.
+        """
+        tools = {}
+        for name, t in after["tools"].items():
+            prior = before["tools"].get(name, {})
+            if t["calls"] == prior.get("calls", 0):
+                continue
+            delta = {k: v - prior.get(k, 0) for k, v in t.items()}
+            delta["max_seconds"] = t["max_seconds"]
+            tools[name] = {k: round(v, 3) if isinstance(v, float) else v for k, v in delta.items()}
+        totals = {k: round(sum(t[k] for t in tools.values()), 3) for k in after if k not in ("tools", "session")}
+        return {**totals, "tools": tools, "session": dict(after["session"])}
+
+    def summary(self, stats: dict | None = None) -> str:
+        """Format *stats* (default: the current ``stats()``) as a per-tool table."""
+        s = stats if stats is not None else self.stats()
+        lines = []
+        session = s["session"]
+        if session:
+            parts = [f"session={session.get('duration_ms', 0) / 1000:.1f}s"]
+            if "duration_api_ms" in session:
+                parts.append(f"model_api={session['duration_api_ms'] / 1000:.1f}s")
+            parts.append(f"tools={s['seconds']:.1f}s")
+            if "num_turns" in session:
+                parts.append(f"turns={session['num_turns']}")
+            if "total_cost_usd" in session:
+                parts.append(f"cost=${session['total_cost_usd']:.4f}")
+            lines.append("[stats] " + " ".join(parts))
+        header = (
+            f"{'tool':<30} {'calls':>5} {'errors':>6} {'wall_s':>8} {'max_s':>7} "
+            f"{'oci_req':>7} {'oci_s':>8} {'retries':>7} {'bytes':>9} {'~tokens':>8}"
+        )
+        lines.append("[stats] " + header)
+        ranked = sorted(s["tools"].items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+        for name, t in ranked:
+            lines.append(
+                f"[stats] {name:<30} {t['calls']:>5} {t['errors']:>6} {t['seconds']:>8.2f} "
+                f"{t['max_seconds']:>7.2f} {t['oci_requests']:>7} {t['oci_seconds']:>8.2f} "
+                f"{t['retries']:>7} {t['response_bytes']:>9} {t['response_tokens']:>8}"
+            )
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """Render the per-tool totals in the Prometheus text exposition format."""
+        with self._lock:
+            tools = {name: dataclasses.replace(s, buckets=list(s.buckets)) for name, s in self._tools.items()}
+        p = METRIC_PREFIX
+        out: list[str] = []
+
+        def family(name: str, kind: str, help_text: str, attr: str) -> None:
+            out.append(f"# HELP {p}_{name} {help_text}")
+            out.append(f"# TYPE {p}_{name} {kind}")
+            for tool, s in sorted(tools.items()):
+                out.append(f'{p}_{name}{{tool="{tool}"}} {getattr(s, attr)}')
+
+        family("tool_calls_total", "counter", "Tool calls.", "calls")
+        family("tool_errors_total", "counter", "Tool calls that returned an error or raised.", "errors")
+        family("tool_oci_requests_total", "counter", "OCI API request attempts made by tool calls.", "oci_requests")
+        family("tool_oci_request_errors_total", "counter", "OCI API request attempts that failed.", "oci_errors")
+        family("tool_oci_request_seconds_total", "counter", "Time spent in OCI API requests.", "oci_seconds")
+        family("tool_oci_retries_total", "counter", "OCI API requests retried after throttling or errors.", "retries")
+        family("tool_response_bytes_total", "counter", "Bytes of tool result text returned.", "response_bytes")
+        family("tool_response_tokens_total", "counter", "Estimated tokens of tool result text.", "response_tokens")
+
+        name = f"{p}_tool_duration_seconds"
+        out.append(f"# HELP {name} Tool call wall time.")
+        out.append(f"# TYPE {name} histogram")
+        for tool, s in sorted(tools.items()):
+            for bound, count in zip(DURATION_BUCKETS, s.buckets):
+                out.append(f'{name}_bucket{{tool="{tool}",le="{bound}"}} {count}')
+            out.append(f'{name}_bucket{{tool="{tool}",le="+Inf"}} {s.calls}')
+            out.append(f'{name}_sum{{tool="{tool}"}} {round(s.seconds, 6)}')
+            out.append(f'{name}_count{{tool="{tool}"}} {s.calls}')
+
+        for key, value in sorted(self.session.items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                out.append(f"# TYPE {p}_session_{key} gauge")
+                out.append(f"{p}_session_{key} {value}")
+        return "\n".join(out) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        target = Path(path).expanduser()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(self.prometheus())
+
+
+tool_metrics = ToolMetrics()
@@ -0,0 +1,402 @@
+"""Indexed security-list rules for exposure and reachability queries.
+
+``VcnRuleIndex`` holds every ingress and egress rule of a VCN's security lists
+normalised to integer address intervals (IPv4 and IPv6 kept apart) and port
+ranges, in an ``IntervalIndex`` per direction and IP version, together with
+the subnets each list is attached to. "Which rules admit 0.0.0.0/0 on port
+22?" is then a stabbing query plus a port/protocol check on the few
+candidates, instead of a scan of every rule.
+
+``security_rule_index`` caches one index per ``(profile, region, VCN)`` for
+``settings.security_rule_index_ttl_seconds``. OCI doesn't return etags on
+listed security lists, so once the TTL expires the lists and subnets are
+fetched again and the index is only rebuilt if the digest of their rules and
+attachments changed.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import json
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .auth import OCIAuth
+from .config import settings
+from .executor import run_blocking
+from .pagination import Pager
+
+DIRECTIONS = ("ingress", "egress")
+MATCH_MODES = ("contains", "overlaps")
+# Protocol names accepted by the tools -> OCI's protocol values (IANA numbers or "all").
+PROTOCOLS: dict[str, str] = {"all": "all", "icmp": "1", "tcp": "6", "udp": "17", "icmpv6": "58"}
+PROTOCOL_NAMES = {number: name for name, number in PROTOCOLS.items()}
+# Protocols whose rules carry port ranges.
+PORT_PROTOCOLS = ("all", "6", "17")
+ALL_PORTS = (0, 65535)
+
+
+def normalize_protocol(value: str | int | None) -> str:
+    """Map ``"tcp"``/``"6"``/``6`` etc. to OCI's protocol value.
+
+    Raises:
+        ValueError: for anything that isn't a protocol name or number.
+    """
+    if value is None or value == "":
+        return "all"
+    text = str(value).strip().lower()
+    if text in PROTOCOLS:
+        return PROTOCOLS[text]
+    if text.isdigit() and 0 <= int(text) <= 255:
+        return text
+    raise ValueError(f"Unknown protocol {value!r}; use one of {', '.join(PROTOCOLS)} or an IP protocol number")
+
+
+def parse_network(value: str) -> tuple[int, int, int] | None:
+    """Return ``(first, last, version)`` for an IP address or CIDR, or None for anything else.
+
+    Service CIDR labels such as ``all-iad-services-in-oracle-services-network``
+    are not addresses and come back as None.
+    """
+    try:
+        net = ipaddress.ip_network(value, strict=False)
+    except (TypeError, ValueError):
+        return None
+    return int(net.network_address), int(net.broadcast_address), net.version
+
+
+class IntervalIndex:
+    """Static interval tree over closed integer intervals.
+
+    Intervals are sorted by start and treated as an implicit balanced tree
+    (each slice's middle element is its root) annotated with the largest end
+    in every slice, so overlap and stabbing queries cost O(log n + matches).
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, int, Any]]):
+        self._items = sorted(intervals, key=lambda t: (t[0], t[1]))
+        self._max_end = [0] * len(self._items)
+        self._annotate(0, len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _annotate(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(self._items[mid][1], self._annotate(lo, mid), self._annotate(mid + 1, hi))
+        return self._max_end[mid]
+
+    def overlapping(self, lo: int, hi: int) -> list[Any]:
+        """Return the items of every interval that intersects ``[lo, hi]``."""
+        found = []
+        stack = [(0, len(self._items))]
+        while stack:
+            a, b = stack.pop()
+            if a >= b:
+                continue
+            mid = (a + b) // 2
+            if self._max_end[mid] < lo:
+                continue
+            stack.append((a, mid))
+            start, end, item = self._items[mid]
+            if start <= hi:
+                if end >= lo:
+                    found.append(item)
+                stack.append((mid + 1, b))
+        return found
+
+    def stab(self, point: int) -> list[Any]:
+        """Return the items of every interval containing *point*."""
+        return self.overlapping(point, point)
+
+
+@dataclass(frozen=True)
+class SecurityRule:
+    """One security-list rule, normalised for indexing."""
+
+    security_list_id: str
+    direction: str
+    position: int
+    protocol: str
+    # Source CIDR for ingress, destination CIDR for egress, or a service CIDR label.
+    cidr: str
+    cidr_type: str
+    stateless: bool
+    # Destination port range for TCP/UDP/all, None for protocols without ports.
+    ports: tuple[int, int] | None
+    source_ports: tuple[int, int] | None
+    icmp: tuple[int, int | None] | None
+    description: str | None
+
+    @property
+    def network(self) -> tuple[int, int, int] | None:
+        return parse_network(self.cidr)
+
+    def admits(self, protocol: str, ports: tuple[int, int] | None) -> bool:
+        """True if this rule allows *protocol* traffic to any port in *ports* (None: any port)."""
+        if protocol != "all" and self.protocol not in ("all", protocol):
+            return False
+        if ports is None:
+            return True
+        return self.ports is not None and self.ports[0] <= ports[1] and ports[0] <= self.ports[1]
+
+    def to_dict(self) -> dict:
+        row = asdict(self)
+        row["protocol"] = PROTOCOL_NAMES.get(self.protocol, self.protocol)
+        row["source" if self.direction == "ingress" else "destination"] = row.pop("cidr")
+        row["ports"] = _format_ports(self.ports)
+        row["source_ports"] = _format_ports(self.source_ports)
+        return {k: v for k, v in row.items() if v is not None}
+
+
+def _format_ports(ports: tuple[int, int] | None) -> str | None:
+    if ports is None or ports == ALL_PORTS:
+        return None if ports is None else "all"
+    return str(ports[0]) if ports[0] == ports[1] else f"{ports[0]}-{ports[1]}"
+
+
+def _port_range(options: Any, name: str) -> tuple[int, int] | None:
+    port_range = getattr(options, name, None) if options is not None else None
+    if port_range is None:
+        return None
+    return int(port_range.min), int(port_range.max)
+
+
+def rules_from_security_list(sl: Any) -> list[SecurityRule]:
+    """Normalise the ingress and egress rules of an SDK ``SecurityList``."""
+    rules = []
+    for direction, attr, cidr_attr in (
+        ("ingress", "ingress_security_rules", "source"),
+        ("egress", "egress_security_rules", "destination"),
+    ):
+        for position, r in enumerate(getattr(sl, attr, None) or []):
+            protocol = normalize_protocol(r.protocol)
+            ports = source_ports = icmp = None
+            if protocol in PORT_PROTOCOLS:
+                options = r.tcp_options if protocol == "6" else r.udp_options if protocol == "17" else None
+                ports = _port_range(options, "destination_port_range") or ALL_PORTS
+                source_ports = _port_range(options, "source_port_range")
+            elif protocol in ("1", "58") and r.icmp_options is not None:
+                icmp = (r.icmp_options.type, r.icmp_options.code)
+            rules.append(
+                SecurityRule(
+                    security_list_id=sl.id,
+                    direction=direction,
+                    position=position,
+                    protocol=protocol,
+                    cidr=getattr(r, cidr_attr),
+                    cidr_type=getattr(r, f"{cidr_attr}_type", None) or "CIDR_BLOCK",
+                    stateless=bool(r.is_stateless),
+                    ports=ports,
+                    source_ports=source_ports,
+                    icmp=icmp,
+                    description=r.description,
+                )
+            )
+    return rules
+
+
+class VcnRuleIndex:
+    """Interval index over every security-list rule of one VCN and the subnets using each list."""
+
+    def __init__(self, vcn: dict, security_lists: list[dict], subnets: list[dict], digest: str = ""):
+        self.vcn = vcn
+        self.digest = digest
+        self.security_lists = {sl["id"]: sl for sl in security_lists}
+        self.subnets = {s["id"]: s for s in subnets}
+        self._subnets_by_list: dict[str, list[str]] = {}
+        for s in subnets:
+            for list_id in s.get("security_list_ids") or []:
+                self._subnets_by_list.setdefault(list_id, []).append(s["id"])
+
+        rules = [r for sl in security_lists for r in sl["rules"]]
+        self.rule_count = len(rules)
+        self._trees: dict[tuple[str, int], IntervalIndex] = {}
+        self._labels: dict[tuple[str, str], list[SecurityRule]] = {}
+        for direction in DIRECTIONS:
+            for version in (4, 6):
+                self._trees[(direction, version)] = IntervalIndex(
+                    (net[0], net[1], r)
+                    for r in rules
+                    if r.direction == direction and (net := r.network) and net[2] == version
+                )
+        for r in rules:
+            if r.network is None:
+                self._labels.setdefault((r.direction, r.cidr), []).append(r)
+        self._subnet_tree = {
+            version: IntervalIndex(
+                (net[0], net[1], s["id"])
+                for s in subnets
+                for cidr in [s.get("cidr_block"), *(s.get("ipv6_cidr_blocks") or [])]
+                if cidr and (net := parse_network(cidr)) and net[2] == version
+            )
+            for version in (4, 6)
+        }
+
+    def query(
+        self,
+        direction: str = "ingress",
+        cidr: str = "0.0.0.0/0",
+        *,
+        ports: tuple[int, int] | None = None,
+        protocol: str = "all",
+        match: str = "contains",
+        security_list_ids: Iterable[str] | None = None,
+    ) -> list[SecurityRule]:
+        """Rules in *direction* that admit traffic from (ingress) or to (egress) *cidr*.
+
+        ``match="contains"`` returns rules whose CIDR covers all of *cidr*
+        (e.g. rules open to the whole internet for ``0.0.0.0/0``);
+        ``"overlaps"`` returns rules admitting any address in it. *cidr* may
+        also be a service CIDR label, matched literally.
+
+        Raises:
+            ValueError: for an unknown direction or match mode.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}")
+        if match not in MATCH_MODES:
+            raise ValueError(f"match must be one of {', '.join(MATCH_MODES)}")
+        net = parse_network(cidr)
+        if net is None:
+            candidates = self._labels.get((direction, cidr), [])
+        else:
+            first, last, version = net
+            tree = self._trees[(direction, version)]
+            if match == "contains":
+                candidates = [r for r in tree.stab(first) if r.network[1] >= last]
+            else:
+                candidates = tree.overlapping(first, last)
+        lists = set(security_list_ids) if security_list_ids is not None else None
+        found = [
+            r for r in candidates
+            if r.admits(protocol, ports) and (lists is None or r.security_list_id in lists)
+        ]
+        return sorted(found, key=lambda r: (r.security_list_id, r.direction, r.position))
+
+    def subnets_using(self, security_list_id: str) -> list[str]:
+        return list(self._subnets_by_list.get(security_list_id, []))
+
+    def subnet_containing(self, address: str) -> str | None:
+        """Return the OCID of the subnet whose CIDR contains *address*, if any."""
+        net = parse_network(address)
+        if net is None:
+            return None
+        found = self._subnet_tree[net[2]].stab(net[0])
+        return found[0] if found else None
+
+    def describe(self, rule: SecurityRule) -> dict:
+        """A result row for *rule*: the rule plus its list, VCN and attached subnets."""
+        sl = self.security_lists.get(rule.security_list_id, {})
+        return {
+            "vcn_id": self.vcn["id"],
+            "security_list_name": sl.get("display_name"),
+            **rule.to_dict(),
+            "subnets": [self.subnets[s]["display_name"] for s in self.subnets_using(rule.security_list_id)],
+        }
+
+
+def _make_security_list_entry(sl: Any) -> dict:
+    return {
+        "id": sl.id,
+        "display_name": sl.display_name,
+        "compartment_id": sl.compartment_id,
+        "rules": rules_from_security_list(sl),
+    }
+
+
+def _make_subnet_entry(s: Any) -> dict:
+    return {
+        "id": s.id,
+        "display_name": s.display_name,
+        "cidr_block": s.cidr_block,
+        "ipv6_cidr_blocks": list(getattr(s, "ipv6_cidr_blocks", None) or []),
+        "security_list_ids": list(s.security_list_ids or []),
+    }
+
+
+def _digest(security_lists: list[dict], subnets: list[dict]) -> str:
+    content = {
+        "security_lists": sorted(
+            ([sl["id"], [asdict(r) for r in sl["rules"]]] for sl in security_lists), key=lambda e: e[0]
+        ),
+        "subnets": sorted(
+            [s["id"], s["cidr_block"], s["ipv6_cidr_blocks"], sorted(s["security_list_ids"])] for s in subnets
+        ),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def fetch_vcn_rules(auth: OCIAuth, vcn_id: str) -> tuple[dict, list[dict], list[dict]]:
+    """Fetch a VCN, its subnets and every security list they use (including lists in other compartments)."""
+    client = await run_blocking(auth.virtual_network_client)
+    vcn = (await run_blocking(client.get_vcn, vcn_id)).data
+    lists_pager = Pager(client.list_security_lists, compartment_id=vcn.compartment_id, vcn_id=vcn_id)
+    subnets_pager = Pager(client.list_subnets, compartment_id=vcn.compartment_id, vcn_id=vcn_id)
+    security_lists, subnets = await asyncio.gather(
+        lists_pager.collect(_make_security_list_entry), subnets_pager.collect(_make_subnet_entry)
+    )
+    known = {sl["id"] for sl in security_lists}
+    missing = list(dict.fromkeys(i for s in subnets for i in s["security_list_ids"] if i not in known))
+    fetched = await asyncio.gather(*(run_blocking(client.get_security_list, i) for i in missing))
+    security_lists += [_make_security_list_entry(response.data) for response in fetched]
+    vcn_entry = {"id": vcn.id, "display_name": vcn.display_name, "compartment_id": vcn.compartment_id}
+    return vcn_entry, security_lists, subnets
+
+
+class SecurityRuleIndexCache:
+    """Per-``(profile, region, VCN)`` cache of ``VcnRuleIndex`` objects, revalidated by content digest."""
+
+    def __init__(self, ttl: float | None = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str | None, str], tuple[float, VcnRuleIndex]] = {}
+        self._stats = {"hits": 0, "revalidated": 0, "builds": 0}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.security_rule_index_ttl_seconds
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    async def get(self, auth: OCIAuth, vcn_id: str, refresh: bool = False) -> VcnRuleIndex:
+        key = (auth.profile, auth.region, vcn_id)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and not refresh and time.monotonic() - entry[0] < self.ttl:
+            self._count("hits")
+            return entry[1]
+
+        vcn, security_lists, subnets = await fetch_vcn_rules(auth, vcn_id)
+        digest = _digest(security_lists, subnets)
+        if entry is not None and entry[1].digest == digest:
+            index = entry[1]
+            self._count("revalidated")
+        else:
+            index = VcnRuleIndex(vcn, security_lists, subnets, digest)
+            self._count("builds")
+        with self._lock:
+            self._entries[key] = (time.monotonic(), index)
+        return index
+
+    def invalidate(self, profile: str | None = None) -> None:
+        with self._lock:
+            if profile is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == profile]:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "vcns": len(self._entries)}
+
+
+security_rule_index = SecurityRuleIndexCache()
@@ -0,0 +1,313 @@
+"""Streaming Object Storage listing and aggregation.
+
+``object_pager`` wraps ``list_objects`` in a ``Pager`` with OCI's ``prefix``,
+``delimiter``, ``start``/``end`` and ``fields`` parameters, collecting the
+common prefixes a delimiter produces as pages arrive. ``ObjectAggregate``
+folds objects into counts, total size and a size histogram per group (the
+next prefix level or the storage tier) one record at a time, so a bucket of
+any size can be summarised without holding its listing. ``scan_objects``
+splits a bucket's key space into partitions and aggregates them in parallel.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .config import settings
+from .pagination import Pager
+
+# Tool-facing field name -> OCI list_objects `fields` name ("name" is always returned).
+OBJECT_FIELDS: dict[str, str] = {
+    "name": "name",
+    "size": "size",
+    "etag": "etag",
+    "md5": "md5",
+    "time_created": "timeCreated",
+    "time_modified": "timeModified",
+    "storage_tier": "storageTier",
+    "archival_state": "archivalState",
+}
+DEFAULT_OBJECT_FIELDS = ["name", "size", "time_modified", "md5", "storage_tier"]
+AGGREGATE_GROUPS = ("prefix", "storage_tier", "none")
+
+# Upper bounds (exclusive) of the size histogram buckets; the last bucket is open-ended.
+SIZE_BUCKETS: list[tuple[int | None, str]] = [
+    (1 << 10, "<1KiB"),
+    (1 << 20, "<1MiB"),
+    (100 << 20, "<100MiB"),
+    (1 << 30, "<1GiB"),
+    (None, ">=1GiB"),
+]
+
+
+def size_bucket(size: int) -> str:
+    for bound, label in SIZE_BUCKETS:
+        if bound is None or size < bound:
+            return label
+    return SIZE_BUCKETS[-1][1]
+
+
+def make_object_row(o: Any, fields: list[str]) -> dict:
+    """Build a row with only *fields* (tool-facing names) from an ``ObjectSummary``."""
+    row = {}
+    for f in fields:
+        value = getattr(o, f, None)
+        row[f] = str(value) if f.startswith("time_") and value is not None else value
+    return row
+
+
+def object_pager(
+    client: Any,
+    namespace: str,
+    bucket_name: str,
+    args: dict,
+    *,
+    fields: list[str],
+    prefixes: set[str] | None = None,
+    **kwargs: Any,
+) -> Pager:
+    """Build a ``Pager`` over ``list_objects`` from a tool's *args*.
+
+    Honours ``prefix``, ``delimiter``, ``start`` and ``end`` in *args* (plus the
+    pagination arguments). Common prefixes returned alongside the objects when
+    a delimiter is set are added to *prefixes*; objects are always yielded
+    in name order.
+    """
+
+    def items(data: Any) -> Any:
+        if prefixes is not None and getattr(data, "prefixes", None):
+            prefixes.update(data.prefixes)
+        return data.objects
+
+    params: dict[str, Any] = {}
+    for name in ("prefix", "delimiter", "end"):
+        if args.get(name):
+            params[name] = args[name]
+    # A resume token (`page`) takes precedence over the initial `start` key.
+    page = args.get("page") or args.get("start") or None
+    oci_fields = ",".join(dict.fromkeys(OBJECT_FIELDS[f] for f in ["name", *fields]))
+    # Object listing pages by object name: the token is data.next_start_with, sent back as `start`.
+    return Pager.from_args(
+        client.list_objects,
+        {k: v for k, v in args.items() if k not in ("page", "fields")},
+        items=items,
+        next_token=lambda response: response.data.next_start_with,
+        token_param="start",
+        page=page,
+        namespace_name=namespace,
+        bucket_name=bucket_name,
+        fields=oci_fields,
+        **params,
+        **kwargs,
+    )
+
+
+@dataclass
+class _Totals:
+    count: int = 0
+    bytes: int = 0
+    histogram: dict[str, int] = field(default_factory=dict)
+
+    def add(self, size: int) -> None:
+        self.count += 1
+        self.bytes += size
+        label = size_bucket(size)
+        self.histogram[label] = self.histogram.get(label, 0) + 1
+
+    def merge(self, other: "_Totals") -> None:
+        self.count += other.count
+        self.bytes += other.bytes
+        for label, n in other.histogram.items():
+            self.histogram[label] = self.histogram.get(label, 0) + n
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_bytes": self.bytes,
+            "total_gb": round(self.bytes / (1024 ** 3), 3),
+            "size_histogram": {label: self.histogram[label] for _, label in SIZE_BUCKETS if label in self.histogram},
+        }
+
+
+class ObjectAggregate:
+    """Running totals over streamed objects, overall and per group.
+
+    With ``group_by="prefix"`` an object is grouped by the next path level below
+    *prefix* (up to and including *delimiter*); objects directly at that level
+    are grouped under *prefix* itself.
+    """
+
+    def __init__(self, group_by: str = "prefix", prefix: str = "", delimiter: str = "/"):
+        if group_by not in AGGREGATE_GROUPS:
+            raise ValueError(f"group_by must be one of {', '.join(AGGREGATE_GROUPS)}")
+        self.group_by = group_by
+        self.prefix = prefix or ""
+        self.delimiter = delimiter or "/"
+        self.total = _Totals()
+        self.groups: dict[str, _Totals] = {}
+
+    def group_of(self, o: Any) -> str | None:
+        if self.group_by == "storage_tier":
+            return getattr(o, "storage_tier", None) or "Standard"
+        if self.group_by == "prefix":
+            rest = o.name[len(self.prefix):] if o.name.startswith(self.prefix) else o.name
+            cut = rest.find(self.delimiter)
+            return self.prefix + rest[: cut + len(self.delimiter)] if cut >= 0 else self.prefix
+        return None
+
+    def add(self, o: Any) -> None:
+        size = o.size or 0
+        self.total.add(size)
+        group = self.group_of(o)
+        if group is not None:
+            self.groups.setdefault(group, _Totals()).add(size)
+
+    def merge(self, other: "ObjectAggregate") -> None:
+        self.total.merge(other.total)
+        for group, totals in other.groups.items():
+            self.groups.setdefault(group, _Totals()).merge(totals)
+
+    def to_dict(self, max_groups: int | None = None) -> dict:
+        """Summarise, largest groups first; groups past *max_groups* are folded into ``other``."""
+        result: dict[str, Any] = {"group_by": self.group_by, **self.total.to_dict()}
+        if self.group_by == "none":
+            return result
+        ranked = sorted(self.groups.items(), key=lambda kv: kv[1].bytes, reverse=True)
+        shown = ranked if max_groups is None else ranked[:max_groups]
+        result["groups"] = [{"group": g, **t.to_dict()} for g, t in shown]
+        if len(ranked) > len(shown):
+            other = _Totals()
+            for _, t in ranked[len(shown):]:
+                other.merge(t)
+            result["other_groups"] = {"groups": len(ranked) - len(shown), **other.to_dict()}
+        return result
+
+
+# Characters object names commonly start with, in listing order; range partitions split this span.
+RANGE_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+PARTITION_MODES = ("auto", "prefix", "range")
+
+
+@dataclass
+class ScanResult:
+    """Merged aggregate of a partitioned scan plus per-partition progress."""
+
+    aggregate: ObjectAggregate
+    partitions: list[dict] = field(default_factory=list)
+    mode: str = "range"
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return all(p.get("complete") for p in self.partitions)
+
+
+def range_partitions(prefix: str, count: int) -> list[tuple[str | None, str | None]]:
+    """Split the names under *prefix* into *count* contiguous ``[start, end)`` key ranges.
+
+    The first range starts at the beginning and the last is open-ended, so
+    together they cover every name, including ones outside ``RANGE_ALPHABET``.
+    """
+    count = max(1, min(count, len(RANGE_ALPHABET)))
+    bounds = [prefix + RANGE_ALPHABET[i * len(RANGE_ALPHABET) // count] for i in range(1, count)]
+    return list(zip([None, *bounds], [*bounds, None]))
+
+
+async def scan_objects(
+    client: Any,
+    namespace: str,
+    bucket_name: str,
+    *,
+    prefix: str = "",
+    group_by: str = "prefix",
+    partition_by: str = "auto",
+    max_workers: int | None = None,
+    time_budget: float | None = None,
+) -> ScanResult:
+    """Aggregate every object under *prefix*, listing key-space partitions in parallel.
+
+    OCI lists serially within one cursor, so the key space is split and each
+    partition gets its own cursor: ``prefix`` partitions are the sub-prefixes
+    one ``/`` level below *prefix* (found by a delimiter listing of that
+    level, whose own objects are aggregated on the way); ``range`` partitions
+    are ``start``/``end`` key ranges; ``auto`` uses prefixes when the first
+    delimiter page shows at least two, else ranges. At most *max_workers*
+    partitions are listed at once, all sharing *time_budget*; a partition that
+    runs out of time reports the key to resume from.
+    """
+    if partition_by not in PARTITION_MODES:
+        raise ValueError(f"partition_by must be one of {', '.join(PARTITION_MODES)}")
+    workers = max(1, max_workers or settings.object_scan_workers)
+    budget = time_budget if time_budget is not None else settings.list_time_budget_seconds
+    started = time.monotonic()
+    result = ScanResult(aggregate=ObjectAggregate(group_by, prefix))
+
+    def remaining() -> float:
+        return max(0.0, budget - (time.monotonic() - started))
+
+    def pager_for(target: dict, **kwargs: Any) -> Pager:
+        return object_pager(
+            client, namespace, bucket_name, target, fields=["size", "storage_tier"], max_items=None, **kwargs
+        )
+
+    targets: list[dict] = []
+    if partition_by in ("auto", "prefix"):
+        sub_prefixes: set[str] = set()
+        level = ObjectAggregate(group_by, prefix)
+        # A zero time budget makes the pager stop after exactly one page.
+        probe = pager_for({"prefix": prefix, "delimiter": "/"}, prefixes=sub_prefixes, time_budget=0.0)
+        async for o in probe:
+            level.add(o)
+        if partition_by == "prefix" or len(sub_prefixes) >= 2:
+            result.mode = "prefix"
+            rest = probe
+            if probe.next_page:
+                rest = pager_for(
+                    {"prefix": prefix, "delimiter": "/", "start": probe.next_page},
+                    prefixes=sub_prefixes,
+                    time_budget=remaining(),
+                )
+                async for o in rest:
+                    level.add(o)
+            result.aggregate.merge(level)
+            level_report = {"partition": prefix or "/", "level_only": True, "count": level.total.count}
+            level_report["complete"] = rest.next_page is None
+            if rest.next_page:
+                level_report["next_start"] = rest.next_page
+            result.partitions.append(level_report)
+            targets = [{"prefix": p} for p in sorted(sub_prefixes)]
+    if result.mode == "range":
+        targets = [
+            {"prefix": prefix, **({"start": s} if s else {}), **({"end": e} if e else {})}
+            for s, e in range_partitions(prefix, workers * 2)
+        ]
+
+    semaphore = asyncio.Semaphore(workers)
+
+    async def scan(target: dict) -> None:
+        if result.mode == "range":
+            report: dict[str, Any] = {"start": target.get("start"), "end": target.get("end")}
+        else:
+            report = {"partition": target["prefix"]}
+        async with semaphore:
+            t0 = time.monotonic()
+            pager = pager_for(target, time_budget=remaining())
+            partial = ObjectAggregate(group_by, prefix)
+            try:
+                async for o in pager:
+                    partial.add(o)
+            except Exception as e:
+                report["error"] = str(e)
+            # Fold in whatever was listed, so totals always match the partitions' counts.
+            result.aggregate.merge(partial)
+            report["count"] = partial.total.count
+            report["complete"] = "error" not in report and pager.next_page is None
+            report["seconds"] = round(time.monotonic() - t0, 2)
+            if pager.next_page:
+                report["next_start"] = pager.next_page
+        result.partitions.append(report)
+
+    await asyncio.gather(*(scan(t) for t in targets))
+    result.elapsed = round(time.monotonic() - started, 2)
+    return result
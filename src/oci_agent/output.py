@@ -0,0 +1,203 @@
+"""Helpers for building MCP tool results.
+
+Tool payloads are encoded by ``encode`` in one of three formats
+(``settings.output_format``):
+
+* ``table`` (default) — compact JSON with every list of objects rewritten as
+  ``{"columns": [...], "rows": [[...], ...]}`` so keys are sent once, not per row;
+* ``json`` — compact JSON, no indentation;
+* ``pretty`` — the original ``indent=2`` JSON.
+
+Results larger than ``settings.output_max_tokens`` are cut at a row boundary.
+The rows left out are kept in ``output_store`` and the result's trailing block
+carries a summary of them plus an ``output_token`` that the
+``continue_output`` tool turns into the next chunk.
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any
+
+from .config import settings
+from .pagination import Pager
+
+OUTPUT_FORMATS = ("table", "json", "pretty")
+# Rough bytes-per-token ratio used for budgets and estimates.
+BYTES_PER_TOKEN = 4
+
+_COMPACT = (",", ":")
+
+
+def _tabulate(value: Any) -> Any:
+    if isinstance(value, list):
+        if value and all(isinstance(v, dict) for v in value):
+            columns = list(dict.fromkeys(k for row in value for k in row))
+            return {
+                "columns": columns,
+                "rows": [[_tabulate(row.get(c)) for c in columns] for row in value],
+            }
+        return [_tabulate(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _tabulate(v) for k, v in value.items()}
+    return value
+
+
+def encode(payload: Any, fmt: str | None = None) -> str:
+    """Serialise *payload* in *fmt* (default ``settings.output_format``)."""
+    fmt = fmt or settings.output_format
+    if fmt == "pretty":
+        return json.dumps(payload, indent=2, default=str)
+    if fmt == "table":
+        payload = _tabulate(payload)
+    return json.dumps(payload, separators=_COMPACT, default=str)
+
+
+def decode(text: str) -> Any:
+    """Parse an encoded payload, expanding ``table`` blocks back into lists of objects."""
+
+    def expand(value: Any) -> Any:
+        if isinstance(value, dict):
+            if value.keys() == {"columns", "rows"}:
+                return [
+                    {c: expand(v) for c, v in zip(value["columns"], row)} for row in value["rows"]
+                ]
+            return {k: expand(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [expand(v) for v in value]
+        return value
+
+    return expand(json.loads(text))
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text.encode()) // BYTES_PER_TOKEN)
+
+
+class OutputStore:
+    """Bounded, TTL-limited store of rows cut from over-budget results."""
+
+    def __init__(self, max_entries: int = 64, ttl: float = 1800.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any, str | None, list]] = OrderedDict()
+
+    def put(self, payload: Any, key: str | None, rows: list) -> str:
+        """Keep *rows* (the full list found at *key* of *payload*) and return a store id."""
+        store_id = secrets.token_hex(6)
+        with self._lock:
+            self._entries[store_id] = (time.monotonic() + self.ttl, payload, key, rows)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return store_id
+
+    def get(self, store_id: str) -> tuple[Any, str | None, list] | None:
+        with self._lock:
+            entry = self._entries.get(store_id)
+            if entry is None or time.monotonic() >= entry[0]:
+                self._entries.pop(store_id, None)
+                return None
+            self._entries.move_to_end(store_id)
+            return entry[1:]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+output_store = OutputStore()
+
+
+def _row_list(payload: Any) -> tuple[str | None, list] | None:
+    """Find the list a result can be cut along: the payload itself or its longest list field."""
+    if isinstance(payload, list):
+        return None, payload
+    if isinstance(payload, dict):
+        lists = [(k, v) for k, v in payload.items() if isinstance(v, list)]
+        if lists:
+            return max(lists, key=lambda kv: len(kv[1]))
+    return None
+
+
+def _with_rows(payload: Any, key: str | None, rows: list) -> Any:
+    return rows if key is None else {**payload, key: rows}
+
+
+def _omitted_summary(rows: list) -> dict:
+    summary: dict[str, Any] = {
+        "omitted": len(rows),
+        "omitted_tokens_estimate": estimate_tokens(encode(rows)),
+    }
+    states = Counter(r.get("lifecycle_state") for r in rows if isinstance(r, dict) and "lifecycle_state" in r)
+    if states:
+        summary["omitted_by_lifecycle_state"] = dict(states)
+    return summary
+
+
+def render(
+    payload: Any,
+    *,
+    offset: int = 0,
+    max_tokens: int | None = None,
+    fmt: str | None = None,
+    store_id: str | None = None,
+) -> tuple[str, dict | None]:
+    """Encode *payload* within the token budget, starting *offset* rows into its row list.
+
+    Returns the text and, if rows had to be left out, a trailer describing
+    them with the ``output_token`` to continue from. *store_id* reuses an
+    existing ``output_store`` entry instead of storing the rows again.
+    """
+    budget = settings.output_max_tokens if max_tokens is None else max_tokens
+    found = _row_list(payload)
+    if found is None:
+        return encode(payload, fmt), None
+    key, rows = found
+    text = encode(_with_rows(payload, key, rows[offset:]), fmt)
+    if budget <= 0 or estimate_tokens(text) <= budget:
+        return text, None
+
+    # Largest n such that rows[offset:offset + n] fits; always return at least one row.
+    lo, hi = 1, len(rows) - offset - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(encode(_with_rows(payload, key, rows[offset:offset + mid]), fmt)) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    end = offset + max(lo, 1)
+    if end >= len(rows):
+        return text, None
+    text = encode(_with_rows(payload, key, rows[offset:end]), fmt)
+    if store_id is None:
+        store_id = output_store.put(payload, key, rows)
+    trailer = {
+        "output_truncated": {"returned": end - offset, **_omitted_summary(rows[end:])},
+        "output_token": f"{store_id}:{end}",
+        "output_hint": "Call continue_output with output_token for the remaining rows.",
+    }
+    return text, trailer
+
+
+def tool_result(payload: Any, pager: Pager | None = None, meta: dict | None = None) -> dict:
+    """Wrap *payload* as a tool result.
+
+    If *pager* stopped before the end of the collection, a second text block
+    carries its continuation (``next_page`` etc.) so the model can resume.
+    *meta* (e.g. fan-out errors) and any output-budget truncation are merged
+    into that same trailing block.
+    """
+    text, truncation = render(payload)
+    content = [{"type": "text", "text": text}]
+    trailer = dict(meta or {})
+    continuation = pager.continuation() if pager is not None else None
+    if continuation:
+        trailer.update(continuation)
+    if truncation:
+        trailer.update(truncation)
+    if trailer:
+        content.append({"type": "text", "text": json.dumps(trailer, separators=_COMPACT, default=str)})
+    return {"content": content}
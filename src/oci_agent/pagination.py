@@ -0,0 +1,179 @@
+"""Shared pagination engine for OCI list calls.
+
+``Pager`` wraps a paginated SDK list method and yields records as each page
+arrives, so callers can transform or aggregate them without holding every
+page in memory. It stops early on a ``max_items`` cap or a wall-clock time
+budget and exposes the token needed to resume from where it stopped.
+"""
+
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from .config import settings
+from .executor import run_blocking
+from .filters import RecordFilter
+
+PAGINATION_PROPERTIES: dict[str, dict] = {
+    "max_items": {
+        "type": "integer",
+        "description": "Stop after this many records (default 1000)",
+    },
+    "time_budget_seconds": {
+        "type": "number",
+        "description": "Stop fetching further pages after this many seconds (default 120)",
+    },
+    "page": {
+        "type": "string",
+        "description": "Resume token ('next_page') returned by a previous truncated call",
+    },
+}
+
+
+def _default_items(data: Any) -> Any:
+    return data
+
+
+def _default_next_token(response: Any) -> str | None:
+    return response.next_page if response.has_next_page else None
+
+
+class Pager:
+    """Async iterator over every record of a paginated OCI list call.
+
+    Args:
+        call: SDK list method, e.g. ``client.list_users``.
+        max_items: Stop after yielding this many records (None: no cap).
+        page_size: Largest ``limit`` sent per request (OCI caps most list pages at 1000).
+        time_budget: Don't request another page once this many seconds have passed.
+        page: Token to resume from.
+        items: Extracts the records from ``response.data``.
+        next_token: Extracts the next-page token from a response (None when done).
+        token_param: Name of the request parameter that carries the token.
+        where: Client-side predicate on SDK records; records it rejects are
+            skipped and don't count towards *max_items*.
+        **kwargs: Passed through to every *call*.
+    """
+
+    def __init__(
+        self,
+        call: Callable[..., Any],
+        /,
+        *,
+        max_items: int | None = None,
+        time_budget: float | None = None,
+        page: str | None = None,
+        page_size: int | None = None,
+        items: Callable[[Any], Any] = _default_items,
+        next_token: Callable[[Any], str | None] = _default_next_token,
+        token_param: str = "page",
+        where: Callable[[Any], bool] | None = None,
+        **kwargs: Any,
+    ):
+        self._call = call
+        self._kwargs = kwargs
+        self._items = items
+        self._next_token = next_token
+        self._token_param = token_param
+        self._where = where
+        self.record_filter: RecordFilter | None = None
+        self.max_items = max_items
+        self.page_size = page_size or settings.list_page_size
+        self.time_budget = time_budget
+        self.start_page = page
+        self.next_page: str | None = None
+        self.stopped_by: str | None = None
+        self.pages = 0
+        self.count = 0
+        self.scanned = 0
+
+    @classmethod
+    def from_args(
+        cls,
+        call: Callable[..., Any],
+        args: dict,
+        /,
+        filter_params: tuple[str, ...] = (),
+        **kwargs: Any,
+    ) -> "Pager":
+        """Build a pager from the ``PAGINATION_PROPERTIES`` and ``FILTER_PROPERTIES`` in *args*.
+
+        Filters named in *filter_params* are sent to *call* as request
+        parameters; any others are applied to records as they stream in.
+        """
+        record_filter = RecordFilter.from_args(args)
+        kwargs.update(record_filter.pushdown(filter_params))
+        if record_filter.active:
+            kwargs.setdefault("where", record_filter)
+        max_items = args.get("max_items")
+        time_budget = args.get("time_budget_seconds")
+        kwargs.setdefault("max_items", int(max_items) if max_items else settings.list_max_items)
+        kwargs.setdefault(
+            "time_budget",
+            float(time_budget) if time_budget else settings.list_time_budget_seconds,
+        )
+        kwargs.setdefault("page", args.get("page") or None)
+        pager = cls(call, **kwargs)
+        pager.record_filter = record_filter
+        return pager
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        started = time.monotonic()
+        token = self.start_page
+        while True:
+            request = dict(self._kwargs)
+            if token:
+                request[self._token_param] = token
+            request["limit"] = self.page_size
+            if self.max_items is not None:
+                # Ask only for what is still needed so the cap lands on a page boundary
+                # and the resume token doesn't skip records.
+                request["limit"] = min(self.max_items - self.count, self.page_size)
+            response = await run_blocking(self._call, **request)
+            self.pages += 1
+            for record in self._items(response.data) or []:
+                self.scanned += 1
+                if self._where is not None and not self._where(record):
+                    continue
+                self.count += 1
+                yield record
+            token = self._next_token(response)
+            if not token:
+                return
+            if self.max_items is not None and self.count >= self.max_items:
+                self._stop("max_items", token)
+                return
+            if self.time_budget is not None and time.monotonic() - started >= self.time_budget:
+                self._stop("time_budget", token)
+                return
+
+    def _stop(self, reason: str, token: str) -> None:
+        self.stopped_by = reason
+        self.next_page = token
+
+    def continuation(self) -> dict | None:
+        """Describe how to resume, or None if the listing is complete."""
+        if not self.next_page:
+            return None
+        return {
+            "truncated": True,
+            "stopped_by": self.stopped_by,
+            "returned": self.count,
+            "next_page": self.next_page,
+            "page_hint": "Call the tool again with the same arguments and page=<next_page> to continue.",
+        }
+
+    async def collect(self, transform: Callable[[Any], Any]) -> list:
+        """Apply *transform* to each record as it arrives and return the results.
+
+        Only the transformed rows are kept (SDK pages are dropped as they are
+        consumed), so memory is bounded by ``max_items`` rather than by the size
+        of the collection. Use ``async for`` directly to aggregate without
+        keeping rows at all.
+        """
+        transform = self.project(transform)
+        return [transform(record) async for record in self]
+
+    def project(self, transform: Callable[[Any], dict]) -> Callable[[Any], dict]:
+        """Apply the ``fields`` projection from ``from_args`` (if any) to *transform*."""
+        return self.record_filter.project(transform) if self.record_filter else transform
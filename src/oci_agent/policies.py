@@ -0,0 +1,373 @@
+"""Parsed IAM policy statements and an inverted index over them.
+
+``parse_statement`` turns a policy statement such as::
+
+    Allow group 'Default'/'NetAdmins', group Ops to manage virtual-network-family
+        in compartment Prod:Network where request.user.mfaTotpVerified = 'true'
+
+into a ``PolicyStatement`` (action, subjects, verb or permissions, resource
+type, location, conditions). ``PolicyIndex`` indexes a tenancy's statements
+by subject, verb and resource type, so questions like "which groups can
+manage instance-family anywhere?" are set intersections rather than a
+re-read of every policy. Verbs are cumulative (manage implies use, read and
+inspect) and aggregate resource types (``instance-family``,
+``all-resources``...) cover their members.
+
+``policy_index`` fetches every policy in the compartment tree concurrently
+and caches the index per profile for ``settings.policy_index_ttl_seconds``.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from .auth import OCIAuth
+from .compartments import CompartmentTree, compartment_index
+from .config import settings
+from .executor import run_blocking
+from .fanout import fan_out
+from .pagination import Pager
+
+VERBS = ("inspect", "read", "use", "manage")
+VERB_LEVELS = {verb: level for level, verb in enumerate(VERBS, start=1)}
+ANY_SUBJECTS = ("any-user", "any-group")
+
+# Aggregate resource types and the individual types they cover.
+RESOURCE_FAMILIES: dict[str, set[str]] = {
+    "instance-family": {
+        "instances", "instance-images", "instance-console-connection", "console-histories",
+        "app-catalog-listing", "volume-attachments", "vnic-attachments", "instance-pools",
+        "instance-configurations", "compute-capacity-reservations",
+    },
+    "volume-family": {
+        "volumes", "volume-attachments", "volume-backups", "boot-volume-backups", "backup-policies",
+        "backup-policy-assignments", "volume-groups", "volume-group-backups",
+    },
+    "object-family": {"buckets", "objects"},
+    "virtual-network-family": {
+        "vcns", "subnets", "route-tables", "network-security-groups", "security-lists", "dhcp-options",
+        "private-ips", "public-ips", "internet-gateways", "nat-gateways", "service-gateways",
+        "local-peering-gateways", "drgs", "drg-attachments", "vnics", "vnic-attachments",
+    },
+    "database-family": {"db-systems", "db-nodes", "db-homes", "databases", "backups"},
+    "autonomous-database-family": {"autonomous-databases", "autonomous-backups"},
+    "file-family": {"file-systems", "mount-targets", "export-sets"},
+    "cluster-family": {"clusters", "cluster-node-pools", "cluster-work-requests"},
+    "dns": {"dns-zones", "dns-records", "dns-steering-policies"},
+}
+ALL_RESOURCES = "all-resources"
+
+_STATEMENT = re.compile(
+    r"^\s*(?P<action>allow|deny|endorse|admit)\s+(?P<subject>.+?)\s+to\s+(?P<grant>.+?)"
+    r"(?:\s+(?:in|on)\s+(?P<location>tenancy(?:\s+\S+)?|compartment\s+id\s+\S+|compartment\s+\S+))?"
+    r"(?:\s+where\s+(?P<conditions>.+))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_SUBJECT = re.compile(
+    r"^(?P<type>group|dynamic-group|service|user|resource)\s+(?:(?P<id>id)\s+)?(?P<name>.+)$", re.IGNORECASE
+)
+
+
+def _unquote(value: str) -> str:
+    return value.strip().strip("'\"")
+
+
+def _parse_subject(text: str) -> dict:
+    text = text.strip()
+    if text.lower() in ANY_SUBJECTS:
+        return {"type": text.lower()}
+    m = _SUBJECT.match(text)
+    if not m:
+        return {"type": "unknown", "name": text}
+    subject = {"type": m["type"].lower()}
+    name = m["name"]
+    # Admit statements name subjects in another tenancy: "group X of tenancy Acme".
+    other = re.search(r"\s+of\s+tenancy\s+(\S+)$", name, re.IGNORECASE)
+    if other:
+        subject["tenancy"] = other[1]
+        name = name[: other.start()]
+    if m["id"]:
+        subject["id"] = name.strip()
+        return subject
+    # Identity-domain qualified names look like 'Domain'/'Group'.
+    parts = [_unquote(p) for p in name.split("/")]
+    subject["name"] = parts[-1]
+    if len(parts) > 1:
+        subject["domain"] = parts[0]
+    return subject
+
+
+def resource_covers(granted: str, resource: str) -> bool:
+    """True if a grant on resource type *granted* includes *resource*."""
+    granted, resource = granted.lower(), resource.lower()
+    return (
+        granted in (resource, ALL_RESOURCES)
+        or resource in RESOURCE_FAMILIES.get(granted, ())
+    )
+
+
+@dataclass
+class PolicyStatement:
+    """One parsed policy statement and the policy it came from."""
+
+    text: str
+    policy_id: str
+    policy_name: str
+    compartment_id: str
+    action: str
+    subjects: list[dict] = field(default_factory=list)
+    verb: str | None = None
+    permissions: list[str] = field(default_factory=list)
+    resource: str | None = None
+    location: str | None = None
+    # OCID the location resolves to (the tenancy for "in tenancy"), if known.
+    location_id: str | None = None
+    conditions: str | None = None
+
+    def to_dict(self, tree: CompartmentTree | None = None) -> dict:
+        row = {
+            "statement": self.text,
+            "policy_name": self.policy_name,
+            "policy_id": self.policy_id,
+            "action": self.action,
+            "subjects": self.subjects,
+            "verb": self.verb,
+            "permissions": self.permissions or None,
+            "resource": self.resource,
+            "location": self.location,
+            "location_path": (tree.path(self.location_id) or "/") if tree and self.location_id else None,
+            "conditions": self.conditions,
+        }
+        return {k: v for k, v in row.items() if v is not None}
+
+
+def _resolve_location(location: str, compartment_id: str, tree: CompartmentTree | None) -> str | None:
+    """OCID for a statement location, relative to the policy's own compartment."""
+    words = location.split()
+    kind = words[0].lower()
+    if kind == "tenancy":
+        # "in tenancy <alias>" (endorse/admit) refers to another tenancy.
+        return tree.tenancy_id if tree and len(words) == 1 else None
+    if len(words) == 3 and words[1].lower() == "id":
+        return words[2]
+    if tree is None:
+        return None
+    current: str | None = compartment_id
+    for name in _unquote(" ".join(words[1:])).split(":"):
+        current = next(
+            (c for c in tree.children(current) if tree.nodes[c]["name"].lower() == name.lower()), None
+        )
+        if current is None:
+            return None
+    return current
+
+
+def parse_statement(
+    text: str,
+    *,
+    policy_id: str = "",
+    policy_name: str = "",
+    compartment_id: str = "",
+    tree: CompartmentTree | None = None,
+) -> PolicyStatement | None:
+    """Parse one statement; returns None for text that isn't an allow/deny/endorse/admit statement."""
+    m = _STATEMENT.match(text)
+    if not m:
+        return None
+    statement = PolicyStatement(
+        text=text.strip(),
+        policy_id=policy_id,
+        policy_name=policy_name,
+        compartment_id=compartment_id,
+        action=m["action"].lower(),
+        conditions=m["conditions"].strip() if m["conditions"] else None,
+    )
+    # Subjects are comma-separated, except inside a single quoted domain/name.
+    statement.subjects = [_parse_subject(s) for s in re.split(r",(?=(?:[^']*'[^']*')*[^']*$)", m["subject"])]
+    grant = m["grant"].strip()
+    if grant.startswith("{"):
+        statement.permissions = [p.strip().upper() for p in grant.strip("{} ").split(",") if p.strip()]
+    else:
+        words = grant.split()
+        if len(words) < 2 or words[0].lower() not in VERB_LEVELS:
+            return None
+        statement.verb = words[0].lower()
+        statement.resource = words[1].lower()
+    if m["location"]:
+        statement.location = " ".join(m["location"].split())
+        statement.location_id = _resolve_location(statement.location, compartment_id, tree)
+    return statement
+
+
+def _subject_keys(subject: dict) -> list[str]:
+    """Index keys for a subject: ``type:name`` (lower-cased) and/or ``type:id``."""
+    keys = []
+    if "name" in subject:
+        keys.append(f"{subject['type']}:{subject['name'].lower()}")
+    if "id" in subject:
+        keys.append(f"{subject['type']}:{subject['id']}")
+    if subject["type"] in ANY_SUBJECTS:
+        keys.append(subject["type"])
+    return keys
+
+
+class PolicyIndex:
+    """Inverted index of parsed statements by subject, verb and resource type."""
+
+    def __init__(self, statements: list[PolicyStatement], tree: CompartmentTree | None = None, unparsed=()):
+        self.statements = statements
+        self.tree = tree
+        self.unparsed: list[dict] = list(unparsed)
+        self.policies = len({s.policy_id for s in statements} | {u["policy_id"] for u in self.unparsed})
+        self._by_subject: dict[str, set[int]] = {}
+        self._by_verb: dict[str, set[int]] = {}
+        self._by_resource: dict[str, set[int]] = {}
+        for i, s in enumerate(statements):
+            for subject in s.subjects:
+                for key in _subject_keys(subject):
+                    self._by_subject.setdefault(key, set()).add(i)
+            if s.verb:
+                self._by_verb.setdefault(s.verb, set()).add(i)
+            if s.resource:
+                self._by_resource.setdefault(s.resource, set()).add(i)
+
+    def _for_subject(self, subject_type: str, names_or_ids: str | list[str]) -> set[int]:
+        """Statements naming the subject (by any of *names_or_ids*) or granting to any-user/any-group."""
+        matches: set[int] = set()
+        for value in [names_or_ids] if isinstance(names_or_ids, str) else names_or_ids:
+            key = value if value.startswith("ocid1.") else _unquote(value.lower().rsplit("/", 1)[-1])
+            matches |= self._by_subject.get(f"{subject_type}:{key}", set())
+        matches |= self._by_subject.get("any-user", set())
+        if subject_type == "group":
+            matches |= self._by_subject.get("any-group", set())
+        return matches
+
+    def _for_verb(self, verb: str) -> set[int]:
+        """Statements granting *verb* or a stronger one."""
+        level = VERB_LEVELS[verb]
+        return set().union(*(self._by_verb.get(v, set()) for v in VERBS[level - 1:]))
+
+    def _for_resource(self, resource: str) -> set[int]:
+        granted = [r for r in self._by_resource if resource_covers(r, resource)]
+        return set().union(*(self._by_resource[r] for r in granted)) if granted else set()
+
+    def applies_to(self, statement: PolicyStatement, compartment_id: str) -> bool:
+        """True if *statement*'s location is *compartment_id* or one of its ancestors."""
+        if statement.location_id is None:
+            return False
+        current: str | None = compartment_id
+        while current:
+            if current == statement.location_id:
+                return True
+            current = self.tree.parent(current) if self.tree else None
+        return False
+
+    def query(
+        self,
+        *,
+        group: str | list[str] | None = None,
+        dynamic_group: str | list[str] | None = None,
+        verb: str | None = None,
+        resource: str | None = None,
+        compartment_id: str | None = None,
+        action: str | None = "allow",
+        include_conditional: bool = True,
+    ) -> list[PolicyStatement]:
+        """Statements matching every given criterion.
+
+        *group* / *dynamic_group* may list several names or OCIDs of the same
+        subject. *verb* matches grants of that verb or a stronger one; *resource*
+        matches grants on it or an aggregate type covering it; *compartment_id*
+        keeps statements whose location is it or an ancestor.
+
+        Raises:
+            ValueError: for an unknown verb.
+        """
+        if verb is not None and verb.lower() not in VERB_LEVELS:
+            raise ValueError(f"verb must be one of {', '.join(VERBS)}")
+        candidates: set[int] | None = None
+        for selected in (
+            self._for_subject("group", group) if group else None,
+            self._for_subject("dynamic-group", dynamic_group) if dynamic_group else None,
+            self._for_verb(verb.lower()) if verb else None,
+            self._for_resource(resource) if resource else None,
+        ):
+            if selected is not None:
+                candidates = selected if candidates is None else candidates & selected
+        indices = sorted(candidates) if candidates is not None else range(len(self.statements))
+        found = []
+        for i in indices:
+            s = self.statements[i]
+            if action and s.action != action:
+                continue
+            if not include_conditional and s.conditions:
+                continue
+            if compartment_id and not self.applies_to(s, compartment_id):
+                continue
+            found.append(s)
+        return found
+
+
+def build_policy_index(policies: list[dict], tree: CompartmentTree | None = None) -> PolicyIndex:
+    """Parse every statement of *policies* (``_make_policy_dict`` rows) into a ``PolicyIndex``."""
+    statements, unparsed = [], []
+    for p in policies:
+        compartment_id = p.get("compartment_id") or ""
+        for text in p.get("statements") or []:
+            parsed = parse_statement(
+                text, policy_id=p["id"], policy_name=p["name"], compartment_id=compartment_id, tree=tree
+            )
+            if parsed is None:
+                if not text.strip().lower().startswith("define"):
+                    unparsed.append({"policy_id": p["id"], "policy_name": p["name"], "statement": text})
+            else:
+                statements.append(parsed)
+    return PolicyIndex(statements, tree, unparsed)
+
+
+class PolicyIndexCache:
+    """Per-profile TTL cache of the tenancy-wide ``PolicyIndex``."""
+
+    def __init__(self, ttl: float | None = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._indexes: dict[str, tuple[float, PolicyIndex, dict]] = {}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.policy_index_ttl_seconds
+
+    async def get(self, auth: OCIAuth, refresh: bool = False) -> tuple[PolicyIndex, dict]:
+        """Return the index and the fan-out meta (compartments queried, errors) it was built from."""
+        with self._lock:
+            entry = self._indexes.get(auth.profile)
+        if entry is not None and not refresh and time.monotonic() - entry[0] < self.ttl:
+            return entry[1], entry[2]
+
+        from .tools.identity import _make_policy_dict
+
+        tree = await compartment_index.get(auth, refresh=refresh)
+        client = await run_blocking(auth.identity_client)
+        result = await fan_out(
+            [(None, cid) for cid in tree.subtree(tree.tenancy_id)],
+            lambda region, cid: Pager(client.list_policies, compartment_id=cid),
+            _make_policy_dict,
+            max_items=settings.policy_index_max_policies,
+            timeout=settings.list_time_budget_seconds,
+        )
+        index = build_policy_index(result.rows, tree)
+        meta = result.meta()
+        with self._lock:
+            self._indexes[auth.profile] = (time.monotonic(), index, meta)
+        return index, meta
+
+    def invalidate(self, profile: str | None = None) -> None:
+        with self._lock:
+            if profile is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(profile, None)
+
+
+policy_index = PolicyIndexCache()
@@ -0,0 +1,250 @@
+"""Shared client-side rate limiting and retry for OCI service calls.
+
+Every client built by ``OCIAuth`` is wrapped in a ``RateLimitedClient``, so
+each SDK operation first takes a token from the ``(service, region)`` bucket
+in ``rate_limiter`` and is retried on throttling and transient failures:
+
+* the bucket starts at ``settings.rate_limit_per_second`` and adapts AIMD-style —
+  halved on every 429, crept back up on every success — so a throttled
+  service/region slows down for every caller at once;
+* a ``Retry-After`` header (delta-seconds or HTTP-date) pauses the whole bucket
+  for that long; without one, retries back off exponentially with full jitter;
+* 429s are retried for every operation (the request was rejected, not run);
+  5xx responses and transport errors only for read operations (``get_``,
+  ``list_``, ``head_``), since replaying a write that may have run isn't safe.
+
+The SDK's own retry strategy is disabled on these clients so the two don't stack.
+Every attempt and retry is also reported to ``metrics`` for per-tool accounting.
+"""
+
+import functools
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from .config import settings
+from .metrics import record_oci_request, record_oci_retry
+
+THROTTLE_STATUS = 429
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+READ_OPERATION_PREFIXES = ("get_", "list_", "head_")
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+# The adaptive rate never drops below this fraction of the configured rate.
+MIN_RATE_FRACTION = 0.05
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either as delta-seconds or an HTTP-date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error: Exception) -> float | None:
+    headers = getattr(error, "headers", None) or {}
+    return _parse_retry_after(headers.get("retry-after") or headers.get("Retry-After"))
+
+
+def _backoff_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else jittered exponential."""
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_BASE_SECONDS * 2 ** attempt, BACKOFF_MAX_SECONDS))
+
+
+def _is_throttle(error: Exception) -> bool:
+    import oci
+
+    return isinstance(error, oci.exceptions.ServiceError) and error.status == THROTTLE_STATUS
+
+
+def _is_retryable(error: Exception, operation: str) -> bool:
+    import oci
+
+    if isinstance(error, oci.exceptions.ServiceError):
+        if error.status == THROTTLE_STATUS:
+            return True
+        return error.status in RETRYABLE_STATUSES and operation.startswith(READ_OPERATION_PREFIXES)
+    return isinstance(error, oci.exceptions.RequestException) and operation.startswith(READ_OPERATION_PREFIXES)
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to throttling (AIMD)."""
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def throttled(self, retry_after: float | None) -> None:
+        with self._lock:
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * MIN_RATE_FRACTION)
+
+
+class RateLimiter:
+    """Per-``(service, region)`` token buckets plus the retry loop and its metrics."""
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int | None = None,
+        max_attempts: int | None = None,
+        sleep=time.sleep,
+    ):
+        self._rate = rate
+        self._burst = burst
+        self._max_attempts = max_attempts
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._stats: dict[tuple[str, str], dict[str, float]] = {}
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts if self._max_attempts is not None else settings.retry_max_attempts
+
+    def _bucket(self, key: tuple[str, str]) -> TokenBucket | None:
+        rate = self._rate if self._rate is not None else settings.rate_limit_per_second
+        if rate <= 0:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                burst = self._burst if self._burst is not None else settings.rate_limit_burst
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            return bucket
+
+    def _count(self, key: tuple[str, str], name: str, amount: float = 1) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                key,
+                {"requests": 0, "throttled": 0, "retries": 0, "failed": 0, "backoff_seconds": 0.0, "queued_seconds": 0.0},
+            )
+            stats[name] += amount
+
+    def call(self, service: str, region: str, operation: str, fn, *args: Any, **kwargs: Any) -> Any:
+        """Call *fn* under the ``(service, region)`` bucket, retrying retryable failures."""
+        key = (service, region)
+        bucket = self._bucket(key)
+        for attempt in range(self.max_attempts):
+            if bucket is not None:
+                wait = bucket.reserve()
+                if wait > 0:
+                    self._count(key, "queued_seconds", wait)
+                    self._sleep(wait)
+            self._count(key, "requests")
+            started = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                record_oci_request(time.monotonic() - started, failed=True)
+                throttled = _is_throttle(e)
+                if throttled:
+                    self._count(key, "throttled")
+                    if bucket is not None:
+                        bucket.throttled(_retry_after(e))
+                if not _is_retryable(e, operation) or attempt == self.max_attempts - 1:
+                    self._count(key, "failed")
+                    raise
+                self._count(key, "retries")
+                record_oci_retry()
+                if throttled and bucket is not None and _retry_after(e) is not None:
+                    # The bucket is paused until Retry-After elapses; reserve() waits for it.
+                    continue
+                delay = _backoff_delay(e, attempt)
+                self._count(key, "backoff_seconds", delay)
+                self._sleep(delay)
+                continue
+            record_oci_request(time.monotonic() - started)
+            if bucket is not None:
+                bucket.succeeded()
+            return result
+
+    def stats(self) -> dict:
+        """Return totals plus per ``service/region`` counters and current adaptive rates."""
+        with self._lock:
+            per_key = {
+                f"{service}/{region}": {
+                    **{k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()},
+                    **({"rate": round(self._buckets[(service, region)].rate, 3)}
+                       if (service, region) in self._buckets else {}),
+                }
+                for (service, region), stats in self._stats.items()
+            }
+        totals = {
+            name: round(sum(s[name] for s in per_key.values()), 3)
+            for name in ("requests", "throttled", "retries", "failed", "backoff_seconds", "queued_seconds")
+        }
+        return {**totals, "clients": per_key}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._stats.clear()
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (
+            f"[ratelimit] requests={s['requests']} throttled={s['throttled']} retries={s['retries']} "
+            f"backoff={s['backoff_seconds']:.1f}s queued={s['queued_seconds']:.1f}s"
+        )
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitedClient:
+    """Proxy for an OCI service client that routes every operation through a ``RateLimiter``."""
+
+    def __init__(self, client: Any, service: str, region: str, limiter: RateLimiter | None = None):
+        self._client = client
+        self._service = service
+        self._region = region
+        self._limiter = limiter or rate_limiter
+
+    @property
+    def wrapped(self) -> Any:
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self._limiter.call(self._service, self._region, name, attr, *args, **kwargs)
+
+        return call
@@ -0,0 +1,155 @@
+"""Interactive multi-turn session on one ``ClaudeSDKClient``.
+
+``InteractiveSession`` connects a single client and keeps it for every turn,
+so follow-up questions share the conversation and the process-wide response
+cache, OCI client registry, rate limiter and metadata/index caches stay warm.
+Replies stream as they arrive. Ctrl-C during a turn asks the model to stop
+(``client.interrupt``); a second Ctrl-C abandons the turn and starts a new
+conversation. At the prompt, Ctrl-D or ``/exit`` ends the session.
+"""
+
+import asyncio
+import contextlib
+import signal
+import sys
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, TextIO
+
+from .cache import response_cache
+from .metrics import tool_metrics
+
+if TYPE_CHECKING:
+    from .agent import OCIAgent
+
+PROMPT = "oci> "
+
+HELP = """\
+Commands:
+  /new     start a new conversation (caches stay warm)
+  /stats   print per-tool metrics and cache hit ratio so far
+  /exit    end the session (also /quit or Ctrl-D)
+Ctrl-C stops the current reply; press it again to abandon the turn."""
+
+
+class InteractiveSession:
+    """Read queries from *read_line* and answer them on one long-lived client."""
+
+    def __init__(
+        self,
+        agent: "OCIAgent",
+        first_query: str | None = None,
+        read_line: Callable[[str], str] = input,
+        out: TextIO = sys.stdout,
+        err: TextIO = sys.stderr,
+    ):
+        self.agent = agent
+        self.first_query = first_query
+        self.read_line = read_line
+        self.out = out
+        self.err = err
+        self.turns = 0
+        self._client: Any = None
+        self._turn: asyncio.Task | None = None
+        self._interrupting = False
+
+    def _emit(self, text: str) -> None:
+        print(text, end="", file=self.out, flush=True)
+
+    def cancel(self) -> None:
+        """Stop the current turn: interrupt the model first, abandon the turn if asked again."""
+        if self._turn is None or self._turn.done():
+            print(f"\n(type /exit or press Ctrl-D to quit)\n{PROMPT}", end="", file=self.err, flush=True)
+        elif not self._interrupting:
+            self._interrupting = True
+            print("\n[interrupting; press Ctrl-C again to abandon the turn]", file=self.err, flush=True)
+            asyncio.ensure_future(self._client.interrupt())
+        else:
+            self._turn.cancel()
+
+    async def _restart(self) -> None:
+        with contextlib.suppress(Exception):
+            await self._client.disconnect()
+        self._client = await self.agent.connect()
+
+    async def ask(self, query: str) -> None:
+        """Answer one query, streaming the reply; Ctrl-C (``cancel``) stops it."""
+        self.turns += 1
+        self._interrupting = False
+        started = time.monotonic()
+        self._turn = asyncio.ensure_future(self.agent.ask(self._client, query, self._emit))
+        try:
+            await asyncio.wait({self._turn})
+        finally:
+            turn, self._turn = self._turn, None
+        print(file=self.out)
+        if turn.cancelled():
+            # The client may still be mid-reply; a fresh one keeps the next turn clean.
+            print("[turn abandoned; starting a new conversation]", file=self.err)
+            await self._restart()
+            return
+        if turn.exception() is not None:
+            print(f"[Error] {turn.exception()}", file=self.out)
+            return
+        result = turn.result()
+        if result is not None and result.is_error and not self._interrupting:
+            print(f"[Error] Session ended with error: {result.result}", file=self.out)
+        if self.agent.stats and result is not None:
+            cost = f", ${result.total_cost_usd:.4f}" if result.total_cost_usd is not None else ""
+            print(
+                f"[turn {self.turns}: {time.monotonic() - started:.1f}s, {result.num_turns} model turns{cost}]",
+                file=self.err,
+            )
+
+    async def _command(self, line: str) -> bool:
+        """Run a ``/`` command; return False to end the session."""
+        command = line.split()[0].lower()
+        if command in ("/exit", "/quit"):
+            return False
+        if command == "/new":
+            await self._restart()
+            print("[new conversation]", file=self.err)
+        elif command == "/stats":
+            print(tool_metrics.summary(), file=self.err)
+            cache_stats = response_cache.stats()
+            if cache_stats["hits"] or cache_stats["misses"]:
+                print(response_cache.summary(), file=self.err)
+        else:
+            print(HELP, file=self.err)
+        return True
+
+    async def run(self) -> None:
+        """Run the session until ``/exit`` or end of input, then print the run summaries."""
+        with contextlib.suppress(ImportError):
+            import readline  # noqa: F401  (line editing and history for input())
+
+        loop = asyncio.get_running_loop()
+        handled = False
+        with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+            loop.add_signal_handler(signal.SIGINT, self.cancel)
+            handled = True
+        self._client = await self.agent.connect()
+        print(f"Connected (profile {self.agent.profile}, model {self.agent.model}). /help for commands.", file=self.err)
+        try:
+            if self.first_query:
+                print(f"{PROMPT}{self.first_query}", file=self.out)
+                await self.ask(self.first_query)
+            while True:
+                try:
+                    line = (await asyncio.to_thread(self.read_line, PROMPT)).strip()
+                except EOFError:
+                    print(file=self.out)
+                    break
+                if not line:
+                    continue
+                if line.startswith("/"):
+                    if not await self._command(line):
+                        break
+                    continue
+                await self.ask(line)
+        finally:
+            if handled:
+                loop.remove_signal_handler(signal.SIGINT)
+            with contextlib.suppress(Exception):
+                await self._client.disconnect()
+            self.agent.report()
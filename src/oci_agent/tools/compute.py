@@ -1,10 +1,26 @@
 """Compute tools — OCI Compute instances."""
 
-import json
+import asyncio
+import random
+import time
 
 from claude_agent_sdk import SdkMcpTool, tool
 
 from ..auth import OCIAuth
+from ..config import settings
+from ..executor import run_blocking
+from ..fanout import COMPARTMENT_ID_DESCRIPTION, SCOPE_PROPERTIES, collect_in_scope, list_in_scope
+from ..filters import FILTER_PROPERTIES
+from ..output import tool_result
+from ..pagination import PAGINATION_PROPERTIES, Pager
+
+POLL_BASE_SECONDS = 2.0
+POLL_MAX_SECONDS = 30.0
+# Instance action, the state it is allowed from when selecting by filter, and the state to wait for.
+BATCH_ACTIONS = {
+    "start": ("START", "STOPPED", "RUNNING"),
+    "stop": ("SOFTSTOP", "RUNNING", "STOPPED"),
+}
 
 
 def _make_instance_dict(inst) -> dict:
@@ -20,28 +36,38 @@ def _make_instance_dict(inst) -> dict:
     }
 
 
+def _instance_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+    return Pager.from_args(
+        client.list_instances,
+        scoped_args,
+        filter_params=("lifecycle_state",),
+        compartment_id=compartment_id,
+    )
+
+
+def _make_batch_target_dict(inst) -> dict:
+    return {"id": inst.id, "display_name": inst.display_name, "lifecycle_state": inst.lifecycle_state}
+
+
 @tool(
     name="list_instances",
     description="List compute instances in a compartment with their state and shape.",
     input_schema={
         "type": "object",
         "properties": {
-            "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            "compartment_id": {"type": "string", "description": COMPARTMENT_ID_DESCRIPTION},
             "limit": {"type": "integer", "description": "Max instances to return (default 20)"},
+            **SCOPE_PROPERTIES,
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
         "required": ["compartment_id"],
     },
 )
 async def list_instances(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.compute_client()
-    limit = int(args.get("limit", 20))
-    response = client.list_instances(
-        compartment_id=args["compartment_id"],
-        limit=limit,
-    )
-    instances = [_make_instance_dict(i) for i in response.data]
-    return {"content": [{"type": "text", "text": json.dumps(instances, indent=2)}]}
+    args = {**args, "max_items": int(args.get("max_items") or args.get("limit", 20))}
+    return await list_in_scope(args, auth, "compute_client", _instance_pager, _make_instance_dict)
 
 
 @tool(
@@ -57,9 +83,9 @@ async def list_instances(args: dict) -> dict:
 )
 async def get_instance(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.compute_client()
-    response = client.get_instance(instance_id=args["instance_id"])
-    return {"content": [{"type": "text", "text": json.dumps(_make_instance_dict(response.data), indent=2)}]}
+    client = await run_blocking(auth.compute_client)
+    response = await run_blocking(client.get_instance, instance_id=args["instance_id"])
+    return tool_result(_make_instance_dict(response.data))
 
 
 @tool(
@@ -75,8 +101,8 @@ async def get_instance(args: dict) -> dict:
 )
 async def start_instance(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.compute_client()
-    response = client.instance_action(instance_id=args["instance_id"], action="START")
+    client = await run_blocking(auth.compute_client)
+    response = await run_blocking(client.instance_action, instance_id=args["instance_id"], action="START")
     inst = response.data
     return {
         "content": [
@@ -101,8 +127,8 @@ async def start_instance(args: dict) -> dict:
 )
 async def stop_instance(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.compute_client()
-    response = client.instance_action(instance_id=args["instance_id"], action="SOFTSTOP")
+    client = await run_blocking(auth.compute_client)
+    response = await run_blocking(client.instance_action, instance_id=args["instance_id"], action="SOFTSTOP")
     inst = response.data
     return {
         "content": [
@@ -114,4 +140,159 @@ async def stop_instance(args: dict) -> dict:
     }
 
 
-ALL_TOOLS: list[SdkMcpTool] = [list_instances, get_instance, start_instance, stop_instance]
+BATCH_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "instance_ids": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "OCIDs of the instances to act on (alternative to compartment_id + filters)",
+        },
+        "region": {"type": "string", "description": "Region of instance_ids (default: the profile's region)"},
+        "compartment_id": {
+            "type": "string",
+            "description": COMPARTMENT_ID_DESCRIPTION + " whose matching instances to act on",
+        },
+        **SCOPE_PROPERTIES,
+        **FILTER_PROPERTIES,
+        "max_items": {"type": "integer", "description": "Act on at most this many instances (default 1000)"},
+        "dry_run": {
+            "type": "boolean",
+            "description": "Only resolve and return the instances that would be acted on (default false)",
+        },
+        "wait_for_state": {
+            "type": "boolean",
+            "description": "Poll until every instance reaches the target state (default false)",
+        },
+        "wait_timeout_seconds": {
+            "type": "number",
+            "description": "Give up waiting after this many seconds (default 600)",
+        },
+        "max_concurrency": {
+            "type": "integer",
+            "description": "Maximum concurrent OCI calls (default 10)",
+        },
+    },
+    "required": [],
+}
+
+
+async def _batch_targets(args: dict, auth: OCIAuth, from_state: str) -> tuple[list[dict], dict | None]:
+    """Resolve the instances a batch action applies to, from OCIDs or a compartment filter."""
+    if args.get("instance_ids"):
+        region = args.get("region")
+        ids = list(dict.fromkeys(args["instance_ids"]))
+        return [{"id": i, "region": region} if region else {"id": i} for i in ids], None
+    if not args.get("compartment_id"):
+        raise ValueError("Pass instance_ids or compartment_id (with optional filters)")
+    # Selecting by filter only picks instances the action applies to, unless told otherwise.
+    scoped = {"lifecycle_state": from_state, **args, "page": None}
+    rows, pager, meta = await collect_in_scope(
+        scoped, auth, "compute_client", _instance_pager, _make_batch_target_dict
+    )
+    if pager is not None and pager.next_page:
+        meta = {"selection_truncated": True, "hint": "Raise max_items to act on every matching instance."}
+    return rows, meta
+
+
+async def _run_batch_action(args: dict, kind: str) -> dict:
+    action, from_state, target_state = BATCH_ACTIONS[kind]
+    auth = OCIAuth()
+    try:
+        targets, selection_meta = await _batch_targets(args, auth, from_state)
+    except ValueError as e:
+        return {"content": [{"type": "text", "text": str(e)}], "is_error": True}
+    if args.get("dry_run"):
+        return tool_result(
+            {"action": action, "target_state": target_state, "count": len(targets), "instances": targets},
+            meta=selection_meta,
+        )
+
+    wait = bool(args.get("wait_for_state"))
+    deadline = time.monotonic() + float(args.get("wait_timeout_seconds") or 600)
+    semaphore = asyncio.Semaphore(int(args.get("max_concurrency") or settings.batch_action_concurrency))
+    clients: dict[str | None, object] = {}
+    started = time.monotonic()
+
+    async def client_for(region: str | None):
+        if region not in clients:
+            regional = auth.for_region(region) if region else auth
+            clients[region] = await run_blocking(regional.compute_client)
+        return clients[region]
+
+    async def act(target: dict) -> dict:
+        report = {k: v for k, v in target.items() if k in ("id", "display_name", "region")}
+        t0 = time.monotonic()
+        try:
+            client = await client_for(target.get("region"))
+            async with semaphore:
+                response = await run_blocking(client.instance_action, instance_id=target["id"], action=action)
+            state = response.data.lifecycle_state
+            report["action_seconds"] = round(time.monotonic() - t0, 2)
+            if wait:
+                delay = POLL_BASE_SECONDS
+                while state != target_state and time.monotonic() < deadline:
+                    await asyncio.sleep(min(delay * random.uniform(0.8, 1.2), max(0.0, deadline - time.monotonic())))
+                    delay = min(delay * 2, POLL_MAX_SECONDS)
+                    async with semaphore:
+                        response = await run_blocking(client.get_instance, instance_id=target["id"])
+                    state = response.data.lifecycle_state
+                report["reached_target_state"] = state == target_state
+                report["wait_seconds"] = round(time.monotonic() - t0 - report["action_seconds"], 2)
+            report["lifecycle_state"] = state
+        except Exception as e:
+            report["error"] = str(e)
+        report["total_seconds"] = round(time.monotonic() - t0, 2)
+        return report
+
+    reports = await asyncio.gather(*(act(t) for t in targets))
+    failed = [r for r in reports if "error" in r]
+    result = {
+        "action": action,
+        "target_state": target_state,
+        "requested": len(targets),
+        "accepted": len(targets) - len(failed),
+        "failed": len(failed),
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+        "instances": reports,
+    }
+    if wait:
+        result["reached_target_state"] = sum(1 for r in reports if r.get("reached_target_state"))
+        result["timed_out"] = sum(1 for r in reports if r.get("reached_target_state") is False)
+    return tool_result(result, meta=selection_meta)
+
+
+@tool(
+    name="batch_start_instances",
+    description=(
+        "Start many compute instances concurrently, given OCIDs or a compartment plus filters "
+        "(by default only STOPPED instances are selected), optionally waiting until each is RUNNING. "
+        "Returns a per-instance report with timings. Use dry_run first to show what will be started."
+    ),
+    input_schema=BATCH_INPUT_SCHEMA,
+)
+async def batch_start_instances(args: dict) -> dict:
+    return await _run_batch_action(args, "start")
+
+
+@tool(
+    name="batch_stop_instances",
+    description=(
+        "Gracefully stop (SOFTSTOP) many compute instances concurrently, given OCIDs or a compartment "
+        "plus filters (by default only RUNNING instances are selected), optionally waiting until each is "
+        "STOPPED. Returns a per-instance report with timings. Use dry_run first to show what will be stopped."
+    ),
+    input_schema=BATCH_INPUT_SCHEMA,
+)
+async def batch_stop_instances(args: dict) -> dict:
+    return await _run_batch_action(args, "stop")
+
+
+ALL_TOOLS: list[SdkMcpTool] = [
+    list_instances,
+    get_instance,
+    start_instance,
+    stop_instance,
+    batch_start_instances,
+    batch_stop_instances,
+]
@@ -1,10 +1,60 @@
 """IAM / Identity tools — compartments, users, groups, policies."""
 
-import json
-
 from claude_agent_sdk import SdkMcpTool, tool
 
 from ..auth import OCIAuth
+from ..compartments import compartment_index
+from ..executor import run_blocking
+from ..filters import FILTER_PROPERTIES
+from ..membership import membership_graph
+from ..metadata import metadata
+from ..output import tool_result
+from ..pagination import PAGINATION_PROPERTIES, Pager
+from ..policies import VERBS, policy_index
+
+
+def _make_compartment_dict(c) -> dict:
+    return {
+        "id": c.id,
+        "name": c.name,
+        "description": c.description,
+        "lifecycle_state": c.lifecycle_state,
+        "compartment_id": c.compartment_id,
+        "time_created": str(c.time_created),
+    }
+
+
+def _make_user_dict(u) -> dict:
+    return {
+        "id": u.id,
+        "name": u.name,
+        "description": u.description,
+        "lifecycle_state": u.lifecycle_state,
+        "email": u.email,
+        "is_mfa_activated": u.is_mfa_activated,
+        "time_created": str(u.time_created),
+    }
+
+
+def _make_group_dict(g) -> dict:
+    return {
+        "id": g.id,
+        "name": g.name,
+        "description": g.description,
+        "lifecycle_state": g.lifecycle_state,
+        "time_created": str(g.time_created),
+    }
+
+
+def _make_policy_dict(p) -> dict:
+    return {
+        "id": p.id,
+        "name": p.name,
+        "description": p.description,
+        "lifecycle_state": p.lifecycle_state,
+        "statements": p.statements,
+        "time_created": str(p.time_created),
+    }
 
 
 @tool(
@@ -13,31 +63,30 @@ from ..auth import OCIAuth
     input_schema={
         "type": "object",
         "properties": {
-            "tenancy_id": {"type": "string", "description": "OCID of the tenancy or parent compartment"},
+            "tenancy_id": {
+                "type": "string",
+                "description": "OCID of the tenancy or parent compartment (default: the profile's tenancy)",
+            },
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
-        "required": ["tenancy_id"],
+        "required": [],
     },
 )
 async def list_compartments(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.identity_client()
-    response = client.list_compartments(
-        compartment_id=args["tenancy_id"],
+    client = await run_blocking(auth.identity_client)
+    tenancy_id = args.get("tenancy_id") or await metadata.tenancy_id(auth)
+    pager = Pager.from_args(
+        client.list_compartments,
+        args,
+        filter_params=("lifecycle_state",),
+        compartment_id=tenancy_id,
         compartment_id_in_subtree=True,
         access_level="ACCESSIBLE",
     )
-    compartments = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "description": c.description,
-            "lifecycle_state": c.lifecycle_state,
-            "compartment_id": c.compartment_id,
-            "time_created": str(c.time_created),
-        }
-        for c in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(compartments, indent=2)}]}
+    compartments = await pager.collect(_make_compartment_dict)
+    return tool_result(compartments, pager)
 
 
 @tool(
@@ -46,28 +95,25 @@ async def list_compartments(args: dict) -> dict:
     input_schema={
         "type": "object",
         "properties": {
-            "tenancy_id": {"type": "string", "description": "OCID of the tenancy"},
+            "tenancy_id": {"type": "string", "description": "OCID of the tenancy (default: the profile's tenancy)"},
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
-        "required": ["tenancy_id"],
+        "required": [],
     },
 )
 async def list_users(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.identity_client()
-    response = client.list_users(compartment_id=args["tenancy_id"])
-    users = [
-        {
-            "id": u.id,
-            "name": u.name,
-            "description": u.description,
-            "lifecycle_state": u.lifecycle_state,
-            "email": u.email,
-            "is_mfa_activated": u.is_mfa_activated,
-            "time_created": str(u.time_created),
-        }
-        for u in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(users, indent=2)}]}
+    client = await run_blocking(auth.identity_client)
+    tenancy_id = args.get("tenancy_id") or await metadata.tenancy_id(auth)
+    pager = Pager.from_args(
+        client.list_users,
+        args,
+        filter_params=("lifecycle_state",),
+        compartment_id=tenancy_id,
+    )
+    users = await pager.collect(_make_user_dict)
+    return tool_result(users, pager)
 
 
 @tool(
@@ -76,26 +122,25 @@ async def list_users(args: dict) -> dict:
     input_schema={
         "type": "object",
         "properties": {
-            "tenancy_id": {"type": "string", "description": "OCID of the tenancy"},
+            "tenancy_id": {"type": "string", "description": "OCID of the tenancy (default: the profile's tenancy)"},
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
-        "required": ["tenancy_id"],
+        "required": [],
     },
 )
 async def list_groups(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.identity_client()
-    response = client.list_groups(compartment_id=args["tenancy_id"])
-    groups = [
-        {
-            "id": g.id,
-            "name": g.name,
-            "description": g.description,
-            "lifecycle_state": g.lifecycle_state,
-            "time_created": str(g.time_created),
-        }
-        for g in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(groups, indent=2)}]}
+    client = await run_blocking(auth.identity_client)
+    tenancy_id = args.get("tenancy_id") or await metadata.tenancy_id(auth)
+    pager = Pager.from_args(
+        client.list_groups,
+        args,
+        filter_params=("lifecycle_state",),
+        compartment_id=tenancy_id,
+    )
+    groups = await pager.collect(_make_group_dict)
+    return tool_result(groups, pager)
 
 
 @tool(
@@ -105,26 +150,183 @@ async def list_groups(args: dict) -> dict:
         "type": "object",
         "properties": {
             "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
         "required": ["compartment_id"],
     },
 )
 async def list_policies(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.identity_client()
-    response = client.list_policies(compartment_id=args["compartment_id"])
-    policies = [
-        {
-            "id": p.id,
-            "name": p.name,
-            "description": p.description,
-            "lifecycle_state": p.lifecycle_state,
-            "statements": p.statements,
-            "time_created": str(p.time_created),
-        }
-        for p in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(policies, indent=2)}]}
-
-
-ALL_TOOLS: list[SdkMcpTool] = [list_compartments, list_users, list_groups, list_policies]
+    client = await run_blocking(auth.identity_client)
+    pager = Pager.from_args(
+        client.list_policies,
+        args,
+        filter_params=("lifecycle_state",),
+        compartment_id=args["compartment_id"],
+    )
+    policies = await pager.collect(_make_policy_dict)
+    return tool_result(policies, pager)
+
+
+@tool(
+    name="resolve_compartment",
+    description=(
+        "Resolve a compartment name, name path (e.g. 'prod/app') or OCID using the cached "
+        "compartment hierarchy, returning its OCID, path, parent and direct children."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "compartment": {"type": "string", "description": "Compartment name, name path or OCID"},
+            "refresh": {"type": "boolean", "description": "Rebuild the cached hierarchy first (default false)"},
+        },
+        "required": ["compartment"],
+    },
+)
+async def resolve_compartment(args: dict) -> dict:
+    auth = OCIAuth()
+    tree = await compartment_index.get(auth, refresh=bool(args.get("refresh")))
+    try:
+        ocid = tree.resolve(args["compartment"])
+    except ValueError as e:
+        return {"content": [{"type": "text", "text": str(e)}], "is_error": True}
+    result = {
+        "id": ocid,
+        "path": tree.path(ocid),
+        "parent_id": tree.parent(ocid),
+        "children": [
+            {"id": child, "name": tree.nodes[child]["name"]} for child in tree.children(ocid)
+        ],
+        "subtree_size": len(tree.subtree(ocid)),
+    }
+    return tool_result(result)
+
+
+@tool(
+    name="query_policies",
+    description=(
+        "Answer effective-permission questions from every IAM policy in the tenancy, parsed and indexed: "
+        "e.g. which groups can manage instance-family anywhere, or what group X can do in compartment Y. "
+        "A verb matches that verb or a stronger one (inspect < read < use < manage); a resource type "
+        "matches grants on it, on an aggregate family containing it, or on all-resources."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "group": {"type": "string", "description": "Group name (optionally 'Domain/Group') or OCID"},
+            "dynamic_group": {"type": "string", "description": "Dynamic group name or OCID"},
+            "verb": {"type": "string", "enum": list(VERBS), "description": "Minimum verb granted"},
+            "resource": {
+                "type": "string",
+                "description": "Resource type, e.g. instances, instance-family, buckets, all-resources",
+            },
+            "compartment_id": {
+                "type": "string",
+                "description": (
+                    "Only statements that apply in this compartment (OCID, name or path), "
+                    "including ones granted on its ancestors or the tenancy"
+                ),
+            },
+            "action": {
+                "type": "string",
+                "enum": ["allow", "deny", "endorse", "admit", "any"],
+                "description": "Statement type (default allow)",
+            },
+            "include_conditional": {
+                "type": "boolean",
+                "description": "Include statements with a where clause (default true)",
+            },
+            "refresh": {"type": "boolean", "description": "Re-fetch every policy instead of using the cached index"},
+        },
+        "required": [],
+    },
+)
+async def query_policies(args: dict) -> dict:
+    auth = OCIAuth()
+    index, fetch_meta = await policy_index.get(auth, refresh=bool(args.get("refresh")))
+    try:
+        compartment_id = (
+            await compartment_index.resolve(auth, args["compartment_id"]) if args.get("compartment_id") else None
+        )
+        action = args.get("action") or "allow"
+        group = args.get("group")
+        if group and group.startswith("ocid1.group."):
+            # Statements usually name the group, so match its name as well as its OCID.
+            client = await run_blocking(auth.identity_client)
+            group = [group, (await run_blocking(client.get_group, group)).data.name]
+        statements = index.query(
+            group=group,
+            dynamic_group=args.get("dynamic_group"),
+            verb=args.get("verb"),
+            resource=args.get("resource"),
+            compartment_id=compartment_id,
+            action=None if action == "any" else action,
+            include_conditional=args.get("include_conditional", True) is not False,
+        )
+    except ValueError as e:
+        return {"content": [{"type": "text", "text": str(e)}], "is_error": True}
+    rows = [s.to_dict(index.tree) for s in statements]
+    meta = {
+        "policies_indexed": index.policies,
+        "statements_indexed": len(index.statements),
+        "compartments_queried": fetch_meta.get("compartments_queried"),
+    }
+    if index.unparsed:
+        meta["unparsed_statements"] = len(index.unparsed)
+    for key in ("errors", "timed_out", "truncated"):
+        if key in fetch_meta:
+            meta[key] = fetch_meta[key]
+    return tool_result(rows, meta=meta)
+
+
+@tool(
+    name="query_group_membership",
+    description=(
+        "Answer IAM group membership questions from a cached user/group membership graph: the members "
+        "of a group, the groups of a user, or (with neither) every group with its member count."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "group": {"type": "string", "description": "Group name or OCID: return its members"},
+            "user": {"type": "string", "description": "User name, email or OCID: return the user's groups"},
+            "refresh": {
+                "type": "boolean",
+                "description": "Re-list memberships now and apply the changes (default: only after the cache TTL)",
+            },
+        },
+        "required": [],
+    },
+)
+async def query_group_membership(args: dict) -> dict:
+    auth = OCIAuth()
+    graph = await membership_graph.get(auth, refresh=bool(args.get("refresh")))
+    try:
+        if args.get("group"):
+            result: dict = {"group": args["group"], "members": graph.members(args["group"])}
+        elif args.get("user"):
+            result = {"user": args["user"], "groups": graph.groups_of(args["user"])}
+        else:
+            result = {"groups": graph.group_sizes()}
+    except ValueError as e:
+        return {"content": [{"type": "text", "text": str(e)}], "is_error": True}
+    meta = {
+        "users": len(graph.users),
+        "groups": len(graph.groups),
+        "memberships": len(graph),
+        "loaded_at": graph.loaded_at,
+        "last_refresh": graph.last_delta,
+    }
+    return tool_result(result, meta=meta)
+
+
+ALL_TOOLS: list[SdkMcpTool] = [
+    list_compartments,
+    list_users,
+    list_groups,
+    list_policies,
+    resolve_compartment,
+    query_policies,
+    query_group_membership,
+]
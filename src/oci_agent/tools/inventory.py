@@ -0,0 +1,71 @@
+"""Inventory tools — answer from the local SQLite snapshot instead of live OCI calls."""
+
+import time
+
+from claude_agent_sdk import SdkMcpTool, tool
+
+from ..executor import run_blocking
+from ..inventory import INVENTORY_KINDS, get_store
+from ..output import tool_result
+
+
+@tool(
+    name="query_inventory",
+    description=(
+        "Query the local inventory snapshot (filled nightly by `main.py --refresh-inventory`) "
+        "without calling OCI. Results include a freshness stamp; use the live list_* tools "
+        "when the snapshot is too old for the question."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "kind": {"type": "string", "enum": INVENTORY_KINDS, "description": "Resource kind"},
+            "compartment_id": {"type": "string", "description": "Only resources in this compartment (optional)"},
+            "lifecycle_state": {"type": "string", "description": "Only resources in this state, e.g. RUNNING"},
+            "name_contains": {"type": "string", "description": "Substring of the display name"},
+            "include_deleted": {
+                "type": "boolean",
+                "description": "Include resources no longer returned by OCI (default false)",
+            },
+            "limit": {"type": "integer", "description": "Max rows to return (default 200)"},
+        },
+        "required": ["kind"],
+    },
+)
+async def query_inventory(args: dict) -> dict:
+    store = get_store()
+    kind = args["kind"]
+    refreshed_at = await run_blocking(store.freshness, kind)
+    if refreshed_at is None:
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"No inventory snapshot for '{kind}' yet. Run `main.py --refresh-inventory` "
+                    "or use the live list_* tools.",
+                }
+            ],
+            "is_error": True,
+        }
+    items = await run_blocking(
+        store.query,
+        kind,
+        compartment_ids=[args["compartment_id"]] if args.get("compartment_id") else None,
+        lifecycle_state=args.get("lifecycle_state"),
+        name_contains=args.get("name_contains"),
+        include_deleted=bool(args.get("include_deleted")),
+        limit=int(args.get("limit") or 200),
+    )
+    result = {
+        "snapshot": {
+            "kind": kind,
+            "refreshed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(refreshed_at)),
+            "age_seconds": int(time.time() - refreshed_at),
+        },
+        "count": len(items),
+        "items": items,
+    }
+    return tool_result(result)
+
+
+ALL_TOOLS: list[SdkMcpTool] = [query_inventory]
@@ -1,10 +1,51 @@
-"""Networking tools — VCNs, Subnets, Security Lists."""
+"""Networking tools — VCNs, Subnets, Security Lists, rule exposure and reachability."""
 
-import json
+import asyncio
 
 from claude_agent_sdk import SdkMcpTool, tool
 
+from ..addrspace import AddressSpace
 from ..auth import OCIAuth
+from ..config import settings
+from ..fanout import COMPARTMENT_ID_DESCRIPTION, SCOPE_PROPERTIES, collect_in_scope, list_in_scope
+from ..filters import FILTER_PROPERTIES
+from ..netindex import DIRECTIONS, MATCH_MODES, PROTOCOLS, VcnRuleIndex, normalize_protocol, security_rule_index
+from ..output import tool_result
+from ..pagination import PAGINATION_PROPERTIES, Pager
+
+
+def _make_vcn_dict(v) -> dict:
+    return {
+        "id": v.id,
+        "display_name": v.display_name,
+        "cidr_block": v.cidr_block,
+        "lifecycle_state": v.lifecycle_state,
+        "dns_label": v.dns_label,
+        "time_created": str(v.time_created),
+    }
+
+
+def _make_subnet_dict(s) -> dict:
+    return {
+        "id": s.id,
+        "display_name": s.display_name,
+        "cidr_block": s.cidr_block,
+        "vcn_id": s.vcn_id,
+        "availability_domain": s.availability_domain,
+        "lifecycle_state": s.lifecycle_state,
+        "dns_label": s.dns_label,
+    }
+
+
+def _make_security_list_dict(sl) -> dict:
+    return {
+        "id": sl.id,
+        "display_name": sl.display_name,
+        "lifecycle_state": sl.lifecycle_state,
+        "vcn_id": sl.vcn_id,
+        "egress_security_rules_count": len(sl.egress_security_rules),
+        "ingress_security_rules_count": len(sl.ingress_security_rules),
+    }
 
 
 @tool(
@@ -13,27 +54,26 @@ from ..auth import OCIAuth
     input_schema={
         "type": "object",
         "properties": {
-            "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            "compartment_id": {"type": "string", "description": COMPARTMENT_ID_DESCRIPTION},
+            **SCOPE_PROPERTIES,
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
         "required": ["compartment_id"],
     },
 )
 async def list_vcns(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.virtual_network_client()
-    response = client.list_vcns(compartment_id=args["compartment_id"])
-    vcns = [
-        {
-            "id": v.id,
-            "display_name": v.display_name,
-            "cidr_block": v.cidr_block,
-            "lifecycle_state": v.lifecycle_state,
-            "dns_label": v.dns_label,
-            "time_created": str(v.time_created),
-        }
-        for v in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(vcns, indent=2)}]}
+
+    def make_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+        return Pager.from_args(
+            client.list_vcns,
+            scoped_args,
+            filter_params=("lifecycle_state",),
+            compartment_id=compartment_id,
+        )
+
+    return await list_in_scope(args, auth, "virtual_network_client", make_pager, _make_vcn_dict)
 
 
 @tool(
@@ -42,32 +82,30 @@ async def list_vcns(args: dict) -> dict:
     input_schema={
         "type": "object",
         "properties": {
-            "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            "compartment_id": {"type": "string", "description": COMPARTMENT_ID_DESCRIPTION},
             "vcn_id": {"type": "string", "description": "OCID of the VCN to filter by (optional)"},
+            **SCOPE_PROPERTIES,
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
         "required": ["compartment_id"],
     },
 )
 async def list_subnets(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.virtual_network_client()
-    kwargs: dict = {"compartment_id": args["compartment_id"]}
-    if args.get("vcn_id"):
-        kwargs["vcn_id"] = args["vcn_id"]
-    response = client.list_subnets(**kwargs)
-    subnets = [
-        {
-            "id": s.id,
-            "display_name": s.display_name,
-            "cidr_block": s.cidr_block,
-            "vcn_id": s.vcn_id,
-            "availability_domain": s.availability_domain,
-            "lifecycle_state": s.lifecycle_state,
-            "dns_label": s.dns_label,
-        }
-        for s in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(subnets, indent=2)}]}
+
+    def make_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+        kwargs: dict = {"compartment_id": compartment_id}
+        if scoped_args.get("vcn_id"):
+            kwargs["vcn_id"] = scoped_args["vcn_id"]
+        return Pager.from_args(
+            client.list_subnets,
+            scoped_args,
+            filter_params=("lifecycle_state",),
+            **kwargs,
+        )
+
+    return await list_in_scope(args, auth, "virtual_network_client", make_pager, _make_subnet_dict)
 
 
 @tool(
@@ -76,31 +114,341 @@ async def list_subnets(args: dict) -> dict:
     input_schema={
         "type": "object",
         "properties": {
-            "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            "compartment_id": {"type": "string", "description": COMPARTMENT_ID_DESCRIPTION},
             "vcn_id": {"type": "string", "description": "OCID of the VCN to filter by (optional)"},
+            **SCOPE_PROPERTIES,
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
         "required": ["compartment_id"],
     },
 )
 async def list_security_lists(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.virtual_network_client()
-    kwargs: dict = {"compartment_id": args["compartment_id"]}
+
+    def make_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+        kwargs: dict = {"compartment_id": compartment_id}
+        if scoped_args.get("vcn_id"):
+            kwargs["vcn_id"] = scoped_args["vcn_id"]
+        return Pager.from_args(
+            client.list_security_lists,
+            scoped_args,
+            filter_params=("lifecycle_state",),
+            **kwargs,
+        )
+
+    return await list_in_scope(args, auth, "virtual_network_client", make_pager, _make_security_list_dict)
+
+
+def _error(message: str) -> dict:
+    return {"content": [{"type": "text", "text": message}], "is_error": True}
+
+
+def _port_range(args: dict) -> tuple[int, int] | None:
+    """The ``port`` / ``port_max`` arguments as an inclusive range, or None for any port."""
+    if args.get("port") in (None, ""):
+        return None
+    low = int(args["port"])
+    high = int(args["port_max"]) if args.get("port_max") not in (None, "") else low
+    if not 0 <= low <= high <= 65535:
+        raise ValueError("port and port_max must satisfy 0 <= port <= port_max <= 65535")
+    return low, high
+
+
+async def _load_rule_indexes(
+    auth: OCIAuth, targets: list[tuple[str | None, str]], refresh: bool
+) -> tuple[list[tuple[str | None, VcnRuleIndex]], list[dict]]:
+    """Fetch (or reuse) the rule index of every ``(region, vcn_id)`` target concurrently."""
+    semaphore = asyncio.Semaphore(settings.fanout_concurrency)
+
+    async def load(region: str | None, vcn_id: str) -> VcnRuleIndex:
+        async with semaphore:
+            return await security_rule_index.get(auth.for_region(region) if region else auth, vcn_id, refresh)
+
+    loaded = await asyncio.gather(*(load(r, v) for r, v in targets), return_exceptions=True)
+    indexes, errors = [], []
+    for (region, vcn_id), index in zip(targets, loaded):
+        if isinstance(index, BaseException):
+            errors.append({"vcn_id": vcn_id, **({"region": region} if region else {}), "error": str(index)})
+        else:
+            indexes.append((region, index))
+    return indexes, errors
+
+
+QUERY_PROPERTIES: dict[str, dict] = {
+    "port": {"type": "integer", "description": "Destination port to check, e.g. 22 (omit for any port)"},
+    "port_max": {"type": "integer", "description": "End of a destination port range starting at port"},
+    "protocol": {
+        "type": "string",
+        "description": f"Protocol: {', '.join(PROTOCOLS)} or an IP protocol number",
+    },
+    "refresh": {"type": "boolean", "description": "Re-fetch the security lists instead of using the cached index"},
+}
+
+
+@tool(
+    name="find_security_exposure",
+    description=(
+        "Find security-list rules that admit traffic from (ingress) or to (egress) a CIDR on a port, "
+        "e.g. which subnets expose port 22 to 0.0.0.0/0, across one VCN or every VCN in a compartment "
+        "scope. Returns matching rules with their security list and attached subnets."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "vcn_id": {"type": "string", "description": "OCID of a single VCN to check"},
+            "compartment_id": {
+                "type": "string",
+                "description": f"{COMPARTMENT_ID_DESCRIPTION}; checks every VCN in it (when vcn_id is not given)",
+            },
+            **SCOPE_PROPERTIES,
+            "cidr": {
+                "type": "string",
+                "description": "Source (ingress) or destination (egress) CIDR, IP or service CIDR label (default 0.0.0.0/0)",
+            },
+            "direction": {"type": "string", "enum": list(DIRECTIONS), "description": "Rule direction (default ingress)"},
+            "match": {
+                "type": "string",
+                "enum": list(MATCH_MODES),
+                "description": "contains: rule CIDR covers all of cidr (default); overlaps: any address in cidr",
+            },
+            **QUERY_PROPERTIES,
+        },
+    },
+)
+async def find_security_exposure(args: dict) -> dict:
+    auth = OCIAuth()
+    try:
+        ports = _port_range(args)
+        protocol = normalize_protocol(args.get("protocol"))
+    except ValueError as e:
+        return _error(str(e))
+
+    meta: dict = {}
     if args.get("vcn_id"):
-        kwargs["vcn_id"] = args["vcn_id"]
-    response = client.list_security_lists(**kwargs)
-    sls = [
-        {
-            "id": sl.id,
-            "display_name": sl.display_name,
-            "lifecycle_state": sl.lifecycle_state,
-            "vcn_id": sl.vcn_id,
-            "egress_security_rules_count": len(sl.egress_security_rules),
-            "ingress_security_rules_count": len(sl.ingress_security_rules),
-        }
-        for sl in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(sls, indent=2)}]}
-
-
-ALL_TOOLS: list[SdkMcpTool] = [list_vcns, list_subnets, list_security_lists]
+        targets: list[tuple[str | None, str]] = [(None, args["vcn_id"])]
+    elif args.get("compartment_id"):
+
+        def make_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+            # Terminated and terminating VCNs expose nothing, so only live ones are indexed.
+            return Pager.from_args(
+                client.list_vcns, scoped_args, compartment_id=compartment_id, lifecycle_state="AVAILABLE"
+            )
+
+        vcns, _, scope_meta = await collect_in_scope(
+            args, auth, "virtual_network_client", make_pager, _make_vcn_dict
+        )
+        targets = [(v.get("region"), v["id"]) for v in vcns]
+        meta.update(scope_meta or {})
+    else:
+        return _error("Provide vcn_id or compartment_id")
+
+    indexes, errors = await _load_rule_indexes(auth, targets, bool(args.get("refresh")))
+    rows = []
+    for region, index in indexes:
+        try:
+            matches = index.query(
+                args.get("direction") or "ingress",
+                args.get("cidr") or "0.0.0.0/0",
+                ports=ports,
+                protocol=protocol,
+                match=args.get("match") or "contains",
+            )
+        except ValueError as e:
+            return _error(str(e))
+        for rule in matches:
+            row = index.describe(rule)
+            if region:
+                row["region"] = region
+            rows.append(row)
+    meta["vcns_checked"] = len(indexes)
+    meta["rules_indexed"] = sum(index.rule_count for _, index in indexes)
+    if errors:
+        meta["errors"] = meta.get("errors", []) + errors
+    return tool_result(rows, meta=meta)
+
+
+@tool(
+    name="check_security_reachability",
+    description=(
+        "Check whether a source IP/CIDR can reach a destination IP or subnet in a VCN on a protocol/port "
+        "according to its security lists: the destination subnet's ingress rules and, when the source "
+        "is inside the VCN, the source subnet's egress rules. Returns the verdict and the rules that allow it."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "vcn_id": {"type": "string", "description": "OCID of the VCN"},
+            "source": {"type": "string", "description": "Source IP address or CIDR, e.g. 0.0.0.0/0 or 10.0.1.5"},
+            "destination": {"type": "string", "description": "Destination IP address or subnet OCID"},
+            "region": {"type": "string", "description": "Region of the VCN (default: the profile's region)"},
+            **QUERY_PROPERTIES,
+        },
+        "required": ["vcn_id", "source", "destination"],
+    },
+)
+async def check_security_reachability(args: dict) -> dict:
+    auth = OCIAuth()
+    try:
+        ports = _port_range(args)
+        protocol = normalize_protocol(args.get("protocol") or "tcp")
+    except ValueError as e:
+        return _error(str(e))
+    indexes, errors = await _load_rule_indexes(
+        auth, [(args.get("region"), args["vcn_id"])], bool(args.get("refresh"))
+    )
+    if errors:
+        return _error(f"Could not index VCN {args['vcn_id']}: {errors[0]['error']}")
+    _, index = indexes[0]
+
+    source, destination = args["source"], args["destination"]
+    if destination.startswith("ocid1.subnet"):
+        dest_subnet = destination if destination in index.subnets else None
+        dest_cidr = index.subnets[dest_subnet]["cidr_block"] if dest_subnet else None
+    else:
+        dest_subnet, dest_cidr = index.subnet_containing(destination), destination
+    if dest_subnet is None:
+        return _error(f"Destination {destination!r} is not in any subnet of VCN {args['vcn_id']}")
+
+    ingress = index.query(
+        "ingress", source, ports=ports, protocol=protocol,
+        security_list_ids=index.subnets[dest_subnet]["security_list_ids"],
+    )
+    src_subnet = index.subnet_containing(source)
+    egress = []
+    if src_subnet is not None:
+        egress = index.query(
+            "egress", dest_cidr, ports=ports, protocol=protocol,
+            security_list_ids=index.subnets[src_subnet]["security_list_ids"],
+        )
+    result = {
+        "allowed": bool(ingress) and (src_subnet is None or bool(egress)),
+        "source": source,
+        "destination": destination,
+        "protocol": args.get("protocol") or "tcp",
+        "port": args.get("port"),
+        "destination_subnet": index.subnets[dest_subnet]["display_name"],
+        "source_subnet": index.subnets[src_subnet]["display_name"] if src_subnet else None,
+        "ingress_rules": [index.describe(r) for r in ingress],
+        "egress_rules": [index.describe(r) for r in egress],
+    }
+    meta = {"note": "Only security lists are evaluated; NSGs, route tables and gateways are not."}
+    return tool_result(result, meta=meta)
+
+
+# Record cap per listing when loading the address space (list tools default to settings.list_max_items).
+ADDRESS_SPACE_MAX_ITEMS = 100_000
+INACTIVE_STATES = ("TERMINATING", "TERMINATED")
+
+
+def _make_vcn_space_dict(v) -> dict:
+    return {
+        "id": v.id,
+        "display_name": v.display_name,
+        "compartment_id": v.compartment_id,
+        "lifecycle_state": v.lifecycle_state,
+        "cidr_block": v.cidr_block,
+        "cidr_blocks": list(v.cidr_blocks or []),
+        "ipv6_cidr_blocks": list(v.ipv6_cidr_blocks or []),
+    }
+
+
+def _make_subnet_space_dict(s) -> dict:
+    return {
+        "id": s.id,
+        "display_name": s.display_name,
+        "compartment_id": s.compartment_id,
+        "lifecycle_state": s.lifecycle_state,
+        "vcn_id": s.vcn_id,
+        "cidr_block": s.cidr_block,
+        "ipv6_cidr_blocks": list(s.ipv6_cidr_blocks or []),
+    }
+
+
+@tool(
+    name="analyze_cidr_space",
+    description=(
+        "Analyse VCN and subnet CIDR blocks across a compartment scope and regions: report overlapping "
+        "VCNs/subnets, which existing blocks a candidate CIDR would clash with, free blocks of a given "
+        "prefix length inside a VCN or CIDR, and address utilization per VCN."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "compartment_id": {"type": "string", "description": COMPARTMENT_ID_DESCRIPTION},
+            **SCOPE_PROPERTIES,
+            "candidate_cidr": {
+                "type": "string",
+                "description": "A proposed CIDR, e.g. 10.20.0.0/16, to check against every loaded block",
+            },
+            "free_prefix_length": {
+                "type": "integer",
+                "description": "Report free blocks of this prefix length, e.g. 24",
+            },
+            "within": {
+                "type": "string",
+                "description": (
+                    "VCN OCID (free = not used by its subnets) or CIDR (free = not used by any VCN) to "
+                    "search for free blocks; default each VCN"
+                ),
+            },
+            "max_free_blocks": {"type": "integer", "description": "Free blocks to list per container (default 16)"},
+        },
+        "required": ["compartment_id"],
+    },
+)
+async def analyze_cidr_space(args: dict) -> dict:
+    auth = OCIAuth()
+    scoped = {**args, "max_items": args.get("max_items") or ADDRESS_SPACE_MAX_ITEMS}
+
+    def vcn_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+        return Pager.from_args(client.list_vcns, scoped_args, compartment_id=compartment_id)
+
+    def subnet_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+        return Pager.from_args(client.list_subnets, scoped_args, compartment_id=compartment_id)
+
+    try:
+        (vcns, vcn_pager_used, vcn_meta), (subnets, subnet_pager_used, subnet_meta) = await asyncio.gather(
+            collect_in_scope(scoped, auth, "virtual_network_client", vcn_pager, _make_vcn_space_dict),
+            collect_in_scope(scoped, auth, "virtual_network_client", subnet_pager, _make_subnet_space_dict),
+        )
+    except ValueError as e:
+        return _error(str(e))
+    space = AddressSpace(
+        [v for v in vcns if v["lifecycle_state"] not in INACTIVE_STATES],
+        [s for s in subnets if s["lifecycle_state"] not in INACTIVE_STATES],
+    )
+
+    result: dict = {"vcns": len(space.vcns), "subnets": len(subnets), "overlaps": space.overlaps()}
+    try:
+        if args.get("candidate_cidr"):
+            conflicts = space.conflicts(args["candidate_cidr"])
+            result["candidate"] = {"cidr": args["candidate_cidr"], "available": not conflicts, "conflicts": conflicts}
+        if args.get("free_prefix_length") is not None:
+            limit = int(args.get("max_free_blocks") or 16)
+            prefix_len = int(args["free_prefix_length"])
+            containers = [args["within"]] if args.get("within") else list(space.vcns)
+            result["free_blocks"] = [
+                {"within": c, "blocks": space.free_blocks(c, prefix_len, limit)} for c in containers
+            ]
+    except ValueError as e:
+        return _error(str(e))
+    result["utilization"] = space.utilization()
+
+    meta: dict = {}
+    for name, listing_meta, pager in (("vcns", vcn_meta, vcn_pager_used), ("subnets", subnet_meta, subnet_pager_used)):
+        if listing_meta:
+            meta[name] = listing_meta
+        elif pager is not None and pager.next_page:
+            meta[name] = {"truncated": True, "stopped_by": pager.stopped_by}
+    return tool_result(result, meta=meta or None)
+
+
+ALL_TOOLS: list[SdkMcpTool] = [
+    list_vcns,
+    list_subnets,
+    list_security_lists,
+    find_security_exposure,
+    check_security_reachability,
+    analyze_cidr_space,
+]
@@ -0,0 +1,50 @@
+"""Result tools — fetch the rest of a result that was cut to fit the output budget."""
+
+import json
+
+from claude_agent_sdk import SdkMcpTool, tool
+
+from ..output import output_store, render
+
+
+@tool(
+    name="continue_output",
+    description=(
+        "Return the next chunk of a tool result that was truncated to fit the output budget, "
+        "given the output_token from that result."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "output_token": {"type": "string", "description": "output_token from a truncated result"},
+            "max_output_tokens": {
+                "type": "integer",
+                "description": "Token budget for this chunk (default: the configured output budget)",
+            },
+        },
+        "required": ["output_token"],
+    },
+)
+async def continue_output(args: dict) -> dict:
+    store_id, _, offset = args["output_token"].partition(":")
+    entry = output_store.get(store_id) if offset.isdigit() else None
+    if entry is None:
+        return {
+            "content": [
+                {"type": "text", "text": "Unknown or expired output_token; re-run the original tool call."}
+            ],
+            "is_error": True,
+        }
+    payload, key, rows = entry
+    max_tokens = args.get("max_output_tokens")
+    text, truncation = render(
+        payload,
+        offset=int(offset),
+        max_tokens=int(max_tokens) if max_tokens else None,
+        store_id=store_id,
+    )
+    trailer = {"offset": int(offset), "total_rows": len(rows), **(truncation or {})}
+    return {"content": [{"type": "text", "text": text}, {"type": "text", "text": json.dumps(trailer)}]}
+
+
+ALL_TOOLS: list[SdkMcpTool] = [continue_output]
@@ -1,10 +1,53 @@
 """Storage tools — Object Storage buckets and Block Volumes."""
 
-import json
+import asyncio
+import logging
+from collections.abc import Callable
 
 from claude_agent_sdk import SdkMcpTool, tool
 
 from ..auth import OCIAuth
+from ..config import settings
+from ..executor import run_blocking
+from ..fanout import COMPARTMENT_ID_DESCRIPTION, SCOPE_PROPERTIES, list_in_scope
+from ..filters import FILTER_PROPERTIES
+from ..metadata import metadata
+from ..objectscan import (
+    AGGREGATE_GROUPS,
+    DEFAULT_OBJECT_FIELDS,
+    OBJECT_FIELDS,
+    PARTITION_MODES,
+    ObjectAggregate,
+    make_object_row,
+    object_pager,
+    scan_objects,
+)
+from ..output import tool_result
+from ..pagination import PAGINATION_PROPERTIES, Pager
+
+logger = logging.getLogger(__name__)
+
+
+def _make_bucket_summary_dict(b) -> dict:
+    return {
+        "name": b.name,
+        "namespace": b.namespace,
+        "compartment_id": b.compartment_id,
+        "created_by": b.created_by,
+        "time_created": str(b.time_created),
+    }
+
+
+def _make_volume_dict(v) -> dict:
+    return {
+        "id": v.id,
+        "display_name": v.display_name,
+        "lifecycle_state": v.lifecycle_state,
+        "size_in_gbs": v.size_in_gbs,
+        "availability_domain": v.availability_domain,
+        "vpus_per_gb": v.vpus_per_gb,
+        "time_created": str(v.time_created),
+    }
 
 
 @tool(
@@ -13,30 +56,27 @@ from ..auth import OCIAuth
     input_schema={
         "type": "object",
         "properties": {
-            "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            "compartment_id": {"type": "string", "description": COMPARTMENT_ID_DESCRIPTION},
+            **SCOPE_PROPERTIES,
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
         "required": ["compartment_id"],
     },
 )
 async def list_buckets(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.object_storage_client()
-    namespace = client.get_namespace().data
-    response = client.list_buckets(
-        namespace_name=namespace,
-        compartment_id=args["compartment_id"],
-    )
-    buckets = [
-        {
-            "name": b.name,
-            "namespace": b.namespace,
-            "compartment_id": b.compartment_id,
-            "created_by": b.created_by,
-            "time_created": str(b.time_created),
-        }
-        for b in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(buckets, indent=2)}]}
+    namespace = await metadata.namespace(auth)
+
+    def make_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+        return Pager.from_args(
+            client.list_buckets,
+            scoped_args,
+            namespace_name=namespace,
+            compartment_id=compartment_id,
+        )
+
+    return await list_in_scope(args, auth, "object_storage_client", make_pager, _make_bucket_summary_dict)
 
 
 @tool(
@@ -53,9 +93,10 @@ async def list_buckets(args: dict) -> dict:
 )
 async def get_bucket(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.object_storage_client()
-    namespace = args.get("namespace") or client.get_namespace().data
-    response = client.get_bucket(
+    client = await run_blocking(auth.object_storage_client)
+    namespace = args.get("namespace") or await metadata.namespace(auth)
+    response = await run_blocking(
+        client.get_bucket,
         namespace_name=namespace,
         bucket_name=args["bucket_name"],
     )
@@ -70,40 +111,96 @@ async def get_bucket(args: dict) -> dict:
         "time_created": str(b.time_created),
         "etag": b.etag,
     }
-    return {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]}
+    return tool_result(result)
 
 
 @tool(
     name="list_objects",
-    description="List objects in an Object Storage bucket.",
+    description=(
+        "List objects in an Object Storage bucket, optionally under a prefix, one level at a time "
+        "(delimiter) or from a start key. With aggregate=true, stream the whole listing and return "
+        "only count, total size and a size histogram per prefix or storage tier."
+    ),
     input_schema={
         "type": "object",
         "properties": {
             "bucket_name": {"type": "string", "description": "Name of the bucket"},
             "namespace": {"type": "string", "description": "Object Storage namespace (leave empty to auto-detect)"},
+            "prefix": {"type": "string", "description": "Only objects whose names start with this prefix"},
+            "delimiter": {
+                "type": "string",
+                "description": "Only '/' is supported: list one level and return sub-prefixes separately",
+            },
+            "start": {"type": "string", "description": "Start listing at this object name (inclusive)"},
+            "end": {"type": "string", "description": "Stop listing before this object name (exclusive)"},
+            "fields": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(OBJECT_FIELDS)},
+                "description": "Fields to return per object (default: name, size, time_modified, md5, storage_tier)",
+            },
+            "aggregate": {
+                "type": "boolean",
+                "description": "Return only totals and size histograms instead of objects (default false)",
+            },
+            "group_by": {
+                "type": "string",
+                "enum": list(AGGREGATE_GROUPS),
+                "description": "Aggregate per next prefix level, per storage tier, or not at all (default prefix)",
+            },
+            "max_groups": {
+                "type": "integer",
+                "description": "Largest groups to report individually in aggregate mode (default 50)",
+            },
+            **PAGINATION_PROPERTIES,
         },
         "required": ["bucket_name"],
     },
 )
 async def list_objects(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.object_storage_client()
-    namespace = args.get("namespace") or client.get_namespace().data
-    response = client.list_objects(
-        namespace_name=namespace,
-        bucket_name=args["bucket_name"],
-    )
-    objects = [
-        {
-            "name": o.name,
-            "size": o.size,
-            "time_modified": str(o.time_modified),
-            "md5": o.md5,
-            "storage_tier": o.storage_tier,
+    client = await run_blocking(auth.object_storage_client)
+    namespace = args.get("namespace") or await metadata.namespace(auth)
+
+    if args.get("aggregate"):
+        try:
+            aggregate = ObjectAggregate(args.get("group_by") or "prefix", args.get("prefix") or "")
+        except ValueError as e:
+            return {"content": [{"type": "text", "text": str(e)}], "is_error": True}
+        # Aggregation keeps nothing per object, so only the time budget bounds the scan.
+        max_items = args.get("max_items")
+        pager = object_pager(
+            client,
+            namespace,
+            args["bucket_name"],
+            {k: v for k, v in args.items() if k != "delimiter"},
+            fields=["size", "storage_tier"],
+            max_items=int(max_items) if max_items else None,
+        )
+        async for o in pager:
+            aggregate.add(o)
+        result = {
+            "bucket_name": args["bucket_name"],
+            "prefix": args.get("prefix") or "",
+            "complete": pager.next_page is None,
+            "pages": pager.pages,
+            **aggregate.to_dict(int(args.get("max_groups") or 50)),
         }
-        for o in (response.data.objects or [])
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(objects, indent=2)}]}
+        return tool_result(result, pager)
+
+    fields = list(dict.fromkeys(["name", *(args.get("fields") or DEFAULT_OBJECT_FIELDS)]))
+    prefixes: set[str] = set()
+    pager = object_pager(
+        client,
+        namespace,
+        args["bucket_name"],
+        args,
+        fields=fields,
+        prefixes=prefixes if args.get("delimiter") else None,
+    )
+    objects = await pager.collect(lambda o: make_object_row(o, fields))
+    if args.get("delimiter"):
+        return tool_result({"prefixes": sorted(prefixes), "objects": objects}, pager)
+    return tool_result(objects, pager)
 
 
 @tool(
@@ -112,74 +209,127 @@ async def list_objects(args: dict) -> dict:
     input_schema={
         "type": "object",
         "properties": {
-            "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            "compartment_id": {"type": "string", "description": COMPARTMENT_ID_DESCRIPTION},
+            **SCOPE_PROPERTIES,
+            **FILTER_PROPERTIES,
+            **PAGINATION_PROPERTIES,
         },
         "required": ["compartment_id"],
     },
 )
 async def list_block_volumes(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.blockstorage_client()
-    response = client.list_volumes(compartment_id=args["compartment_id"])
-    volumes = [
-        {
-            "id": v.id,
-            "display_name": v.display_name,
-            "lifecycle_state": v.lifecycle_state,
-            "size_in_gbs": v.size_in_gbs,
-            "availability_domain": v.availability_domain,
-            "vpus_per_gb": v.vpus_per_gb,
-            "time_created": str(v.time_created),
-        }
-        for v in response.data
-    ]
-    return {"content": [{"type": "text", "text": json.dumps(volumes, indent=2)}]}
+
+    def make_pager(client, compartment_id: str, scoped_args: dict) -> Pager:
+        return Pager.from_args(
+            client.list_volumes,
+            scoped_args,
+            filter_params=("lifecycle_state",),
+            compartment_id=compartment_id,
+        )
+
+    return await list_in_scope(args, auth, "blockstorage_client", make_pager, _make_volume_dict)
+
+
+async def _fetch_bucket_details(
+    client,
+    namespace: str,
+    bucket_names: list[str],
+    max_concurrency: int,
+    on_progress: Callable[[int, int, str, bool], None] | None = None,
+) -> tuple[dict[str, object], list[dict]]:
+    """Fetch details for *bucket_names* concurrently.
+
+    Returns ``(details_by_name, failures)``; a bucket that still fails after
+    the rate limiter's retries is reported in *failures* instead of aborting the whole run.
+    *on_progress* is called as ``(done, total, bucket_name, ok)`` after each bucket.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    total = len(bucket_names)
+    done = 0
+    details: dict[str, object] = {}
+    failures: list[dict] = []
+
+    import oci
+
+    async def fetch(name: str) -> None:
+        nonlocal done
+        async with semaphore:
+            try:
+                # Throttling and transient failures are retried by the client's rate limiter.
+                response = await run_blocking(
+                    client.get_bucket,
+                    namespace_name=namespace,
+                    bucket_name=name,
+                    fields=["approximateSize", "approximateCount"],
+                )
+                details[name] = response.data
+                ok = True
+            except oci.exceptions.ServiceError as e:
+                failures.append({"name": name, "status": e.status, "code": e.code, "message": e.message})
+                ok = False
+            except Exception as e:
+                # Transport errors, timeouts, etc. must not discard the other buckets' results
+                failures.append({"name": name, "status": None, "code": type(e).__name__, "message": str(e)})
+                ok = False
+        done += 1
+        if on_progress:
+            on_progress(done, total, name, ok)
+
+    await asyncio.gather(*(fetch(name) for name in bucket_names))
+    return details, failures
+
+
+def _log_bucket_progress(done: int, total: int, bucket_name: str, ok: bool) -> None:
+    logger.info("get_bucket_sizes_by_user: %d/%d %s%s", done, total, bucket_name, "" if ok else " (failed)")
 
 
 @tool(
     name="get_bucket_sizes_by_user",
     description=(
         "List all Object Storage buckets in a compartment with their approximate size, "
-        "grouped by the user OCID that created them. Uses the OCI 'approximateSize' field "
-        "so no per-bucket API calls are needed."
+        "grouped by the user OCID that created them. Uses the OCI 'approximateSize' field; "
+        "bucket details are fetched concurrently and buckets that fail are listed under "
+        "'failed_buckets' rather than failing the whole call; compare 'fetched_buckets' with "
+        "'total_buckets' to tell whether the totals are complete."
     ),
     input_schema={
         "type": "object",
         "properties": {
             "compartment_id": {"type": "string", "description": "OCID of the compartment"},
+            "max_concurrency": {
+                "type": "integer",
+                "description": "Max concurrent bucket detail requests (default 8)",
+            },
         },
         "required": ["compartment_id"],
     },
 )
 async def get_bucket_sizes_by_user(args: dict) -> dict:
     auth = OCIAuth()
-    client = auth.object_storage_client()
-    namespace = client.get_namespace().data
-
-    # Paginate through all buckets (list gives us name + created_by)
-    all_summaries = []
-    page = None
-    while True:
-        kwargs: dict = {
-            "namespace_name": namespace,
-            "compartment_id": args["compartment_id"],
-        }
-        if page:
-            kwargs["page"] = page
-        response = client.list_buckets(**kwargs)
-        all_summaries.extend(response.data)
-        page = response.next_page if response.has_next_page else None
-        if not page:
-            break
+    client = await run_blocking(auth.object_storage_client)
+    namespace = await metadata.namespace(auth)
+
+    # Paginate through all buckets, keeping only (name, created_by) rather than whole summaries
+    pager = Pager(client.list_buckets, namespace_name=namespace, compartment_id=args["compartment_id"])
+    all_summaries = [(b.name, b.created_by) async for b in pager]
 
     # Fetch full bucket details (approximate_size lives on the Bucket object, not BucketSummary)
+    max_concurrency = int(args.get("max_concurrency") or settings.bucket_fetch_concurrency)
+    details, failures = await _fetch_bucket_details(
+        client,
+        namespace,
+        [name for name, _ in all_summaries],
+        max_concurrency,
+        on_progress=_log_bucket_progress,
+    )
+
     by_user: dict[str, dict] = {}
-    for summary in all_summaries:
-        detail = client.get_bucket(
-            namespace_name=namespace,
-            bucket_name=summary.name,
-        ).data
-        user = detail.created_by or summary.created_by or "unknown"
+    for name, summary_created_by in all_summaries:
+        detail = details.get(name)
+        if detail is None:
+            continue
+        user = detail.created_by or summary_created_by or "unknown"
         if user not in by_user:
             by_user[user] = {"total_bytes": 0, "total_objects": 0, "buckets": []}
         size = detail.approximate_size or 0
@@ -216,9 +366,82 @@ async def get_bucket_sizes_by_user(args: dict) -> dict:
         "namespace": namespace,
         "compartment_id": args["compartment_id"],
         "total_buckets": len(all_summaries),
+        "fetched_buckets": len(details),
         "by_user": summary,
     }
-    return {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]}
+    if failures:
+        result["failed_buckets"] = sorted(failures, key=lambda f: f["name"])
+    return tool_result(result)
+
+
+@tool(
+    name="scan_bucket_usage",
+    description=(
+        "Compute exact object count, total size and size histograms for a bucket (or a prefix of it) "
+        "by listing key-space partitions in parallel, grouped per prefix level or storage tier. "
+        "Use for exact usage of large buckets; get_bucket_sizes_by_user gives cheap approximate sizes."
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {"type": "string", "description": "Name of the bucket"},
+            "namespace": {"type": "string", "description": "Object Storage namespace (leave empty to auto-detect)"},
+            "prefix": {"type": "string", "description": "Only scan objects under this prefix"},
+            "group_by": {
+                "type": "string",
+                "enum": list(AGGREGATE_GROUPS),
+                "description": "Totals per next prefix level, per storage tier, or overall only (default prefix)",
+            },
+            "partition_by": {
+                "type": "string",
+                "enum": list(PARTITION_MODES),
+                "description": "Split by sub-prefix, by key range, or pick automatically (default auto)",
+            },
+            "max_workers": {"type": "integer", "description": "Partitions listed in parallel (default 8)"},
+            "max_groups": {"type": "integer", "description": "Largest groups to report individually (default 50)"},
+            "time_budget_seconds": {
+                "type": "number",
+                "description": "Stop listing after this many seconds and report partial totals (default 120)",
+            },
+        },
+        "required": ["bucket_name"],
+    },
+)
+async def scan_bucket_usage(args: dict) -> dict:
+    auth = OCIAuth()
+    client = await run_blocking(auth.object_storage_client)
+    namespace = args.get("namespace") or await metadata.namespace(auth)
+    budget = args.get("time_budget_seconds")
+    try:
+        scan = await scan_objects(
+            client,
+            namespace,
+            args["bucket_name"],
+            prefix=args.get("prefix") or "",
+            group_by=args.get("group_by") or "prefix",
+            partition_by=args.get("partition_by") or "auto",
+            max_workers=int(args["max_workers"]) if args.get("max_workers") else None,
+            time_budget=float(budget) if budget else None,
+        )
+    except ValueError as e:
+        return {"content": [{"type": "text", "text": str(e)}], "is_error": True}
+    result = {
+        "bucket_name": args["bucket_name"],
+        "prefix": args.get("prefix") or "",
+        "complete": scan.complete,
+        "partitioned_by": scan.mode,
+        "partitions": len(scan.partitions),
+        "elapsed_seconds": scan.elapsed,
+        **scan.aggregate.to_dict(int(args.get("max_groups") or 50)),
+    }
+    meta = None
+    incomplete = [p for p in scan.partitions if not p.get("complete")]
+    if incomplete:
+        meta = {
+            "incomplete_partitions": incomplete,
+            "hint": "Totals are partial; raise time_budget_seconds or max_workers, or scan the listed prefixes.",
+        }
+    return tool_result(result, meta=meta)
 
 
 ALL_TOOLS: list[SdkMcpTool] = [
@@ -227,4 +450,5 @@ ALL_TOOLS: list[SdkMcpTool] = [
     list_objects,
     list_block_volumes,
     get_bucket_sizes_by_user,
+    scan_bucket_usage,
 ]
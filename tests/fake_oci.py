@@ -0,0 +1,710 @@
+"""SDK-level fake of the OCI services the tools call, for offline benchmarks.
+
+``FakeTenancy.generate`` builds a synthetic tenancy at a given ``Scale`` — a
+compartment tree, instances, VCNs with subnets and security lists, volumes,
+buckets with objects, users, groups, memberships and policies — out of real
+``oci`` model objects. ``fake_oci(tenancy)`` swaps the SDK client classes and
+config loader for fakes served from it, so ``OCIAuth``, the client registry,
+the rate limiter, ``Pager`` and every tool run unchanged, with no network.
+
+``FakeOCIOptions`` injects per-request latency, a page-size cap (so every
+listing paginates) and HTTP 429 throttling with ``Retry-After``. The
+``FakeService`` yielded by ``fake_oci`` counts requests per operation.
+"""
+
+import bisect
+import copy
+import functools
+import hashlib
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import oci
+from oci.response import Response
+
+from src.oci_agent.auth import registry
+from src.oci_agent.config import settings
+from src.oci_agent.ratelimit import rate_limiter
+
+TENANCY_ID = "ocid1.tenancy.oc1..faketenancy"
+NAMESPACE = "fakenamespace"
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SHAPES = ("VM.Standard.E4.Flex", "VM.Standard3.Flex", "VM.Standard.A1.Flex", "BM.Standard3.64")
+OBJECT_PREFIXES = ("logs", "data", "backups", "images")
+# lifecycle_state an instance ends up in after each instance_action.
+ACTION_STATES = {"START": "RUNNING", "STOP": "STOPPED", "SOFTSTOP": "STOPPED", "RESET": "RUNNING", "SOFTRESET": "RUNNING"}
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Size of a generated tenancy. Regional counts are per compartment and region."""
+
+    compartments: int = 20
+    max_depth: int = 3
+    regions: tuple[str, ...] = ("us-ashburn-1",)
+    instances_per_compartment: int = 4
+    vcns_per_compartment: int = 1
+    subnets_per_vcn: int = 3
+    volumes_per_compartment: int = 2
+    # Buckets are spread over the first `bucket_compartments` compartments; the first also holds "big-bucket".
+    buckets: int = 40
+    bucket_compartments: int = 2
+    objects_per_bucket: int = 20
+    big_bucket_objects: int = 2000
+    users: int = 60
+    groups: int = 12
+    groups_per_user: int = 2
+    seed: int = 7
+
+
+SCALES: dict[str, Scale] = {
+    "small": Scale(),
+    "medium": Scale(
+        compartments=300,
+        max_depth=4,
+        buckets=500,
+        bucket_compartments=5,
+        big_bucket_objects=20000,
+        users=500,
+        groups=50,
+    ),
+    "large": Scale(
+        compartments=2000,
+        max_depth=5,
+        instances_per_compartment=3,
+        buckets=3000,
+        bucket_compartments=10,
+        big_bucket_objects=100000,
+        users=3000,
+        groups=200,
+        groups_per_user=3,
+    ),
+}
+
+
+@dataclass
+class FakeOCIOptions:
+    """Behaviour injected into every fake request."""
+
+    # Seconds added to every request, plus up to `jitter` more at random.
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Largest page returned by list operations, whatever `limit` asks for.
+    max_page_size: int = 100
+    # Reject every Nth request with HTTP 429 (0 disables throttling).
+    throttle_every: int = 0
+    # Retry-After sent with a 429, in seconds (None: no header).
+    retry_after: float | None = 0.01
+
+
+def _ocid(kind: str, n: int, region: str = "") -> str:
+    return f"ocid1.{kind}.oc1.{region}.fake{n:07d}"
+
+
+def _etag(*parts: object) -> str:
+    return hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+
+
+class FakeBucket:
+    """A bucket's details plus its object names and sizes; ``ObjectSummary`` models are built on first listing."""
+
+    def __init__(self, model: oci.object_storage.models.Bucket, names: list[str], sizes: list[int], tiers: list[str]):
+        self.model = model
+        self.names = names
+        self.sizes = sizes
+        self.tiers = tiers
+        self._summaries: list | None = None
+        self._lock = threading.Lock()
+
+    def summaries(self) -> list:
+        with self._lock:
+            if self._summaries is None:
+                self._summaries = [
+                    oci.object_storage.models.ObjectSummary(
+                        name=name,
+                        size=size,
+                        storage_tier=tier,
+                        md5=_etag(name),
+                        etag=_etag(name, size),
+                        time_created=EPOCH,
+                        time_modified=EPOCH + timedelta(minutes=i),
+                    )
+                    for i, (name, size, tier) in enumerate(zip(self.names, self.sizes, self.tiers))
+                ]
+            return self._summaries
+
+
+class FakeTenancy:
+    """Synthetic tenancy content, indexed the way the fake clients look it up."""
+
+    def __init__(self, scale: Scale):
+        self.scale = scale
+        self.tenancy_id = TENANCY_ID
+        self.home_region = scale.regions[0]
+        self.compartments: list = []
+        self.users: list = []
+        self.groups: list = []
+        self.memberships: list = []
+        # (region or None, kind) -> compartment_id -> models; identity resources use region None.
+        self.resources: dict[tuple[str | None, str], dict[str, list]] = {}
+        self.by_id: dict[str, object] = {}
+        self.buckets: dict[str, FakeBucket] = {}
+
+    def _add(self, region: str | None, kind: str, model) -> None:
+        self.resources.setdefault((region, kind), {}).setdefault(model.compartment_id, []).append(model)
+        if getattr(model, "id", None):
+            self.by_id[model.id] = model
+
+    def in_compartment(self, region: str | None, kind: str, compartment_id: str) -> list:
+        return self.resources.get((region, kind), {}).get(compartment_id, [])
+
+    def children(self, compartment_id: str) -> list:
+        return self.in_compartment(None, "compartment", compartment_id)
+
+    def descendants(self, compartment_id: str) -> list:
+        found, stack = [], [compartment_id]
+        while stack:
+            for child in self.children(stack.pop()):
+                found.append(child)
+                stack.append(child.id)
+        return found
+
+    @property
+    def bucket_compartment(self) -> str:
+        """The compartment holding "big-bucket" and the largest share of buckets."""
+        return self.buckets["big-bucket"].model.compartment_id
+
+    @classmethod
+    def generate(cls, scale: Scale = Scale()) -> "FakeTenancy":
+        t = cls(scale)
+        rng = random.Random(scale.seed)
+        seq = iter(range(1, 1 << 30))
+
+        def created() -> datetime:
+            return EPOCH + timedelta(minutes=next(seq))
+
+        # Compartment tree: each new compartment hangs off the tenancy or an earlier one above max_depth.
+        depth = {t.tenancy_id: 0}
+        parents = [t.tenancy_id]
+        for i in range(scale.compartments):
+            parent = rng.choice(parents)
+            c = oci.identity.models.Compartment(
+                id=_ocid("compartment", i),
+                name=f"comp-{i:04d}",
+                description=f"Compartment {i}",
+                compartment_id=parent,
+                lifecycle_state="ACTIVE",
+                time_created=created(),
+            )
+            t.compartments.append(c)
+            t._add(None, "compartment", c)
+            depth[c.id] = depth[parent] + 1
+            if depth[c.id] < scale.max_depth:
+                parents.append(c.id)
+
+        for i in range(scale.users):
+            u = oci.identity.models.User(
+                id=_ocid("user", i),
+                name=f"user-{i:04d}",
+                email=f"user-{i:04d}@example.com",
+                description="",
+                compartment_id=t.tenancy_id,
+                lifecycle_state="ACTIVE",
+                is_mfa_activated=i % 3 == 0,
+                time_created=created(),
+            )
+            t.users.append(u)
+            t._add(None, "user", u)
+        for i in range(scale.groups):
+            g = oci.identity.models.Group(
+                id=_ocid("group", i),
+                name="Administrators" if i == 0 else f"group-{i:03d}",
+                description="",
+                compartment_id=t.tenancy_id,
+                lifecycle_state="ACTIVE",
+                time_created=created(),
+            )
+            t.groups.append(g)
+            t._add(None, "group", g)
+        for n, u in enumerate(t.users):
+            for g in rng.sample(t.groups, min(scale.groups_per_user, len(t.groups))):
+                m = oci.identity.models.UserGroupMembership(
+                    id=_ocid("groupmembership", len(t.memberships)),
+                    user_id=u.id,
+                    group_id=g.id,
+                    compartment_id=t.tenancy_id,
+                    lifecycle_state="ACTIVE",
+                    time_created=created(),
+                )
+                t.memberships.append(m)
+                t.by_id[m.id] = m
+
+        root_policy = oci.identity.models.Policy(
+            id=_ocid("policy", 0),
+            name="tenancy-admins",
+            description="",
+            compartment_id=t.tenancy_id,
+            statements=["Allow group Administrators to manage all-resources in tenancy"],
+            lifecycle_state="ACTIVE",
+            time_created=created(),
+        )
+        t._add(None, "policy", root_policy)
+        for i, c in enumerate(t.compartments, start=1):
+            operators, readers = rng.sample(t.groups, 2) if len(t.groups) > 1 else (t.groups[0], t.groups[0])
+            t._add(
+                None,
+                "policy",
+                oci.identity.models.Policy(
+                    id=_ocid("policy", i),
+                    name=f"{c.name}-access",
+                    description="",
+                    # Locations are relative to the policy's compartment, so grant from the parent.
+                    compartment_id=c.compartment_id,
+                    statements=[
+                        f"Allow group {operators.name} to manage instance-family in compartment {c.name}",
+                        f"Allow group {readers.name} to read buckets in compartment {c.name} "
+                        "where request.user.mfaTotpVerified = 'true'",
+                    ],
+                    lifecycle_state="ACTIVE",
+                    time_created=created(),
+                ),
+            )
+
+        for r, region in enumerate(scale.regions):
+            t._generate_region(region, r, rng, created)
+        t._generate_buckets(rng, created)
+        return t
+
+    def _generate_region(self, region: str, region_index: int, rng: random.Random, created) -> None:
+        scale = self.scale
+        ads = [f"Uocm:{region.upper()}-AD-{n}" for n in (1, 2, 3)]
+        vcn_n = 0
+        for c in self.compartments:
+            for _ in range(scale.instances_per_compartment):
+                n = len(self.by_id)
+                self._add(
+                    region,
+                    "instance",
+                    oci.core.models.Instance(
+                        id=_ocid("instance", n, region),
+                        display_name=f"{c.name}-vm-{n}",
+                        compartment_id=c.id,
+                        lifecycle_state=rng.choice(("RUNNING", "RUNNING", "STOPPED")),
+                        shape=rng.choice(SHAPES),
+                        region=region,
+                        availability_domain=rng.choice(ads),
+                        time_created=created(),
+                    ),
+                )
+            for _ in range(scale.volumes_per_compartment):
+                n = len(self.by_id)
+                self._add(
+                    region,
+                    "volume",
+                    oci.core.models.Volume(
+                        id=_ocid("volume", n, region),
+                        display_name=f"{c.name}-vol-{n}",
+                        compartment_id=c.id,
+                        lifecycle_state="AVAILABLE",
+                        size_in_gbs=rng.choice((50, 100, 500, 1024)),
+                        vpus_per_gb=10,
+                        availability_domain=rng.choice(ads),
+                        time_created=created(),
+                    ),
+                )
+            for _ in range(scale.vcns_per_compartment):
+                # 10.x.0.0/16 per VCN; x wraps after 256 VCNs, which gives analyze_cidr_space overlaps to find.
+                octet = (region_index * 64 + vcn_n) % 256
+                vcn_n += 1
+                vcn_id = _ocid("vcn", len(self.by_id), region)
+                vcn = oci.core.models.Vcn(
+                    id=vcn_id,
+                    display_name=f"{c.name}-vcn",
+                    compartment_id=c.id,
+                    cidr_block=f"10.{octet}.0.0/16",
+                    cidr_blocks=[f"10.{octet}.0.0/16"],
+                    dns_label=f"vcn{vcn_n}",
+                    lifecycle_state="AVAILABLE",
+                    time_created=created(),
+                )
+                self._add(region, "vcn", vcn)
+                security_list = oci.core.models.SecurityList(
+                    id=_ocid("securitylist", len(self.by_id), region),
+                    display_name=f"{c.name}-default",
+                    compartment_id=c.id,
+                    vcn_id=vcn_id,
+                    lifecycle_state="AVAILABLE",
+                    ingress_security_rules=self._ingress_rules(rng, octet),
+                    egress_security_rules=[
+                        oci.core.models.EgressSecurityRule(
+                            protocol="all", destination="0.0.0.0/0", destination_type="CIDR_BLOCK", is_stateless=False
+                        )
+                    ],
+                    time_created=created(),
+                )
+                self._add(region, "security_list", security_list)
+                for s in range(scale.subnets_per_vcn):
+                    self._add(
+                        region,
+                        "subnet",
+                        oci.core.models.Subnet(
+                            id=_ocid("subnet", len(self.by_id), region),
+                            display_name=f"{c.name}-subnet-{s}",
+                            compartment_id=c.id,
+                            vcn_id=vcn_id,
+                            cidr_block=f"10.{octet}.{s}.0/24",
+                            availability_domain=None,
+                            dns_label=f"sub{s}",
+                            lifecycle_state="AVAILABLE",
+                            security_list_ids=[security_list.id],
+                            time_created=created(),
+                        ),
+                    )
+
+    @staticmethod
+    def _ingress_rules(rng: random.Random, octet: int) -> list:
+        def tcp(source: str, port: int) -> oci.core.models.IngressSecurityRule:
+            return oci.core.models.IngressSecurityRule(
+                protocol="6",
+                source=source,
+                source_type="CIDR_BLOCK",
+                is_stateless=False,
+                tcp_options=oci.core.models.TcpOptions(
+                    destination_port_range=oci.core.models.PortRange(min=port, max=port)
+                ),
+            )
+
+        rules = [tcp("0.0.0.0/0", 443), tcp(f"10.{octet}.0.0/16", 5432)]
+        if rng.random() < 0.3:
+            rules.append(tcp("0.0.0.0/0", 22))
+        return rules
+
+    def _generate_buckets(self, rng: random.Random, created) -> None:
+        scale = self.scale
+        homes = [c.id for c in self.compartments[: max(1, scale.bucket_compartments)]] or [self.tenancy_id]
+        for i in range(scale.buckets + 1):
+            name = "big-bucket" if i == 0 else f"bucket-{i:05d}"
+            count = scale.big_bucket_objects if i == 0 else scale.objects_per_bucket
+            names = sorted(
+                f"{OBJECT_PREFIXES[n % len(OBJECT_PREFIXES)]}/p{n % 17:02d}/obj-{n:07d}.bin" for n in range(count)
+            )
+            sizes = [int(rng.lognormvariate(12, 2.5)) for _ in names]
+            tiers = ["Archive" if rng.random() < 0.1 else "Standard" for _ in names]
+            time_created = created()
+            model = oci.object_storage.models.Bucket(
+                name=name,
+                namespace=NAMESPACE,
+                compartment_id=homes[i % len(homes)],
+                created_by=rng.choice(self.users).id if self.users else None,
+                storage_tier="Standard",
+                public_access_type="NoPublicAccess",
+                versioning="Disabled",
+                approximate_size=sum(sizes),
+                approximate_count=count,
+                etag=_etag(name, time_created),
+                time_created=time_created,
+            )
+            self.buckets[name] = FakeBucket(model, names, sizes, tiers)
+
+
+class FakeService:
+    """Shared request accounting and fault injection for every fake client of one ``fake_oci``."""
+
+    def __init__(self, tenancy: FakeTenancy, options: FakeOCIOptions):
+        self.tenancy = tenancy
+        self.options = options
+        self.calls: Counter[str] = Counter()
+        self.throttled = 0
+        self._requests = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+
+    @property
+    def requests(self) -> int:
+        with self._lock:
+            return self._requests
+
+    def request(self, operation: str) -> None:
+        """Account for one request: sleep the injected latency, then maybe reject it with a 429."""
+        options = self.options
+        with self._lock:
+            self._requests += 1
+            self.calls[operation] += 1
+            throttle = bool(options.throttle_every) and self._requests % options.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+            delay = options.latency + (self._random.uniform(0, options.jitter) if options.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if throttle:
+            headers = {"opc-request-id": uuid.uuid4().hex}
+            if options.retry_after is not None:
+                headers["retry-after"] = str(options.retry_after)
+            raise oci.exceptions.ServiceError(429, "TooManyRequests", headers, "Too many requests for the tenancy")
+
+    def page(self, items: list, limit: int | None, page: str | None) -> Response:
+        start = int(page or 0)
+        end = start + min(limit or self.options.max_page_size, self.options.max_page_size)
+        headers = {"opc-next-page": str(end)} if end < len(items) else {}
+        return Response(200, headers, items[start:end], None)
+
+
+def _not_found(kind: str, ocid: str) -> oci.exceptions.ServiceError:
+    return oci.exceptions.ServiceError(
+        404, "NotAuthorizedOrNotFound", {}, f"Authorization failed or requested resource not found: {kind} {ocid}"
+    )
+
+
+class _FakeClient:
+    def __init__(self, service: FakeService, config: dict, **kwargs):
+        self._service = service
+        self.region = config.get("region") or service.tenancy.home_region
+
+    @property
+    def _tenancy(self) -> FakeTenancy:
+        return self._service.tenancy
+
+    def _list(
+        self,
+        operation: str,
+        items: list,
+        limit: int | None = None,
+        page: str | None = None,
+        lifecycle_state: str | None = None,
+        **match,
+    ) -> Response:
+        self._service.request(operation)
+        criteria = {k: v for k, v in match.items() if v is not None}
+        if lifecycle_state:
+            criteria["lifecycle_state"] = lifecycle_state
+        if criteria:
+            items = [i for i in items if all(getattr(i, k) == v for k, v in criteria.items())]
+        return self._service.page(items, limit, page)
+
+    def _get(self, operation: str, kind: str, ocid: str) -> Response:
+        self._service.request(operation)
+        model = self._tenancy.by_id.get(ocid)
+        if model is None or type(model).__name__.lower() != kind:
+            raise _not_found(kind, ocid)
+        return Response(200, {"etag": _etag(ocid)}, model, None)
+
+    def _regional(self, kind: str, compartment_id: str) -> list:
+        return self._tenancy.in_compartment(self.region, kind, compartment_id)
+
+
+class FakeComputeClient(_FakeClient):
+    def list_instances(self, compartment_id, limit=None, page=None, lifecycle_state=None, **kwargs):
+        items = self._regional("instance", compartment_id)
+        return self._list("list_instances", items, limit, page, lifecycle_state)
+
+    def get_instance(self, instance_id, **kwargs):
+        return self._get("get_instance", "instance", instance_id)
+
+    def instance_action(self, instance_id, action, **kwargs):
+        response = self._get("instance_action", "instance", instance_id)
+        response.data.lifecycle_state = ACTION_STATES.get(action, response.data.lifecycle_state)
+        return response
+
+
+class FakeVirtualNetworkClient(_FakeClient):
+    def list_vcns(self, compartment_id, limit=None, page=None, lifecycle_state=None, **kwargs):
+        return self._list("list_vcns", self._regional("vcn", compartment_id), limit, page, lifecycle_state)
+
+    def get_vcn(self, vcn_id, **kwargs):
+        return self._get("get_vcn", "vcn", vcn_id)
+
+    def list_subnets(self, compartment_id, vcn_id=None, limit=None, page=None, lifecycle_state=None, **kwargs):
+        items = self._regional("subnet", compartment_id)
+        return self._list("list_subnets", items, limit, page, lifecycle_state, vcn_id=vcn_id)
+
+    def list_security_lists(self, compartment_id, vcn_id=None, limit=None, page=None, lifecycle_state=None, **kwargs):
+        items = self._regional("security_list", compartment_id)
+        return self._list("list_security_lists", items, limit, page, lifecycle_state, vcn_id=vcn_id)
+
+    def get_security_list(self, security_list_id, **kwargs):
+        return self._get("get_security_list", "securitylist", security_list_id)
+
+
+class FakeBlockstorageClient(_FakeClient):
+    def list_volumes(self, compartment_id=None, limit=None, page=None, lifecycle_state=None, **kwargs):
+        return self._list("list_volumes", self._regional("volume", compartment_id), limit, page, lifecycle_state)
+
+
+class FakeIdentityClient(_FakeClient):
+    def list_compartments(
+        self,
+        compartment_id,
+        compartment_id_in_subtree=False,
+        limit=None,
+        page=None,
+        lifecycle_state=None,
+        **kwargs,
+    ):
+        if compartment_id_in_subtree:
+            items = self._tenancy.descendants(compartment_id)
+        else:
+            items = self._tenancy.children(compartment_id)
+        return self._list("list_compartments", items, limit, page, lifecycle_state)
+
+    def list_users(self, compartment_id, limit=None, page=None, lifecycle_state=None, **kwargs):
+        return self._list("list_users", self._tenancy.users, limit, page, lifecycle_state)
+
+    def list_groups(self, compartment_id, limit=None, page=None, lifecycle_state=None, **kwargs):
+        return self._list("list_groups", self._tenancy.groups, limit, page, lifecycle_state)
+
+    def get_group(self, group_id, **kwargs):
+        return self._get("get_group", "group", group_id)
+
+    def list_policies(self, compartment_id, limit=None, page=None, lifecycle_state=None, **kwargs):
+        items = self._tenancy.in_compartment(None, "policy", compartment_id)
+        return self._list("list_policies", items, limit, page, lifecycle_state)
+
+    def list_user_group_memberships(self, compartment_id, user_id=None, group_id=None, limit=None, page=None, **kwargs):
+        items = self._tenancy.memberships
+        return self._list("list_user_group_memberships", items, limit, page, user_id=user_id, group_id=group_id)
+
+    def list_region_subscriptions(self, tenancy_id, **kwargs):
+        self._service.request("list_region_subscriptions")
+        subscriptions = [
+            oci.identity.models.RegionSubscription(
+                region_name=region,
+                region_key=region.split("-")[1][:3].upper(),
+                is_home_region=region == self._tenancy.home_region,
+                status="READY",
+            )
+            for region in self._tenancy.scale.regions
+        ]
+        return Response(200, {}, subscriptions, None)
+
+    def list_availability_domains(self, compartment_id, **kwargs):
+        self._service.request("list_availability_domains")
+        ads = [
+            oci.identity.models.AvailabilityDomain(name=f"Uocm:{self.region.upper()}-AD-{n}", compartment_id=compartment_id)
+            for n in (1, 2, 3)
+        ]
+        return Response(200, {}, ads, None)
+
+
+class FakeObjectStorageClient(_FakeClient):
+    def _bucket(self, bucket_name: str) -> FakeBucket:
+        bucket = self._tenancy.buckets.get(bucket_name) if self.region == self._tenancy.home_region else None
+        if bucket is None:
+            raise oci.exceptions.ServiceError(404, "BucketNotFound", {}, f"Either the bucket named '{bucket_name}' "
+                                              "does not exist in the namespace or you are not authorized to access it")
+        return bucket
+
+    def get_namespace(self, **kwargs):
+        self._service.request("get_namespace")
+        return Response(200, {}, NAMESPACE, None)
+
+    def list_buckets(self, namespace_name, compartment_id, limit=None, page=None, **kwargs):
+        buckets = self._tenancy.buckets.values() if self.region == self._tenancy.home_region else ()
+        summaries = [
+            oci.object_storage.models.BucketSummary(
+                name=b.model.name,
+                namespace=b.model.namespace,
+                compartment_id=b.model.compartment_id,
+                created_by=b.model.created_by,
+                time_created=b.model.time_created,
+                etag=b.model.etag,
+            )
+            for b in buckets
+            if b.model.compartment_id == compartment_id
+        ]
+        return self._list("list_buckets", summaries, limit, page)
+
+    def get_bucket(self, namespace_name, bucket_name, fields=None, **kwargs):
+        self._service.request("get_bucket")
+        model = self._bucket(bucket_name).model
+        if not fields or "approximateSize" not in fields or "approximateCount" not in fields:
+            # Like OCI, the approximate fields are only filled in when asked for.
+            model = copy.copy(model)
+            if not fields or "approximateSize" not in fields:
+                model.approximate_size = None
+            if not fields or "approximateCount" not in fields:
+                model.approximate_count = None
+        return Response(200, {"etag": model.etag}, model, None)
+
+    def list_objects(
+        self,
+        namespace_name,
+        bucket_name,
+        prefix=None,
+        start=None,
+        end=None,
+        limit=None,
+        delimiter=None,
+        fields=None,
+        **kwargs,
+    ):
+        self._service.request("list_objects")
+        bucket = self._bucket(bucket_name)
+        names, summaries = bucket.names, bucket.summaries()
+        prefix = prefix or ""
+        limit = min(limit or 1000, self._service.options.max_page_size)
+
+        def listed(i: int) -> bool:
+            return i < len(names) and names[i].startswith(prefix) and not (end and names[i] >= end)
+
+        i = bisect.bisect_left(names, max(start or "", prefix))
+        objects, prefixes = [], []
+        while listed(i) and len(objects) + len(prefixes) < limit:
+            cut = names[i].find(delimiter, len(prefix)) if delimiter else -1
+            if cut >= 0:
+                common = names[i][: cut + len(delimiter)]
+                prefixes.append(common)
+                # Skip every name under the common prefix.
+                i = bisect.bisect_left(names, common[:-1] + chr(ord(common[-1]) + 1))
+                continue
+            objects.append(summaries[i])
+            i += 1
+        data = oci.object_storage.models.ListObjects(
+            objects=objects, prefixes=prefixes, next_start_with=names[i] if listed(i) else None
+        )
+        return Response(200, {}, data, None)
+
+
+@contextmanager
+def fake_oci(tenancy: FakeTenancy, options: FakeOCIOptions | None = None):
+    """Serve every OCI client built by ``OCIAuth`` from *tenancy* while the context is active.
+
+    A fresh profile name is used so per-profile caches (metadata, compartment
+    tree, policy index, ...) start cold, and the client registry and rate
+    limiter are reset on entry and exit.
+    """
+    service = FakeService(tenancy, options or FakeOCIOptions())
+    config = {
+        "tenancy": tenancy.tenancy_id,
+        "region": tenancy.home_region,
+        "user": _ocid("user", 0),
+        "fingerprint": "00:00:00:00",
+        "key_file": None,
+    }
+
+    def client(cls):
+        return functools.partial(cls, service)
+
+    with (
+        patch.object(settings, "oci_profile", f"FAKE-{uuid.uuid4()}"),
+        patch("oci.config.from_file", return_value=config),
+        patch("oci.config.validate_config"),
+        patch("oci.core.ComputeClient", client(FakeComputeClient)),
+        patch("oci.core.VirtualNetworkClient", client(FakeVirtualNetworkClient)),
+        patch("oci.core.BlockstorageClient", client(FakeBlockstorageClient)),
+        patch("oci.identity.IdentityClient", client(FakeIdentityClient)),
+        patch("oci.object_storage.ObjectStorageClient", client(FakeObjectStorageClient)),
+    ):
+        registry.clear()
+        rate_limiter.clear()
+        try:
+            yield service
+        finally:
+            registry.clear()
+            rate_limiter.clear()
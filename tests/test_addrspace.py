@@ -0,0 +1,158 @@
+"""Tests for the CIDR overlap / free-block / utilization analyzer."""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.addrspace import AddressSpace, aligned_blocks, gaps, merge_intervals
+from src.oci_agent.output import decode
+
+
+def _vcn(ocid, cidrs, region=None):
+    return {"id": ocid, "display_name": ocid.rsplit(".", 1)[-1], "cidr_blocks": cidrs, "region": region}
+
+
+def _subnet(ocid, vcn_id, cidr):
+    return {"id": ocid, "display_name": ocid.rsplit(".", 1)[-1], "vcn_id": vcn_id, "cidr_block": cidr}
+
+
+VCNS = [
+    _vcn("ocid1.vcn.oc1..prod", ["10.0.0.0/16"]),
+    _vcn("ocid1.vcn.oc1..dev", ["10.0.128.0/17"], region="eu-frankfurt-1"),
+    _vcn("ocid1.vcn.oc1..lab", ["192.168.0.0/24"]),
+]
+SUBNETS = [
+    _subnet("ocid1.subnet.oc1..a", "ocid1.vcn.oc1..prod", "10.0.0.0/24"),
+    _subnet("ocid1.subnet.oc1..b", "ocid1.vcn.oc1..prod", "10.0.1.0/24"),
+    _subnet("ocid1.subnet.oc1..c", "ocid1.vcn.oc1..prod", "10.0.4.0/22"),
+    _subnet("ocid1.subnet.oc1..d", "ocid1.vcn.oc1..lab", "192.168.0.0/25"),
+]
+
+
+class TestIntervalHelpers:
+    def test_merge_and_gaps(self):
+        assert merge_intervals([(5, 9), (0, 3), (4, 4), (20, 30)]) == [(0, 9), (20, 30)]
+        assert list(gaps((0, 40), [(5, 9), (20, 30)])) == [(0, 4), (10, 19), (31, 40)]
+
+    def test_aligned_blocks(self):
+        # 1..6 -> /32 at 1, /31 at 2, /31 at 4, /32 at 6
+        assert list(aligned_blocks(1, 6, 32)) == [(1, 32), (2, 31), (4, 31), (6, 32)]
+
+
+class TestAddressSpace:
+    def setup_method(self):
+        self.space = AddressSpace(VCNS, SUBNETS)
+
+    def test_overlapping_vcns_across_regions(self):
+        overlaps = self.space.overlaps()
+
+        assert len(overlaps) == 1
+        assert overlaps[0]["relation"] == "contains"
+        assert {overlaps[0]["a"]["id"], overlaps[0]["b"]["id"]} == {"ocid1.vcn.oc1..prod", "ocid1.vcn.oc1..dev"}
+        assert overlaps[0]["b"]["region"] == "eu-frankfurt-1"
+
+    def test_candidate_conflicts(self):
+        assert self.space.conflicts("172.16.0.0/12") == []
+        hits = self.space.conflicts("10.0.1.128/25")
+        assert [h["id"] for h in hits] == ["ocid1.vcn.oc1..prod", "ocid1.subnet.oc1..b"]
+        with pytest.raises(ValueError):
+            self.space.conflicts("not-a-cidr")
+
+    def test_free_blocks_in_vcn(self):
+        assert self.space.free_blocks("ocid1.vcn.oc1..prod", 24, limit=3) == [
+            "10.0.2.0/24",
+            "10.0.3.0/24",
+            "10.0.8.0/24",
+        ]
+        assert self.space.free_blocks("ocid1.vcn.oc1..lab", 24) == []
+
+    def test_free_blocks_in_cidr_skip_vcns(self):
+        assert self.space.free_blocks("10.0.0.0/15", 16) == ["10.1.0.0/16"]
+
+    def test_free_blocks_in_dual_stack_vcn(self):
+        vcn = {**_vcn("ocid1.vcn.oc1..dual", ["10.9.0.0/16"]), "ipv6_cidr_blocks": ["2001:db8::/56"]}
+        subnet = {**_subnet("ocid1.subnet.oc1..v6", vcn["id"], "10.9.0.0/24"), "ipv6_cidr_blocks": ["2001:db8::/64"]}
+        space = AddressSpace([vcn], [subnet])
+
+        assert space.free_blocks(vcn["id"], 64, limit=2) == ["2001:db8:0:1::/64", "2001:db8:0:2::/64"]
+        assert space.free_blocks(vcn["id"], 24, limit=1) == ["10.9.1.0/24"]
+        with pytest.raises(ValueError, match="between 0 and 128"):
+            space.free_blocks(vcn["id"], 129)
+        with pytest.raises(ValueError, match="between 0 and 32"):
+            self.space.free_blocks("ocid1.vcn.oc1..prod", 64)
+
+    def test_utilization(self):
+        rows = {r["vcn_id"]: r for r in self.space.utilization()}
+
+        prod = rows["ocid1.vcn.oc1..prod"]
+        assert prod["used_addresses"] == 256 + 256 + 1024
+        assert prod["addresses"] == 65536
+        assert prod["largest_free_block"] == "10.0.128.0/17"
+        lab = rows["ocid1.vcn.oc1..lab"]
+        assert lab["utilization_pct"] == 50.0
+        assert lab["largest_free_block"] == "192.168.0.128/25"
+
+    def test_thousands_of_subnets_query_quickly(self):
+        vcns = [_vcn(f"ocid1.vcn.oc1..v{i}", [f"10.{i}.0.0/16"]) for i in range(20)]
+        subnets = [
+            _subnet(f"ocid1.subnet.oc1..s{i}-{j}", f"ocid1.vcn.oc1..v{i}", f"10.{i}.{j}.0/24")
+            for i in range(20)
+            for j in range(0, 250)
+        ]
+        space = AddressSpace(vcns, subnets)
+
+        started = time.perf_counter()
+        for i in range(200):
+            space.conflicts(f"10.{i % 20}.{i}.0/28")
+        elapsed = time.perf_counter() - started
+
+        assert space.overlaps() == []
+        assert elapsed < 0.5
+
+
+def _page(items):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = False
+    return response
+
+
+class TestAnalyzeCidrSpaceTool:
+    def test_reports_candidate_and_utilization(self):
+        from src.oci_agent.tools.network import analyze_cidr_space
+
+        vcn = SimpleNamespace(
+            id="ocid1.vcn.oc1..prod", display_name="prod", compartment_id="ocid1.compartment.oc1..c",
+            lifecycle_state="AVAILABLE", cidr_block="10.0.0.0/16", cidr_blocks=["10.0.0.0/16"], ipv6_cidr_blocks=None,
+        )
+        subnet = SimpleNamespace(
+            id="ocid1.subnet.oc1..a", display_name="a", compartment_id="ocid1.compartment.oc1..c",
+            lifecycle_state="AVAILABLE", vcn_id=vcn.id, cidr_block="10.0.0.0/24", ipv6_cidr_blocks=None,
+        )
+        client = MagicMock()
+        client.list_vcns.return_value = _page([vcn])
+        client.list_subnets.return_value = _page([subnet])
+
+        with patch("src.oci_agent.tools.network.OCIAuth") as MockAuth:
+            MockAuth.return_value.profile = f"TEST-{uuid.uuid4()}"
+            MockAuth.return_value.virtual_network_client.return_value = client
+            result = asyncio.run(
+                analyze_cidr_space.handler(
+                    {
+                        "compartment_id": "ocid1.compartment.oc1..c",
+                        "candidate_cidr": "10.0.0.128/25",
+                        "free_prefix_length": 24,
+                        "max_free_blocks": 1,
+                    }
+                )
+            )
+
+        data = decode(result["content"][0]["text"])
+        assert data["candidate"]["available"] is False
+        assert [c["id"] for c in data["candidate"]["conflicts"]] == [vcn.id, subnet.id]
+        assert data["free_blocks"] == [{"within": vcn.id, "blocks": ["10.0.1.0/24"]}]
+        assert data["utilization"][0]["used_addresses"] == 256
@@ -0,0 +1,85 @@
+"""Tests for the shared OCI client registry."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.auth import ClientRegistry
+
+CONFIG_TEMPLATE = """\
+[{profile}]
+user=ocid1.user.oc1..aaaa
+fingerprint=aa:bb:cc:dd:ee:ff:00:11:22:33:44:55:66:77:88:99
+tenancy=ocid1.tenancy.oc1..aaaa
+region={region}
+key_file={key_file}
+"""
+
+
+@pytest.fixture
+def oci_config(tmp_path):
+    key_file = tmp_path / "key.pem"
+    key_file.write_text("key-v1")
+    config_file = tmp_path / "config"
+    config_file.write_text(
+        CONFIG_TEMPLATE.format(profile="TEST", region="us-ashburn-1", key_file=key_file)
+    )
+    with patch("src.oci_agent.auth.settings") as mock_settings:
+        mock_settings.resolved_oci_config_path = str(config_file)
+        yield config_file, key_file
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestClientRegistry:
+    def test_reuses_client_for_same_key(self, oci_config):
+        registry = ClientRegistry()
+        factory = MagicMock(side_effect=lambda cfg: object())
+
+        first = registry.get_client("TEST", None, "compute", factory)
+        second = registry.get_client("TEST", None, "compute", factory)
+
+        assert first is second
+        assert factory.call_count == 1
+        assert registry.stats() == {"hits": 1, "misses": 1, "reloads": 0, "clients": 1}
+
+    def test_region_and_service_are_separate_keys(self, oci_config):
+        registry = ClientRegistry()
+        factory = MagicMock(side_effect=lambda cfg: object())
+
+        home = registry.get_client("TEST", None, "compute", factory)
+        other = registry.get_client("TEST", "eu-frankfurt-1", "compute", factory)
+        network = registry.get_client("TEST", None, "virtual_network", factory)
+
+        assert len({id(home), id(other), id(network)}) == 3
+        assert factory.call_args_list[1].args[0]["region"] == "eu-frankfurt-1"
+        assert registry.stats()["misses"] == 3
+
+    def test_key_file_change_rebuilds_clients(self, oci_config):
+        _, key_file = oci_config
+        registry = ClientRegistry()
+        factory = MagicMock(side_effect=lambda cfg: object())
+
+        before = registry.get_client("TEST", None, "compute", factory)
+        key_file.write_text("key-v2-rotated")
+        _bump_mtime(key_file)
+        after = registry.get_client("TEST", None, "compute", factory)
+
+        assert before is not after
+        assert registry.stats()["reloads"] == 1
+
+    def test_config_change_rereads_region(self, oci_config):
+        config_file, key_file = oci_config
+        registry = ClientRegistry()
+
+        assert registry.get_config("TEST")["region"] == "us-ashburn-1"
+        config_file.write_text(
+            CONFIG_TEMPLATE.format(profile="TEST", region="us-phoenix-1", key_file=key_file)
+        )
+        _bump_mtime(config_file)
+
+        assert registry.get_config("TEST")["region"] == "us-phoenix-1"
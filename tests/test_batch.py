@@ -0,0 +1,110 @@
+"""Tests for batch query mode."""
+
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.oci_agent.batch import BatchQuery, BatchRunner, load_queries
+
+
+class FakeClient:
+    def __init__(self):
+        self.disconnected = False
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+class FakeAgent:
+    """Answers "<seconds> <word>" after sleeping; "boom" raises and "fail" returns an error result."""
+
+    def __init__(self):
+        self.clients = []
+        self.running = 0
+        self.peak = 0
+
+    async def connect(self):
+        self.clients.append(FakeClient())
+        return self.clients[-1]
+
+    async def ask(self, client, query, on_text):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            delay, word = query.split()
+            await asyncio.sleep(float(delay))
+            if word == "boom":
+                raise RuntimeError("model unavailable")
+            on_text(word.upper())
+            return SimpleNamespace(is_error=word == "fail", result="tool failed", duration_ms=7,
+                                   duration_api_ms=5, num_turns=2, total_cost_usd=0.25)
+        finally:
+            self.running -= 1
+
+
+def _run(queries, concurrency=2):
+    agent, out = FakeAgent(), io.StringIO()
+    items = [BatchQuery(str(n), q) for n, q in enumerate(queries, 1)]
+    records = asyncio.run(BatchRunner(agent, concurrency, out=out).run(items))
+    return agent, records, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestBatchRunner:
+    def test_output_keeps_input_order(self):
+        agent, records, lines = _run(["0.05 slow", "0 fast", "0.02 mid", "0 last"])
+
+        assert [r["answer"] for r in lines] == ["SLOW", "FAST", "MID", "LAST"]
+        assert lines == records
+        assert lines[0]["total_cost_usd"] == 0.25 and lines[0]["num_turns"] == 2
+        assert lines[0]["elapsed_ms"] >= 50 and lines[0]["duration_api_ms"] == 5
+
+    def test_concurrency_is_capped_and_sessions_closed(self):
+        agent, _, _ = _run([f"0.01 q{n}" for n in range(8)], concurrency=3)
+
+        assert agent.peak == 3
+        assert len(agent.clients) == 8 and all(c.disconnected for c in agent.clients)
+
+    def test_failures_are_reported_per_query(self, capsys):
+        _, _, lines = _run(["0 ok", "0 boom", "0 fail"])
+
+        assert [r["is_error"] for r in lines] == [False, True, True]
+        assert lines[1]["error"] == "RuntimeError: model unavailable"
+        assert lines[2]["error"] == "tool failed"
+        assert "queries=3 failed=2" in capsys.readouterr().err
+
+
+class TestLoadQueries:
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "q.jsonl"
+        path.write_text('"List VCNs"\n\n# comment\n{"id": "mfa", "query": "Users without MFA?"}\n')
+
+        assert load_queries(path) == [BatchQuery("1", "List VCNs"), BatchQuery("mfa", "Users without MFA?")]
+
+    @pytest.mark.parametrize("text", ["- List VCNs\n- {id: mfa, query: \"Users without MFA?\"}\n",
+                                      "queries:\n  - List VCNs\n  - id: mfa\n    query: Users without MFA?\n"])
+    def test_yaml(self, tmp_path, text):
+        path = tmp_path / "q.yaml"
+        path.write_text(text)
+
+        assert load_queries(path) == [BatchQuery("1", "List VCNs"), BatchQuery("mfa", "Users without MFA?")]
+
+    @pytest.mark.parametrize(
+        ("name", "text", "error"),
+        [
+            ("q.jsonl", '"ok"\n{not json\n', r"q.jsonl:2: invalid JSON"),
+            ("q.jsonl", '{"id": 1}\n', "non-empty 'query'"),
+            ("q.jsonl", '{"id": "a", "query": "x"}\n{"id": "a", "query": "y"}\n', "duplicate"),
+            ("q.yaml", "queries: 3\n", "expected a list"),
+            ("q.yml", "", "expected a list"),
+            ("q.jsonl", "\n", "no queries"),
+        ],
+    )
+    def test_malformed(self, tmp_path, name, text, error):
+        path = tmp_path / name
+        path.write_text(text)
+
+        with pytest.raises(ValueError, match=error):
+            load_queries(path)
@@ -0,0 +1,231 @@
+"""Offline benchmarks: every tool handler timed against the fake OCI service.
+
+Each tool runs ``OCI_BENCH_ROUNDS`` times against a tenancy generated at
+``OCI_BENCH_SCALE`` (small, medium or large; see ``fake_oci.SCALES``) with
+``OCI_BENCH_LATENCY_MS`` of injected latency per request, a 100-record page
+cap and every ``OCI_BENCH_THROTTLE_EVERY``-th request throttled. The first
+(cold-cache) and median warm timings, OCI request counts and result sizes are
+written as a table to the file named by ``OCI_BENCH_REPORT``, if set; set
+``OCI_BENCH_HISTORY`` to append the run as one JSON line to that file, so runs
+can be compared across releases. A plain test run writes neither.
+
+    OCI_BENCH_SCALE=large OCI_BENCH_REPORT=bench_output.txt python -m pytest tests/test_benchmarks.py
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import time
+import tomllib
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.oci_agent.auth import OCIAuth
+from src.oci_agent.config import settings
+from src.oci_agent.inventory import InventoryCrawler, InventoryStore
+from src.oci_agent.output import decode, tool_result
+from src.oci_agent.tools.compute import ALL_TOOLS as COMPUTE_TOOLS
+from src.oci_agent.tools.identity import ALL_TOOLS as IDENTITY_TOOLS
+from src.oci_agent.tools.inventory import ALL_TOOLS as INVENTORY_TOOLS
+from src.oci_agent.tools.network import ALL_TOOLS as NETWORK_TOOLS
+from src.oci_agent.tools.results import ALL_TOOLS as RESULT_TOOLS
+from src.oci_agent.tools.storage import ALL_TOOLS as STORAGE_TOOLS
+
+from .fake_oci import SCALES, TENANCY_ID, FakeOCIOptions, FakeTenancy, fake_oci
+
+ROOT = Path(__file__).resolve().parents[1]
+SCALE = os.environ.get("OCI_BENCH_SCALE", "small")
+ROUNDS = max(2, int(os.environ.get("OCI_BENCH_ROUNDS", "3")))
+OPTIONS = FakeOCIOptions(
+    latency=float(os.environ.get("OCI_BENCH_LATENCY_MS", "1")) / 1000,
+    max_page_size=100,
+    throttle_every=int(os.environ.get("OCI_BENCH_THROTTLE_EVERY", "50")),
+    retry_after=0.01,
+)
+TOOLS = {t.name: t for t in COMPUTE_TOOLS + NETWORK_TOOLS + STORAGE_TOOLS + IDENTITY_TOOLS + INVENTORY_TOOLS + RESULT_TOOLS}
+SUBTREE = {"compartment_id": TENANCY_ID, "include_subtree": True, "max_items": 1_000_000}
+
+_results: list[dict] = []
+
+
+def _first_instance(t: FakeTenancy) -> str:
+    return next(m.id for m in t.by_id.values() if type(m).__name__ == "Instance")
+
+
+def _first_vcn(t: FakeTenancy):
+    return next(m for m in t.by_id.values() if type(m).__name__ == "Vcn")
+
+
+def _output_token(t: FakeTenancy) -> str:
+    rows = [{"id": m.id, "name": getattr(m, "display_name", None)} for m in t.by_id.values()]
+    with patch.object(settings, "output_max_tokens", 500):
+        result = tool_result(rows)
+    return json.loads(result["content"][1]["text"])["output_token"]
+
+
+# Tool name -> arguments for the generated tenancy. Every registered tool must have an entry.
+CASES = {
+    "list_instances": lambda t: SUBTREE,
+    "get_instance": lambda t: {"instance_id": _first_instance(t)},
+    "start_instance": lambda t: {"instance_id": _first_instance(t)},
+    "stop_instance": lambda t: {"instance_id": _first_instance(t)},
+    "batch_start_instances": lambda t: {**SUBTREE, "dry_run": True},
+    "batch_stop_instances": lambda t: {**SUBTREE, "dry_run": True},
+    "list_vcns": lambda t: SUBTREE,
+    "list_subnets": lambda t: SUBTREE,
+    "list_security_lists": lambda t: SUBTREE,
+    "find_security_exposure": lambda t: {**SUBTREE, "cidr": "0.0.0.0/0", "port": 22},
+    "check_security_reachability": lambda t: {
+        "vcn_id": _first_vcn(t).id,
+        "source": "0.0.0.0/0",
+        "destination": _first_vcn(t).cidr_block.replace("0.0/16", "0.10"),
+        "port": 443,
+    },
+    "analyze_cidr_space": lambda t: {**SUBTREE, "free_prefix_length": 24},
+    "list_buckets": lambda t: {"compartment_id": t.bucket_compartment, "max_items": 1_000_000},
+    "get_bucket": lambda t: {"bucket_name": "big-bucket"},
+    "list_objects": lambda t: {"bucket_name": "big-bucket", "aggregate": True},
+    "list_block_volumes": lambda t: SUBTREE,
+    "get_bucket_sizes_by_user": lambda t: {"compartment_id": t.bucket_compartment},
+    "scan_bucket_usage": lambda t: {"bucket_name": "big-bucket"},
+    "list_compartments": lambda t: {"max_items": 1_000_000},
+    "list_users": lambda t: {"max_items": 1_000_000},
+    "list_groups": lambda t: {"max_items": 1_000_000},
+    "list_policies": lambda t: {"compartment_id": TENANCY_ID},
+    "resolve_compartment": lambda t: {"compartment": t.compartments[-1].name},
+    "query_policies": lambda t: {"verb": "manage", "resource": "instances"},
+    "query_group_membership": lambda t: {"group": "Administrators"},
+    "query_inventory": lambda t: {"kind": "instance", "limit": 1000},
+    "continue_output": lambda t: {"output_token": _output_token(t)},
+}
+
+
+@pytest.fixture(scope="module")
+def tenancy():
+    return FakeTenancy.generate(SCALES[SCALE])
+
+
+@pytest.fixture(scope="module")
+def service(tenancy):
+    # Benchmark the tools, not the client-side limiter's default 10 requests/second.
+    with (
+        patch.object(settings, "rate_limit_per_second", 1000.0),
+        patch.object(settings, "rate_limit_burst", 100),
+        fake_oci(tenancy, OPTIONS) as fake,
+    ):
+        yield fake
+    _write_report(tenancy)
+
+
+@pytest.fixture(scope="module")
+def inventory_store(service):
+    store = InventoryStore(":memory:")
+    started = time.perf_counter()
+    requests = service.requests
+    summary = asyncio.run(InventoryCrawler(store, OCIAuth()).refresh())
+    _results.append({
+        "name": "refresh_inventory",
+        "cold_ms": round((time.perf_counter() - started) * 1000, 1),
+        "warm_ms": None,
+        "oci_requests": service.requests - requests,
+        "result_bytes": len(json.dumps(summary)),
+    })
+    assert not summary["errors"]
+    yield store
+    store.close()
+
+
+def _write_report(tenancy: FakeTenancy) -> None:
+    report, history = os.environ.get("OCI_BENCH_REPORT"), os.environ.get("OCI_BENCH_HISTORY")
+    if not _results or not (report or history):
+        return
+    version = tomllib.loads((ROOT / "pyproject.toml").read_text())["project"]["version"]
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "version": version,
+        "scale": SCALE,
+        "rounds": ROUNDS,
+        "latency_ms": OPTIONS.latency * 1000,
+        "throttle_every": OPTIONS.throttle_every,
+        "results": sorted(_results, key=lambda r: r["name"]),
+    }
+    lines = [
+        f"# oci-agent {version} benchmark, scale={SCALE} ({len(tenancy.compartments)} compartments, "
+        f"{len(tenancy.by_id)} resources, {len(tenancy.buckets)} buckets), rounds={ROUNDS}, "
+        f"latency={run['latency_ms']:g}ms, throttle_every={OPTIONS.throttle_every}, {run['timestamp']}",
+        f"{'benchmark':<30} {'cold_ms':>10} {'warm_ms':>10} {'oci_req':>8} {'bytes':>10}",
+    ]
+    for r in run["results"]:
+        warm = "-" if r["warm_ms"] is None else f"{r['warm_ms']:.1f}"
+        lines.append(f"{r['name']:<30} {r['cold_ms']:>10.1f} {warm:>10} {r['oci_requests']:>8} {r['result_bytes']:>10}")
+    if report:
+        Path(report).write_text("\n".join(lines) + "\n")
+    if history:
+        with open(history, "a") as f:
+            f.write(json.dumps(run) + "\n")
+
+
+def _bench(service, name: str, handler, args: dict) -> dict:
+    """Run *handler* ROUNDS times; record the first call and the median of the rest."""
+    timings, requests, result = [], [], None
+    for _ in range(ROUNDS):
+        before = service.requests
+        started = time.perf_counter()
+        result = asyncio.run(handler(args))
+        timings.append((time.perf_counter() - started) * 1000)
+        requests.append(service.requests - before)
+        assert not result.get("is_error"), result["content"][0]["text"]
+    _results.append({
+        "name": name,
+        "cold_ms": round(timings[0], 1),
+        "warm_ms": round(statistics.median(timings[1:]), 1),
+        "oci_requests": requests[0],
+        "result_bytes": sum(len(block["text"]) for block in result["content"]),
+    })
+    return result
+
+
+def test_every_tool_has_a_benchmark():
+    assert sorted(CASES) == sorted(TOOLS)
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_tool(name, tenancy, service, inventory_store):
+    with patch("src.oci_agent.tools.inventory.get_store", return_value=inventory_store):
+        _bench(service, name, TOOLS[name].handler, CASES[name](tenancy))
+
+
+def test_get_bucket_sizes_by_user_end_to_end(tenancy, service):
+    compartment_id = tenancy.bucket_compartment
+    buckets = [b.model for b in tenancy.buckets.values() if b.model.compartment_id == compartment_id]
+    throttled = service.throttled
+
+    result = _bench(
+        service,
+        "get_bucket_sizes_by_user:e2e",
+        TOOLS["get_bucket_sizes_by_user"].handler,
+        {"compartment_id": compartment_id, "max_concurrency": 16},
+    )
+
+    data = decode(result["content"][0]["text"])
+    assert data["total_buckets"] == data["fetched_buckets"] == len(buckets)
+    assert "failed_buckets" not in data
+    assert sum(u["total_bytes"] for u in data["by_user"]) == sum(b.approximate_size for b in buckets)
+    if OPTIONS.throttle_every and OPTIONS.throttle_every <= len(buckets):
+        # Throttled get_bucket calls were retried by the rate limiter rather than reported as failures.
+        assert service.throttled > throttled
+
+
+def test_listings_are_complete_across_pages(tenancy, service):
+    instances = sum(len(v) for (region, kind), by in tenancy.resources.items() if kind == "instance" for v in by.values())
+
+    result = asyncio.run(TOOLS["list_instances"].handler(SUBTREE))
+
+    meta = json.loads(result["content"][1]["text"])
+    # Larger scales exceed the output budget, so count what the fan-out returned rather than the first chunk.
+    assert meta["returned"] == instances
+    assert meta["compartments_queried"] == len(tenancy.compartments) + 1
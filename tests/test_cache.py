@@ -0,0 +1,123 @@
+"""Tests for the read-only tool response cache."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from claude_agent_sdk import SdkMcpTool
+
+from src.oci_agent.cache import ResponseCache
+
+
+def _tool(name, text="[]"):
+    handler = AsyncMock(return_value={"content": [{"type": "text", "text": text}]})
+    return SdkMcpTool(name=name, description=name, input_schema={}, handler=handler), handler
+
+
+class TestResponseCache:
+    def test_repeat_call_is_served_from_cache(self):
+        cache = ResponseCache(ttl=60, max_entries=10)
+        tool_def, handler = _tool("list_vcns", text="[1, 2, 3]")
+        wrapped = cache.wrap(tool_def)
+
+        async def go():
+            await wrapped.handler({"compartment_id": "c1"})
+            return await wrapped.handler({"compartment_id": "c1"})
+
+        result = asyncio.run(go())
+
+        assert result["content"][0]["text"] == "[1, 2, 3]"
+        assert handler.await_count == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["bytes_saved"]) == (1, 1, 9)
+
+    def test_different_args_are_different_entries(self):
+        cache = ResponseCache(ttl=60, max_entries=10)
+        tool_def, handler = _tool("list_vcns")
+        wrapped = cache.wrap(tool_def)
+
+        async def go():
+            await wrapped.handler({"compartment_id": "c1"})
+            await wrapped.handler({"compartment_id": "c2"})
+
+        asyncio.run(go())
+        assert handler.await_count == 2
+
+    def test_refresh_bypasses_and_replaces_cached_answers(self):
+        cache = ResponseCache(ttl=60, max_entries=10)
+        tool_def, handler = _tool("query_group_membership")
+        wrapped = cache.wrap(tool_def)
+
+        async def go():
+            await wrapped.handler({"group": "admins"})
+            await wrapped.handler({"group": "ops"})
+            await wrapped.handler({"group": "admins", "refresh": True})
+            await wrapped.handler({"group": "admins", "refresh": True})
+            await wrapped.handler({"group": "admins"})
+            await wrapped.handler({"group": "ops"})
+
+        asyncio.run(go())
+
+        # Both refreshes reach the handler; the plain admins call gets the refreshed answer,
+        # and the ops answer cached before the refresh is dropped.
+        assert handler.await_count == 5
+        assert [c.args[0] for c in handler.await_args_list][-1] == {"group": "ops"}
+        assert cache.stats()["tools"]["query_group_membership"]["hits"] == 1
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(ttl=0, max_entries=10)
+        tool_def, handler = _tool("list_vcns")
+        wrapped = cache.wrap(tool_def)
+
+        async def go():
+            await wrapped.handler({})
+            await wrapped.handler({})
+
+        asyncio.run(go())
+        assert handler.await_count == 2
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(ttl=60, max_entries=2)
+        tool_def, handler = _tool("list_vcns")
+        wrapped = cache.wrap(tool_def)
+
+        async def go():
+            for c in ("a", "b", "a", "c", "a", "b"):
+                await wrapped.handler({"compartment_id": c})
+
+        asyncio.run(go())
+        # a, b miss; a hits; c evicts b; a hits; b misses again
+        assert handler.await_count == 4
+
+    def test_errors_are_not_cached(self):
+        cache = ResponseCache(ttl=60, max_entries=10)
+        tool_def, handler = _tool("list_vcns")
+        handler.return_value = {"content": [{"type": "text", "text": "boom"}], "is_error": True}
+        wrapped = cache.wrap(tool_def)
+
+        async def go():
+            await wrapped.handler({})
+            await wrapped.handler({})
+
+        asyncio.run(go())
+        assert handler.await_count == 2
+
+    def test_state_changing_tool_invalidates_affected_tools(self):
+        cache = ResponseCache(ttl=60, max_entries=10)
+        instances, list_handler = _tool("list_instances")
+        vcns, vcn_handler = _tool("list_vcns")
+        stop, stop_handler = _tool("stop_instance", text="SOFTSTOP sent")
+        tools = cache.wrap_tools([instances, vcns, stop], state_changing={"stop_instance"})
+
+        async def go():
+            await tools[0].handler({"compartment_id": "c"})
+            await tools[1].handler({"compartment_id": "c"})
+            await tools[2].handler({"instance_id": "i"})
+            await tools[2].handler({"instance_id": "i"})
+            await tools[0].handler({"compartment_id": "c"})
+            await tools[1].handler({"compartment_id": "c"})
+
+        asyncio.run(go())
+
+        assert stop_handler.await_count == 2
+        assert list_handler.await_count == 2
+        assert vcn_handler.await_count == 1
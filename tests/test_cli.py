@@ -0,0 +1,73 @@
+"""Tests for the command-line entry point's option handling."""
+
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from main import main
+from src.oci_agent import executor
+from src.oci_agent.auth import OCIAuth
+from src.oci_agent.config import settings
+
+
+class FakeAgent:
+    """Records what settings looked like when the CLI built the agent."""
+
+    seen: dict = {}
+
+    def __init__(self, profile=None, stats=False, metrics_file=None):
+        FakeAgent.seen = {
+            "settings_profile": settings.oci_profile,
+            "auth_profile": OCIAuth().profile,
+            "workers": executor.max_workers(),
+        }
+
+    async def run(self, user_query):
+        return ""
+
+    def report(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def restore_overrides(monkeypatch):
+    # main() writes --profile/--workers into the environment and the shared settings.
+    monkeypatch.setattr(settings, "oci_profile", settings.oci_profile)
+    monkeypatch.setattr(settings, "oci_max_workers", settings.oci_max_workers)
+    monkeypatch.delenv("OCI_PROFILE", raising=False)
+    monkeypatch.delenv("OCI_MAX_WORKERS", raising=False)
+    FakeAgent.seen = {}
+
+
+def test_connect_fallback_honours_profile_and_workers(tmp_path):
+    with patch("src.oci_agent.agent.OCIAgent", FakeAgent):
+        result = CliRunner().invoke(
+            main,
+            ["--connect", "--socket", str(tmp_path / "none.sock"), "--profile", "OTHER", "--workers", "3", "-q", "hi"],
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "running in-process" in result.output
+    assert FakeAgent.seen == {"settings_profile": "OTHER", "auth_profile": "OTHER", "workers": 3}
+
+
+def test_batch_honours_profile_and_workers(tmp_path):
+    queries = tmp_path / "q.jsonl"
+    queries.write_text('"List VCNs"\n')
+    ran = []
+
+    class FakeRunner:
+        def __init__(self, agent, concurrency):
+            pass
+
+        async def run(self, items):
+            ran.extend(items)
+            return [{"is_error": False}]
+
+    with patch("src.oci_agent.agent.OCIAgent", FakeAgent), patch("src.oci_agent.batch.BatchRunner", FakeRunner):
+        result = CliRunner().invoke(main, ["--batch", str(queries), "--profile", "OTHER", "--workers", "3"])
+
+    assert result.exit_code == 0, result.output
+    assert [q.query for q in ran] == ["List VCNs"]
+    assert FakeAgent.seen == {"settings_profile": "OTHER", "auth_profile": "OTHER", "workers": 3}
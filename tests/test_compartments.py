@@ -0,0 +1,234 @@
+"""Tests for the compartment hierarchy index and subtree fan-out."""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.compartments import CompartmentTree
+from src.oci_agent.output import decode
+
+TENANCY = "ocid1.tenancy.oc1..t"
+
+
+def _c(ocid, name, parent, state="ACTIVE"):
+    return {"id": ocid, "name": name, "compartment_id": parent, "lifecycle_state": state}
+
+
+COMPARTMENTS = [
+    _c("ocid1.compartment.oc1..prod", "prod", TENANCY),
+    _c("ocid1.compartment.oc1..prodapp", "app", "ocid1.compartment.oc1..prod"),
+    _c("ocid1.compartment.oc1..dev", "dev", TENANCY),
+    _c("ocid1.compartment.oc1..devapp", "app", "ocid1.compartment.oc1..dev"),
+    _c("ocid1.compartment.oc1..old", "old", "ocid1.compartment.oc1..dev", state="DELETED"),
+]
+
+
+class TestCompartmentTree:
+    def setup_method(self):
+        self.tree = CompartmentTree(TENANCY, COMPARTMENTS)
+
+    def test_parent_and_children(self):
+        assert self.tree.parent("ocid1.compartment.oc1..prodapp") == "ocid1.compartment.oc1..prod"
+        assert set(self.tree.children(TENANCY)) == {"ocid1.compartment.oc1..prod", "ocid1.compartment.oc1..dev"}
+
+    def test_subtree_skips_inactive(self):
+        assert self.tree.subtree("ocid1.compartment.oc1..dev") == [
+            "ocid1.compartment.oc1..dev",
+            "ocid1.compartment.oc1..devapp",
+        ]
+        assert len(self.tree.subtree(TENANCY)) == 5
+
+    def test_resolve_by_name_and_path(self):
+        assert self.tree.resolve("prod") == "ocid1.compartment.oc1..prod"
+        assert self.tree.resolve("dev/app") == "ocid1.compartment.oc1..devapp"
+        assert self.tree.resolve("ocid1.compartment.oc1..x") == "ocid1.compartment.oc1..x"
+        assert self.tree.path("ocid1.compartment.oc1..prodapp") == "prod/app"
+
+    def test_resolve_ambiguous_or_unknown(self):
+        with pytest.raises(ValueError, match="ambiguous"):
+            self.tree.resolve("app")
+        with pytest.raises(ValueError, match="Unknown"):
+            self.tree.resolve("nope")
+
+
+def _page(items):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = False
+    return response
+
+
+def _sdk_compartment(c):
+    m = MagicMock()
+    m.id, m.name, m.compartment_id, m.lifecycle_state = c["id"], c["name"], c["compartment_id"], c["lifecycle_state"]
+    m.description = ""
+    m.time_created = "2024-01-01T00:00:00Z"
+    return m
+
+
+def _vcn(ocid):
+    v = MagicMock()
+    v.id = ocid
+    v.display_name = ocid
+    v.cidr_block = "10.0.0.0/16"
+    v.lifecycle_state = "AVAILABLE"
+    v.dns_label = "vcn"
+    v.time_created = "2024-01-01T00:00:00Z"
+    return v
+
+
+class TestSubtreeFanOut:
+    def _run(self, args, list_vcns):
+        mock_client = MagicMock()
+        mock_client.list_vcns.side_effect = list_vcns
+        with patch("src.oci_agent.tools.network.OCIAuth") as MockAuth:
+            auth = MockAuth.return_value
+            auth.profile = f"TEST-{uuid.uuid4()}"
+            auth.get_config.return_value = {"tenancy": TENANCY}
+            auth.virtual_network_client.return_value = mock_client
+            auth.identity_client.return_value.list_compartments.return_value = _page(
+                [_sdk_compartment(c) for c in COMPARTMENTS]
+            )
+
+            from src.oci_agent.tools.network import list_vcns as list_vcns_tool
+
+            result = asyncio.run(list_vcns_tool.handler(args))
+        return result
+
+    def test_lists_every_compartment_in_subtree_concurrently(self):
+        in_flight = peak = 0
+        lock = threading.Lock()
+
+        def list_vcns(compartment_id, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return _page([_vcn(f"vcn-in-{compartment_id}")])
+
+        result = self._run({"compartment_id": "dev", "include_subtree": True}, list_vcns)
+
+        rows = decode(result["content"][0]["text"])
+        meta = json.loads(result["content"][1]["text"])
+        assert {r["compartment_id"] for r in rows} == {"ocid1.compartment.oc1..dev", "ocid1.compartment.oc1..devapp"}
+        assert meta["compartments_queried"] == 2
+        assert meta["subtree_root"] == "ocid1.compartment.oc1..dev"
+
+        result = self._run({"compartment_id": TENANCY, "include_subtree": True}, list_vcns)
+        assert len(decode(result["content"][0]["text"])) == 5
+        assert peak > 1
+
+    def test_reports_per_compartment_errors(self):
+        def list_vcns(compartment_id, **kwargs):
+            if compartment_id == "ocid1.compartment.oc1..devapp":
+                raise RuntimeError("NotAuthorizedOrNotFound")
+            return _page([_vcn(f"vcn-in-{compartment_id}")])
+
+        result = self._run({"compartment_id": "dev", "include_subtree": True}, list_vcns)
+
+        meta = json.loads(result["content"][1]["text"])
+        assert meta["errors"] == [{"compartment_id": "ocid1.compartment.oc1..devapp", "error": "NotAuthorizedOrNotFound"}]
+
+    def test_shared_max_items_cap(self):
+        def list_vcns(compartment_id, **kwargs):
+            return _page([_vcn(f"{compartment_id}-{i}") for i in range(3)])
+
+        result = self._run({"compartment_id": TENANCY, "include_subtree": True, "max_items": 4}, list_vcns)
+
+        assert len(decode(result["content"][0]["text"])) == 4
+        assert json.loads(result["content"][1]["text"])["truncated"] is True
+
+
+class TestMultiRegionFanOut:
+    REGIONS = ["us-ashburn-1", "eu-frankfurt-1"]
+
+    def _run(self, args, list_vcns_for):
+        with patch("src.oci_agent.tools.network.OCIAuth") as MockAuth:
+            auth = MockAuth.return_value
+            auth.profile = f"TEST-{uuid.uuid4()}"
+            auth.get_config.return_value = {"tenancy": TENANCY}
+            auth.identity_client.return_value.list_compartments.return_value = _page(
+                [_sdk_compartment(c) for c in COMPARTMENTS]
+            )
+            subs = []
+            for name in self.REGIONS:
+                s = MagicMock()
+                s.region_name, s.is_home_region, s.status = name, name == "us-ashburn-1", "READY"
+                subs.append(s)
+            auth.identity_client.return_value.list_region_subscriptions.return_value.data = subs
+
+            def for_region(region):
+                regional = MagicMock()
+                regional.virtual_network_client.return_value.list_vcns.side_effect = list_vcns_for(region)
+                return regional
+
+            auth.for_region.side_effect = for_region
+
+            from src.oci_agent.tools.network import list_vcns as list_vcns_tool
+
+            return asyncio.run(list_vcns_tool.handler(args))
+
+    def test_all_regions_tags_rows_with_region(self):
+        def list_vcns_for(region):
+            return lambda compartment_id, **kwargs: _page([_vcn(f"{region}-{compartment_id}")])
+
+        result = self._run({"compartment_id": "ocid1.compartment.oc1..prod", "regions": ["all"]}, list_vcns_for)
+
+        rows = decode(result["content"][0]["text"])
+        meta = json.loads(result["content"][1]["text"])
+        assert sorted(r["region"] for r in rows) == sorted(self.REGIONS)
+        assert all(r["id"].startswith(r["region"]) for r in rows)
+        assert meta["regions_queried"] == self.REGIONS
+
+    def test_regions_share_one_time_budget(self):
+        def list_vcns_for(region):
+            def list_vcns(compartment_id, **kwargs):
+                if region == "eu-frankfurt-1":
+                    time.sleep(1.0)
+                return _page([_vcn(f"{region}-{compartment_id}")])
+            return list_vcns
+
+        started = time.monotonic()
+        result = self._run(
+            {"compartment_id": "ocid1.compartment.oc1..prod", "regions": self.REGIONS, "time_budget_seconds": 0.3},
+            list_vcns_for,
+        )
+
+        assert time.monotonic() - started < 0.9
+        rows = decode(result["content"][0]["text"])
+        meta = json.loads(result["content"][1]["text"])
+        assert [r["region"] for r in rows] == ["us-ashburn-1"]
+        assert meta["timed_out"] == [{"compartment_id": "ocid1.compartment.oc1..prod", "region": "eu-frankfurt-1"}]
+
+
+class TestResolveCompartmentTool:
+    def test_repeat_refresh_rebuilds_the_tree_through_the_response_cache(self):
+        from src.oci_agent.cache import ResponseCache
+        from src.oci_agent.tools.identity import resolve_compartment
+
+        refreshes = []
+
+        async def get(auth, refresh=False):
+            refreshes.append(refresh)
+            return CompartmentTree(TENANCY, COMPARTMENTS)
+
+        tool = ResponseCache(ttl=60, max_entries=10).wrap(resolve_compartment)
+        with (
+            patch("src.oci_agent.tools.identity.OCIAuth"),
+            patch("src.oci_agent.tools.identity.compartment_index") as index,
+        ):
+            index.get.side_effect = get
+            for args in ({"compartment": "dev/app"}, {"compartment": "dev/app", "refresh": True},
+                         {"compartment": "dev/app", "refresh": True}, {"compartment": "dev/app"}):
+                result = asyncio.run(tool.handler(args))
+
+        assert refreshes == [False, True, True]
+        assert json.loads(result["content"][0]["text"])["path"] == "dev/app"
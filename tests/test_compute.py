@@ -5,6 +5,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.oci_agent.output import decode
+
 
 def _make_mock_instance(
     ocid="ocid1.instance.oc1..aaa",
@@ -32,6 +34,7 @@ class TestListInstances:
         mock_instance = _make_mock_instance()
         mock_response = MagicMock()
         mock_response.data = [mock_instance]
+        mock_response.has_next_page = False
 
         mock_client = MagicMock()
         mock_client.list_instances.return_value = mock_response
@@ -47,8 +50,7 @@ class TestListInstances:
 
         assert "content" in result
         assert len(result["content"]) == 1
-        import json
-        data = json.loads(result["content"][0]["text"])
+        data = decode(result["content"][0]["text"])
         assert isinstance(data, list)
         assert data[0]["id"] == "ocid1.instance.oc1..aaa"
         assert data[0]["lifecycle_state"] == "RUNNING"
@@ -57,6 +59,7 @@ class TestListInstances:
     def test_respects_limit(self):
         mock_response = MagicMock()
         mock_response.data = []
+        mock_response.has_next_page = False
 
         mock_client = MagicMock()
         mock_client.list_instances.return_value = mock_response
@@ -92,8 +95,7 @@ class TestGetInstance:
 
             result = asyncio.run(get_instance.handler({"instance_id": "ocid1.instance.oc1..bbb"}))
 
-        import json
-        data = json.loads(result["content"][0]["text"])
+        data = decode(result["content"][0]["text"])
         assert data["id"] == "ocid1.instance.oc1..bbb"
         assert data["display_name"] == "my-vm"
 
@@ -138,3 +140,112 @@ class TestStartStopInstance:
             instance_id="ocid1.instance.oc1..aaa", action="SOFTSTOP"
         )
         assert "SOFTSTOP" in result["content"][0]["text"]
+
+
+class TestBatchInstanceActions:
+    def _state_response(self, state):
+        response = MagicMock()
+        response.data = _make_mock_instance(lifecycle_state=state)
+        return response
+
+    def test_stop_many_concurrently_and_wait(self):
+        import threading
+        import time
+
+        in_flight = peak = 0
+        lock = threading.Lock()
+        polls: dict[str, int] = {}
+
+        def instance_action(instance_id, action):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return self._state_response("STOPPING")
+
+        def get_instance(instance_id):
+            polls[instance_id] = polls.get(instance_id, 0) + 1
+            return self._state_response("STOPPED" if polls[instance_id] >= 2 else "STOPPING")
+
+        mock_client = MagicMock()
+        mock_client.instance_action.side_effect = instance_action
+        mock_client.get_instance.side_effect = get_instance
+        ids = [f"ocid1.instance.oc1..{i}" for i in range(12)]
+
+        with patch("src.oci_agent.tools.compute.OCIAuth") as MockAuth, \
+                patch("src.oci_agent.tools.compute.POLL_BASE_SECONDS", 0.001):
+            MockAuth.return_value.compute_client.return_value = mock_client
+
+            from src.oci_agent.tools.compute import batch_stop_instances
+
+            result = asyncio.run(
+                batch_stop_instances.handler(
+                    {"instance_ids": ids + ids[:2], "wait_for_state": True, "max_concurrency": 4}
+                )
+            )
+
+        data = decode(result["content"][0]["text"])
+        assert data["requested"] == 12
+        assert data["reached_target_state"] == 12
+        assert data["timed_out"] == 0
+        assert 1 < peak <= 4
+        assert {r["id"] for r in data["instances"]} == set(ids)
+        assert all(r["lifecycle_state"] == "STOPPED" and "total_seconds" in r for r in data["instances"])
+        assert {c.kwargs["action"] for c in mock_client.instance_action.call_args_list} == {"SOFTSTOP"}
+
+    def test_filter_selection_defaults_to_source_state_and_dry_run(self):
+        listing = MagicMock()
+        listing.data = [_make_mock_instance(ocid="ocid1.instance.oc1..dev1", display_name="dev-1",
+                                            lifecycle_state="STOPPED")]
+        listing.has_next_page = False
+        mock_client = MagicMock()
+        mock_client.list_instances.return_value = listing
+
+        with patch("src.oci_agent.tools.compute.OCIAuth") as MockAuth:
+            MockAuth.return_value.compute_client.return_value = mock_client
+
+            from src.oci_agent.tools.compute import batch_start_instances
+
+            result = asyncio.run(
+                batch_start_instances.handler(
+                    {"compartment_id": "ocid1.compartment.oc1..xxx", "name_prefix": "dev", "dry_run": True}
+                )
+            )
+
+        assert mock_client.list_instances.call_args.kwargs["lifecycle_state"] == "STOPPED"
+        mock_client.instance_action.assert_not_called()
+        data = decode(result["content"][0]["text"])
+        assert data["count"] == 1
+        assert data["instances"][0]["id"] == "ocid1.instance.oc1..dev1"
+
+    def test_per_instance_errors_are_reported(self):
+        def instance_action(instance_id, action):
+            if instance_id.endswith("bad"):
+                raise RuntimeError("IncorrectState")
+            return self._state_response("STARTING")
+
+        mock_client = MagicMock()
+        mock_client.instance_action.side_effect = instance_action
+
+        with patch("src.oci_agent.tools.compute.OCIAuth") as MockAuth:
+            MockAuth.return_value.compute_client.return_value = mock_client
+
+            from src.oci_agent.tools.compute import batch_start_instances
+
+            result = asyncio.run(
+                batch_start_instances.handler({"instance_ids": ["ocid1.instance.oc1..ok", "ocid1.instance.oc1..bad"]})
+            )
+
+        data = decode(result["content"][0]["text"])
+        assert data["accepted"] == 1 and data["failed"] == 1
+        assert data["instances"][1]["error"] == "IncorrectState"
+
+    def test_requires_ids_or_compartment(self):
+        from src.oci_agent.tools.compute import batch_stop_instances
+
+        result = asyncio.run(batch_stop_instances.handler({}))
+
+        assert result["is_error"] is True
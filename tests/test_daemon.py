@@ -0,0 +1,201 @@
+"""Tests for the agent daemon and its thin client."""
+
+import asyncio
+import io
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from src.oci_agent.daemon import AgentDaemon, request, run_query
+from src.oci_agent.metrics import _CallRecord, tool_metrics
+
+
+class FakeSession:
+    def __init__(self, n):
+        self.n = n
+        self.disconnected = False
+        self.interrupted = asyncio.Event()
+
+    async def disconnect(self):
+        self.disconnected = True
+
+    async def interrupt(self):
+        self.interrupted.set()
+
+
+class FakeAgent:
+    """Stands in for OCIAgent: sessions are numbered, replies echo the query."""
+
+    profile = "DEFAULT"
+    model = "test-model"
+    metrics_file = None
+
+    def __init__(self):
+        self.sessions = []
+
+    async def connect(self):
+        session = FakeSession(len(self.sessions))
+        self.sessions.append(session)
+        return session
+
+    async def ask(self, client, query, on_text):
+        if query == "hang":
+            await client.interrupted.wait()
+            return SimpleNamespace(is_error=True, result="interrupted", duration_ms=1, duration_api_ms=0,
+                                   num_turns=1, total_cost_usd=0.0)
+        if query == "tool":
+            tool_metrics.observe("list_vcns", 0.01, _CallRecord(oci_requests=1), {"content": []})
+        on_text(f"session {client.n}: ")
+        on_text(query.upper())
+        return SimpleNamespace(is_error=False, result="ok", duration_ms=12, duration_api_ms=10,
+                               num_turns=2, total_cost_usd=0.01)
+
+
+def _serve(tmp_path, test):
+    """Run *test(daemon, path)* in a thread while the daemon serves on the event loop."""
+    path = str(tmp_path / "agent.sock")
+    agent = FakeAgent()
+    daemon = AgentDaemon(agent, path, workers=2)
+
+    async def main():
+        server = asyncio.ensure_future(daemon.serve())
+        while not (tmp_path / "agent.sock").exists():
+            await asyncio.sleep(0.01)
+        try:
+            return await asyncio.to_thread(test, daemon, path)
+        finally:
+            await asyncio.to_thread(lambda: list(request({"op": "shutdown"}, path)))
+            await asyncio.wait_for(server, 5)
+
+    return asyncio.run(main()), agent
+
+
+class TestAgentDaemon:
+    def test_each_query_gets_a_fresh_warm_session(self, tmp_path):
+        def test(daemon, path):
+            return [list(request({"op": "query", "query": q}, path)) for q in ("one", "two")]
+
+        (first, second), agent = _serve(tmp_path, test)
+
+        assert [e["text"] for e in first if e["event"] == "text"][1] == "ONE"
+        done = first[-1]
+        assert done["event"] == "done" and not done["is_error"]
+        assert done["total_cost_usd"] == 0.01 and done["num_turns"] == 2
+        # The second query ran in a different conversation, and used sessions were replaced.
+        assert first[0]["text"] != second[0]["text"]
+        assert len(agent.sessions) > 2
+        assert all(s.disconnected for s in agent.sessions)
+        assert not (tmp_path / "agent.sock").exists()
+
+    def test_concurrent_queries(self, tmp_path):
+        def test(daemon, path):
+            with ThreadPoolExecutor(4) as pool:
+                return list(pool.map(lambda q: list(request({"query": q}, path)), ["a", "b", "c", "d"]))
+
+        replies, _ = _serve(tmp_path, test)
+
+        assert ["".join(e.get("text", "") for e in r).split(": ")[1] for r in replies] == ["A", "B", "C", "D"]
+
+    def test_status_and_profile_mismatch(self, tmp_path):
+        def test(daemon, path):
+            status = list(request({"op": "status"}, path))[0]
+            wrong = list(request({"query": "x", "profile": "OTHER"}, path))[0]
+            return status, wrong
+
+        (status, wrong), _ = _serve(tmp_path, test)
+
+        assert status["profile"] == "DEFAULT" and status["workers"] == 2
+        assert wrong["is_error"] and "OTHER" in wrong["error"]
+
+    def test_disconnect_interrupts_the_query(self, tmp_path):
+        def test(daemon, path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+                sock.sendall(b'{"query": "hang"}\n')
+                while not daemon.queries:
+                    time.sleep(0.01)
+            for _ in range(500):
+                if any(s.interrupted.is_set() for s in daemon.agent.sessions):
+                    return True
+                time.sleep(0.01)
+            return False
+
+        interrupted, _ = _serve(tmp_path, test)
+
+        assert interrupted
+
+    def test_refuses_to_start_twice_and_replaces_stale_socket(self, tmp_path):
+        def test(daemon, path):
+            with pytest.raises(RuntimeError, match="already listening"):
+                AgentDaemon(FakeAgent(), path)._claim_path()
+
+        _serve(tmp_path, test)
+
+        stale = tmp_path / "agent.sock"
+        stale.write_text("")
+        AgentDaemon(FakeAgent(), str(stale))._claim_path()
+        assert not stale.exists()
+
+
+    def test_socket_and_new_directory_are_private(self, tmp_path):
+        path = tmp_path / "run" / "agent.sock"
+        daemon = AgentDaemon(FakeAgent(), str(path), workers=1)
+        umask = os.umask(0o002)
+        modes = {}
+
+        async def main():
+            server = asyncio.ensure_future(daemon.serve())
+            while not path.exists():
+                await asyncio.sleep(0.01)
+            modes.update(socket=path.stat().st_mode & 0o777, directory=path.parent.stat().st_mode & 0o777)
+            await asyncio.to_thread(lambda: list(request({"op": "shutdown"}, str(path))))
+            await asyncio.wait_for(server, 5)
+
+        try:
+            asyncio.run(main())
+            restored = os.umask(umask)
+        finally:
+            os.umask(umask)
+
+        assert modes == {"socket": 0o600, "directory": 0o700}
+        assert restored == 0o002
+
+
+class TestRunQuery:
+    def test_streams_reply_and_reports_errors(self, tmp_path):
+        def test(daemon, path):
+            out, err = io.StringIO(), io.StringIO()
+            ok = run_query("hello", path, stats=True, out=out, err=err)
+            bad = run_query("hello", path, profile="OTHER", out=io.StringIO(), err=io.StringIO())
+            return ok, bad, out.getvalue(), err.getvalue()
+
+        (ok, bad, out, err), _ = _serve(tmp_path, test)
+
+        assert ok and not bad
+        assert out.endswith("HELLO\n")
+        assert "[stats]" in err
+
+    def test_stats_cover_only_this_query(self, tmp_path):
+        def test(daemon, path):
+            run_query("tool", path, stats=True, out=io.StringIO(), err=io.StringIO())
+            err = io.StringIO()
+            run_query("tool", path, stats=True, out=io.StringIO(), err=err)
+            return err.getvalue()
+
+        tool_metrics.clear()
+        try:
+            err, _ = _serve(tmp_path, test)
+        finally:
+            tool_metrics.clear()
+
+        row = next(line for line in err.splitlines() if "list_vcns" in line)
+        assert row.split()[2] == "1"  # calls: this query's one, not the daemon's two
+        assert "cost=$0.0100" in err and "turns=2" in err
+
+    def test_no_daemon(self, tmp_path):
+        with pytest.raises(OSError):
+            run_query("hello", str(tmp_path / "missing.sock"))
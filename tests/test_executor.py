@@ -0,0 +1,59 @@
+"""Tests for the blocking-call execution layer."""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from src.oci_agent import executor
+
+
+class TestRunBlocking:
+    def test_runs_off_event_loop_thread(self):
+        async def go():
+            return await executor.run_blocking(threading.get_ident)
+
+        assert asyncio.run(go()) != threading.get_ident()
+
+    def test_concurrent_calls_overlap(self):
+        async def go():
+            start = time.perf_counter()
+            await asyncio.gather(*(executor.run_blocking(time.sleep, 0.2) for _ in range(4)))
+            return time.perf_counter() - start
+
+        original = executor._max_workers
+        executor.configure(4)
+        try:
+            assert asyncio.run(go()) < 0.6
+        finally:
+            executor.configure(original)
+
+    def test_configure_rejects_empty_pool(self):
+        with pytest.raises(ValueError):
+            executor.configure(0)
+
+    def test_event_loop_stays_responsive(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        async def go():
+            await asyncio.gather(executor.run_blocking(time.sleep, 0.2), ticker())
+
+        asyncio.run(go())
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.2
+
+    def test_propagates_context_vars(self):
+        var = contextvars.ContextVar("var", default="unset")
+
+        async def go():
+            var.set("caller")
+            return await executor.run_blocking(var.get)
+
+        assert asyncio.run(go()) == "caller"
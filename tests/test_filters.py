@@ -0,0 +1,117 @@
+"""Tests for list-tool filtering and projection."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.filters import RecordFilter
+from src.oci_agent.output import decode
+from src.oci_agent.pagination import Pager
+
+
+def _record(name, state="RUNNING", created="2024-06-01T00:00:00+00:00"):
+    r = MagicMock()
+    r.id = f"ocid1.instance.oc1..{name}"
+    r.display_name = name
+    r.lifecycle_state = state
+    r.time_created = datetime.fromisoformat(created)
+    r.shape = "VM.Standard.E4.Flex"
+    r.compartment_id = "ocid1.compartment.oc1..xxx"
+    r.region = "us-ashburn-1"
+    r.availability_domain = "AD-1"
+    return r
+
+
+def _page(items, next_page=None):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = next_page is not None
+    response.next_page = next_page
+    return response
+
+
+class TestRecordFilter:
+    def test_name_prefix_regex_and_time_range(self):
+        f = RecordFilter(name_prefix="WEB", name_regex=r"-\d+$", time_created_after="2024-01-01")
+
+        assert f(_record("web-01"))
+        assert not f(_record("web-primary"))
+        assert not f(_record("db-01"))
+        assert not f(_record("web-02", created="2023-12-31T23:59:59+00:00"))
+
+    def test_time_created_before_is_exclusive_and_naive_means_utc(self):
+        f = RecordFilter(time_created_before="2024-06-01T00:00:00")
+
+        assert f.before == datetime(2024, 6, 1, tzinfo=timezone.utc)
+        assert not f(_record("a"))
+        assert f(_record("b", created="2024-05-31T23:00:00+00:00"))
+
+    def test_lifecycle_state_pushdown_skips_local_check(self):
+        f = RecordFilter(lifecycle_state="running")
+
+        assert f.pushdown({"lifecycle_state"}) == {"lifecycle_state": "RUNNING"}
+        assert not f.active
+
+        local = RecordFilter(lifecycle_state="running")
+        assert local.pushdown(()) == {}
+        assert local.active
+        assert not local(_record("x", state="STOPPED"))
+
+    def test_invalid_regex(self):
+        with pytest.raises(ValueError, match="name_regex"):
+            RecordFilter(name_regex="(")
+
+    def test_projection(self):
+        project = RecordFilter(fields=["id", "missing"]).project(lambda r: {"id": 1, "name": "x"})
+
+        assert project(object()) == {"id": 1}
+
+
+class TestPagerFiltering:
+    def test_filtered_records_do_not_count_towards_max_items(self):
+        pages = [
+            _page([_record("db-1"), _record("web-1"), _record("db-2")], next_page="p2"),
+            # Second request asks for limit=1, so OCI returns one record.
+            _page([_record("web-2")], next_page="p3"),
+            _page([_record("web-3")]),
+        ]
+        call = MagicMock(side_effect=pages)
+        pager = Pager.from_args(call, {"name_prefix": "web", "max_items": 2})
+
+        rows = asyncio.run(pager.collect(lambda r: r.display_name))
+
+        assert rows == ["web-1", "web-2"]
+        assert pager.scanned == 4
+        assert call.call_count == 2
+        # The cap is reached on a page boundary, so the resume token skips nothing.
+        assert pager.next_page == "p3"
+        assert call.call_args_list[1].kwargs["limit"] == 1
+
+
+class TestListInstancesFilters:
+    def test_pushes_lifecycle_state_and_projects_fields(self):
+        mock_client = MagicMock()
+        mock_client.list_instances.return_value = _page([_record("web-1"), _record("db-1")])
+
+        with patch("src.oci_agent.tools.compute.OCIAuth") as MockAuth:
+            MockAuth.return_value.compute_client.return_value = mock_client
+
+            from src.oci_agent.tools.compute import list_instances
+
+            result = asyncio.run(
+                list_instances.handler(
+                    {
+                        "compartment_id": "ocid1.compartment.oc1..xxx",
+                        "lifecycle_state": "running",
+                        "name_regex": "^web",
+                        "fields": ["id", "display_name"],
+                    }
+                )
+            )
+
+        assert mock_client.list_instances.call_args.kwargs["lifecycle_state"] == "RUNNING"
+        assert decode(result["content"][0]["text"]) == [
+            {"id": "ocid1.instance.oc1..web-1", "display_name": "web-1"}
+        ]
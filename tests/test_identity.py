@@ -1,9 +1,10 @@
 """Tests for identity/IAM tools."""
 
 import asyncio
-import json
 from unittest.mock import MagicMock, patch
 
+from src.oci_agent.output import decode
+
 
 def _make_mock_compartment(
     ocid="ocid1.compartment.oc1..aaa",
@@ -27,6 +28,7 @@ class TestListCompartments:
         mock_compartment = _make_mock_compartment()
         mock_response = MagicMock()
         mock_response.data = [mock_compartment]
+        mock_response.has_next_page = False
 
         mock_client = MagicMock()
         mock_client.list_compartments.return_value = mock_response
@@ -41,7 +43,7 @@ class TestListCompartments:
             )
 
         assert "content" in result
-        data = json.loads(result["content"][0]["text"])
+        data = decode(result["content"][0]["text"])
         assert isinstance(data, list)
         assert data[0]["id"] == "ocid1.compartment.oc1..aaa"
         assert data[0]["name"] == "MyCompartment"
@@ -50,6 +52,7 @@ class TestListCompartments:
     def test_calls_with_subtree(self):
         mock_response = MagicMock()
         mock_response.data = []
+        mock_response.has_next_page = False
 
         mock_client = MagicMock()
         mock_client.list_compartments.return_value = mock_response
@@ -65,6 +68,7 @@ class TestListCompartments:
             compartment_id="ocid1.tenancy.oc1..xxx",
             compartment_id_in_subtree=True,
             access_level="ACCESSIBLE",
+            limit=1000,
         )
 
 
@@ -81,6 +85,7 @@ class TestListUsers:
 
         mock_response = MagicMock()
         mock_response.data = [mock_user]
+        mock_response.has_next_page = False
 
         mock_client = MagicMock()
         mock_client.list_users.return_value = mock_response
@@ -92,7 +97,7 @@ class TestListUsers:
 
             result = asyncio.run(list_users.handler({"tenancy_id": "ocid1.tenancy.oc1..xxx"}))
 
-        data = json.loads(result["content"][0]["text"])
+        data = decode(result["content"][0]["text"])
         assert data[0]["name"] == "jdoe@example.com"
         assert data[0]["is_mfa_activated"] is True
 
@@ -108,6 +113,7 @@ class TestListGroups:
 
         mock_response = MagicMock()
         mock_response.data = [mock_group]
+        mock_response.has_next_page = False
 
         mock_client = MagicMock()
         mock_client.list_groups.return_value = mock_response
@@ -119,5 +125,5 @@ class TestListGroups:
 
             result = asyncio.run(list_groups.handler({"tenancy_id": "ocid1.tenancy.oc1..xxx"}))
 
-        data = json.loads(result["content"][0]["text"])
+        data = decode(result["content"][0]["text"])
         assert data[0]["name"] == "Administrators"
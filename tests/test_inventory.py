@@ -0,0 +1,157 @@
+"""Tests for the SQLite inventory snapshot and crawler."""
+
+import asyncio
+import uuid
+from unittest.mock import MagicMock, patch
+
+from src.oci_agent.inventory import InventoryCrawler, InventoryStore
+from src.oci_agent.output import decode
+
+
+def _page(items):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = False
+    return response
+
+
+def _instance(ocid, state="RUNNING", created="2024-01-01T00:00:00Z"):
+    inst = MagicMock()
+    inst.id = ocid
+    inst.display_name = ocid.split(".")[-1]
+    inst.lifecycle_state = state
+    inst.shape = "VM.Standard.E4.Flex"
+    inst.compartment_id = "ocid1.compartment.oc1..c1"
+    inst.region = "us-ashburn-1"
+    inst.availability_domain = "AD-1"
+    inst.time_created = created
+    return inst
+
+
+def _bucket_summary(name, etag):
+    b = MagicMock()
+    b.name = name
+    b.etag = etag
+    return b
+
+
+def _bucket(name, size, etag):
+    b = MagicMock()
+    b.name = name
+    b.compartment_id = "ocid1.compartment.oc1..c1"
+    b.created_by = "ocid1.user.oc1..alice"
+    b.storage_tier = "Standard"
+    b.public_access_type = "NoPublicAccess"
+    b.approximate_size = size
+    b.approximate_count = 1
+    b.etag = etag
+    b.time_created = "2024-01-01T00:00:00Z"
+    return b
+
+
+def _make_auth():
+    auth = MagicMock()
+    auth.profile = f"TEST-{uuid.uuid4()}"
+    auth.region = "us-ashburn-1"
+    auth.get_config.return_value = {"tenancy": "ocid1.tenancy.oc1..t", "region": "us-ashburn-1"}
+    compartment = MagicMock()
+    compartment.id = "ocid1.compartment.oc1..c1"
+    compartment.name = "c1"
+    compartment.description = ""
+    compartment.lifecycle_state = "ACTIVE"
+    compartment.compartment_id = "ocid1.tenancy.oc1..t"
+    compartment.time_created = "2023-01-01T00:00:00Z"
+    auth.identity_client.return_value.list_compartments.return_value = _page([compartment])
+    auth.object_storage_client.return_value.get_namespace.return_value.data = "ns"
+    return auth
+
+
+class TestInventoryStore:
+    def test_apply_tracks_changes_and_deletions(self):
+        store = InventoryStore(":memory:")
+        rows = [{"id": "a", "lifecycle_state": "RUNNING"}, {"id": "b", "lifecycle_state": "RUNNING"}]
+
+        assert store.apply("instance", "c1", "r", rows, None, 1.0) == (2, 0)
+        assert store.apply("instance", "c1", "r", rows, None, 2.0) == (0, 0)
+
+        rows = [{"id": "a", "lifecycle_state": "STOPPED"}]
+        assert store.apply("instance", "c1", "r", rows, None, 3.0) == (1, 1)
+
+        assert [r["id"] for r in store.query("instance")] == ["a"]
+        assert {r["id"] for r in store.query("instance", include_deleted=True)} == {"a", "b"}
+        assert store.query("instance", lifecycle_state="STOPPED")[0]["id"] == "a"
+        assert store.freshness("instance") == 3.0
+
+
+class TestInventoryCrawler:
+    def test_incremental_refresh(self):
+        store = InventoryStore(":memory:")
+        auth = _make_auth()
+        compute = auth.compute_client.return_value
+        storage = auth.object_storage_client.return_value
+
+        def list_instances(compartment_id, **kwargs):
+            if compartment_id != "ocid1.compartment.oc1..c1":
+                return _page([])
+            return _page(instance_pages.pop(0))
+
+        def list_buckets(compartment_id, **kwargs):
+            if compartment_id != "ocid1.compartment.oc1..c1":
+                return _page([])
+            return _page(bucket_pages.pop(0))
+
+        instance_pages = [
+            [_instance("ocid1.instance.oc1..a")],
+            [
+                _instance("ocid1.instance.oc1..a", state="STOPPED"),
+                _instance("ocid1.instance.oc1..b", created="2024-06-01T00:00:00Z"),
+            ],
+        ]
+        bucket_pages = [
+            [_bucket_summary("logs", "e1"), _bucket_summary("data", "e1")],
+            [_bucket_summary("logs", "e1"), _bucket_summary("data", "e2")],
+        ]
+        compute.list_instances.side_effect = list_instances
+        storage.list_buckets.side_effect = list_buckets
+        sizes = {"logs": 10, "data": 10}
+        etags = {"logs": "e1", "data": "e1"}
+        storage.get_bucket.side_effect = lambda **kw: MagicMock(
+            data=_bucket(kw["bucket_name"], sizes[kw["bucket_name"]], etags[kw["bucket_name"]])
+        )
+
+        crawler = InventoryCrawler(store, auth=auth)
+        first = asyncio.run(crawler.refresh(kinds=["instance", "bucket"]))
+        sizes["data"], etags["data"] = 99, "e2"
+        second = asyncio.run(crawler.refresh(kinds=["instance", "bucket"]))
+
+        assert first["detail_calls"] == 2
+        assert second["detail_calls"] == 1
+        assert second["changed"]["instance"] == 2
+        assert second["new_since_last_refresh"]["instance"] == 1
+        sizes = {r["name"]: r["approximate_size_bytes"] for r in store.query("bucket")}
+        assert sizes == {"logs": 10, "data": 99}
+        assert store.query("instance", lifecycle_state="STOPPED")[0]["id"] == "ocid1.instance.oc1..a"
+
+
+class TestQueryInventoryTool:
+    def test_reports_freshness(self):
+        store = InventoryStore(":memory:")
+        store.apply("vcn", "c1", "r", [{"id": "v1", "display_name": "prod", "time_created": "t"}], None, 100.0)
+
+        with patch("src.oci_agent.tools.inventory.get_store", return_value=store):
+            from src.oci_agent.tools.inventory import query_inventory
+
+            result = asyncio.run(query_inventory.handler({"kind": "vcn"}))
+
+        data = decode(result["content"][0]["text"])
+        assert data["count"] == 1
+        assert data["items"][0]["id"] == "v1"
+        assert data["snapshot"]["refreshed_at"] == "1970-01-01T00:01:40Z"
+
+    def test_missing_snapshot_is_an_error(self):
+        with patch("src.oci_agent.tools.inventory.get_store", return_value=InventoryStore(":memory:")):
+            from src.oci_agent.tools.inventory import query_inventory
+
+            result = asyncio.run(query_inventory.handler({"kind": "instance"}))
+
+        assert result["is_error"] is True
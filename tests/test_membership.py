@@ -0,0 +1,157 @@
+"""Tests for the user/group membership graph."""
+
+import asyncio
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.membership import MembershipGraph, MembershipGraphCache
+from src.oci_agent.output import decode
+
+USERS = [
+    {"id": "ocid1.user.oc1..alice", "name": "alice", "email": "alice@example.com"},
+    {"id": "ocid1.user.oc1..bob", "name": "bob", "email": None},
+]
+GROUPS = [
+    {"id": "ocid1.group.oc1..admins", "name": "Administrators"},
+    {"id": "ocid1.group.oc1..ops", "name": "Ops"},
+]
+
+
+def _m(mid, user, group, created="2024-01-01 00:00:00"):
+    return {
+        "id": f"ocid1.groupmembership.oc1..{mid}",
+        "user_id": f"ocid1.user.oc1..{user}",
+        "group_id": f"ocid1.group.oc1..{group}",
+        "lifecycle_state": "ACTIVE",
+        "time_created": created,
+    }
+
+
+class TestMembershipGraph:
+    def test_lookups_by_name_email_and_id(self):
+        graph = MembershipGraph()
+        graph.sync(USERS, GROUPS, [_m(1, "alice", "admins"), _m(2, "alice", "ops"), _m(3, "bob", "ops")])
+
+        assert [u["name"] for u in graph.members("ops")] == ["alice", "bob"]
+        assert [g["name"] for g in graph.groups_of("ALICE@example.com")] == ["Administrators", "Ops"]
+        assert [g["name"] for g in graph.groups_of("ocid1.user.oc1..bob")] == ["Ops"]
+        assert graph.group_sizes()[0] == {"id": "ocid1.group.oc1..ops", "name": "Ops", "members": 2}
+        with pytest.raises(ValueError, match="Unknown group"):
+            graph.members("nobody")
+
+    def test_sync_applies_only_the_delta(self):
+        graph = MembershipGraph()
+        graph.sync(USERS, GROUPS, [_m(1, "alice", "admins"), _m(2, "bob", "ops")])
+
+        delta = graph.sync(
+            USERS, GROUPS, [_m(1, "alice", "admins"), _m(3, "bob", "admins", created="2024-06-01 00:00:00")]
+        )
+
+        assert delta == {"added": 1, "removed": 1, "created_since_last_load": 1}
+        assert graph.members("ops") == []
+        assert [u["name"] for u in graph.members("Administrators")] == ["alice", "bob"]
+        assert len(graph) == 2
+
+
+def _page(items):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = False
+    return response
+
+
+def _sdk(row):
+    m = MagicMock()
+    for k in ("id", "name", "description", "lifecycle_state", "email", "is_mfa_activated", "time_created"):
+        setattr(m, k, row.get(k, "ACTIVE" if k == "lifecycle_state" else None))
+    return m
+
+
+def _membership(row):
+    m = MagicMock()
+    for k, v in row.items():
+        setattr(m, k, v)
+    return m
+
+
+class TestMembershipGraphCache:
+    def _client(self, memberships):
+        client = MagicMock()
+        client.list_users.return_value = _page([_sdk(u) for u in USERS])
+        client.list_groups.return_value = _page([_sdk(g) for g in GROUPS])
+        client.list_user_group_memberships.side_effect = lambda group_id, **kw: _page(
+            [_membership(m) for m in memberships if m["group_id"] == group_id]
+        )
+        return client
+
+    def test_loads_per_group_then_refreshes_in_place(self):
+        memberships = [_m(1, "alice", "admins")]
+        client = self._client(memberships)
+        auth = MagicMock()
+        auth.profile = f"TEST-{uuid.uuid4()}"
+        auth.identity_client.return_value = client
+        cache = MembershipGraphCache(ttl=300.0)
+
+        with patch("src.oci_agent.membership.metadata") as metadata:
+            async def tenancy_id(auth):
+                return "ocid1.tenancy.oc1..t"
+
+            metadata.tenancy_id.side_effect = tenancy_id
+            graph = asyncio.run(cache.get(auth))
+            assert asyncio.run(cache.get(auth)) is graph
+            assert client.list_user_group_memberships.call_count == 2
+
+            memberships.append(_m(2, "bob", "ops", created="2024-02-01 00:00:00"))
+            refreshed = asyncio.run(cache.get(auth, refresh=True))
+
+        assert refreshed is graph
+        assert graph.last_delta["added"] == 1
+        assert [u["name"] for u in graph.members("Ops")] == ["bob"]
+
+
+class TestQueryGroupMembershipTool:
+    def test_members_of_group(self):
+        from src.oci_agent.tools.identity import query_group_membership
+
+        graph = MembershipGraph()
+        graph.sync(USERS, GROUPS, [_m(1, "alice", "admins")])
+
+        async def get(auth, refresh=False):
+            return graph
+
+        with (
+            patch("src.oci_agent.tools.identity.OCIAuth"),
+            patch("src.oci_agent.tools.identity.membership_graph") as cache,
+        ):
+            cache.get.side_effect = get
+            result = asyncio.run(query_group_membership.handler({"group": "Administrators"}))
+            missing = asyncio.run(query_group_membership.handler({"user": "carol"}))
+
+        assert [u["name"] for u in decode(result["content"][0]["text"])["members"]] == ["alice"]
+        assert missing["is_error"]
+
+    def test_refresh_is_not_served_from_the_response_cache(self):
+        from src.oci_agent.cache import ResponseCache
+        from src.oci_agent.tools.identity import query_group_membership
+
+        graph = MembershipGraph()
+        graph.sync(USERS, GROUPS, [_m(1, "alice", "admins")])
+        refreshes = []
+
+        async def get(auth, refresh=False):
+            refreshes.append(refresh)
+            return graph
+
+        tool = ResponseCache(ttl=60, max_entries=10).wrap(query_group_membership)
+        with (
+            patch("src.oci_agent.tools.identity.OCIAuth"),
+            patch("src.oci_agent.tools.identity.membership_graph") as cache,
+        ):
+            cache.get.side_effect = get
+            for _ in range(2):
+                asyncio.run(tool.handler({"group": "Administrators", "refresh": True}))
+            asyncio.run(tool.handler({"group": "Administrators"}))
+
+        assert refreshes == [True, True]
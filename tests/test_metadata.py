@@ -0,0 +1,83 @@
+"""Tests for the tenancy metadata cache."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from src.oci_agent.metadata import MetadataCache
+
+
+def _make_auth(profile="TEST", region=None, namespace="ns"):
+    auth = MagicMock()
+    auth.profile = profile
+    auth.region = region
+    auth.get_config.return_value = {"tenancy": "ocid1.tenancy.oc1..xxx", "region": "us-ashburn-1"}
+    auth.object_storage_client.return_value.get_namespace.return_value.data = namespace
+    return auth
+
+
+class TestMetadataCache:
+    def test_namespace_fetched_once(self):
+        cache = MetadataCache(ttl=60, path="")
+        auth = _make_auth()
+
+        async def go():
+            return [await cache.namespace(auth) for _ in range(3)]
+
+        assert asyncio.run(go()) == ["ns", "ns", "ns"]
+        assert auth.object_storage_client.return_value.get_namespace.call_count == 1
+
+    def test_expired_entries_are_refetched(self):
+        cache = MetadataCache(ttl=0, path="")
+        auth = _make_auth()
+
+        async def go():
+            await cache.namespace(auth)
+            await cache.namespace(auth)
+
+        asyncio.run(go())
+        assert auth.object_storage_client.return_value.get_namespace.call_count == 2
+
+    def test_persists_to_disk(self, tmp_path):
+        path = tmp_path / "metadata.json"
+        asyncio.run(MetadataCache(ttl=60, path=str(path)).namespace(_make_auth(namespace="persisted")))
+
+        fresh_auth = _make_auth(namespace="other")
+        assert asyncio.run(MetadataCache(ttl=60, path=str(path)).namespace(fresh_auth)) == "persisted"
+        fresh_auth.object_storage_client.return_value.get_namespace.assert_not_called()
+
+    def test_availability_domains_keyed_by_region(self):
+        cache = MetadataCache(ttl=60, path="")
+        auth = _make_auth()
+        ad = MagicMock()
+        ad.name = "Uocm:US-ASHBURN-AD-1"
+        auth.identity_client.return_value.list_availability_domains.return_value.data = [ad]
+
+        assert asyncio.run(cache.availability_domains(auth)) == ["Uocm:US-ASHBURN-AD-1"]
+        assert cache.get("TEST", "availability_domains:us-ashburn-1") == ["Uocm:US-ASHBURN-AD-1"]
+        assert cache.get("TEST", "tenancy_id") == "ocid1.tenancy.oc1..xxx"
+
+    def test_home_region(self):
+        cache = MetadataCache(ttl=60, path="")
+        auth = _make_auth()
+        home, other = MagicMock(), MagicMock()
+        home.region_name, home.is_home_region = "us-ashburn-1", True
+        other.region_name, other.is_home_region = "eu-frankfurt-1", False
+        auth.identity_client.return_value.list_region_subscriptions.return_value.data = [other, home]
+
+        assert asyncio.run(cache.home_region(auth)) == "us-ashburn-1"
+
+    def test_subscribed_regions_home_first_and_ready_only(self):
+        cache = MetadataCache(ttl=60, path="")
+        auth = _make_auth()
+        subs = []
+        for name, home, status in [
+            ("eu-frankfurt-1", False, "READY"),
+            ("us-ashburn-1", True, "READY"),
+            ("ap-tokyo-1", False, "IN_PROGRESS"),
+        ]:
+            s = MagicMock()
+            s.region_name, s.is_home_region, s.status = name, home, status
+            subs.append(s)
+        auth.identity_client.return_value.list_region_subscriptions.return_value.data = subs
+
+        assert asyncio.run(cache.subscribed_regions(auth)) == ["us-ashburn-1", "eu-frankfurt-1"]
@@ -0,0 +1,124 @@
+"""Tests for per-tool instrumentation."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import oci
+from claude_agent_sdk import SdkMcpTool
+
+from src.oci_agent.executor import run_blocking
+from src.oci_agent.metrics import ToolMetrics
+from src.oci_agent.ratelimit import RateLimitedClient, RateLimiter
+
+
+def _limited_client(fail_first=0):
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def list_things(**kwargs):
+        with lock:
+            calls["n"] += 1
+            if calls["n"] <= fail_first:
+                raise oci.exceptions.ServiceError(429, "TooManyRequests", {}, "slow down")
+        return MagicMock(data=[1, 2])
+
+    raw = MagicMock()
+    raw.list_things.side_effect = list_things
+    return RateLimitedClient(raw, "test", "r1", RateLimiter(rate=0, sleep=lambda s: None))
+
+
+def _tool(name, client, calls=1):
+    async def handler(args):
+        for _ in range(calls):
+            await run_blocking(client.list_things)
+        return {"content": [{"type": "text", "text": "x" * 400}]}
+
+    return SdkMcpTool(name=name, description=name, input_schema={}, handler=handler)
+
+
+class TestToolMetrics:
+    def test_attributes_requests_and_retries_to_each_tool(self):
+        metrics = ToolMetrics()
+        a = metrics.wrap(_tool("tool_a", _limited_client(fail_first=2)))
+        b = metrics.wrap(_tool("tool_b", _limited_client(), calls=3))
+
+        async def go():
+            await asyncio.gather(a.handler({}), b.handler({}), b.handler({}))
+
+        asyncio.run(go())
+
+        stats = metrics.stats()
+        assert stats["tools"]["tool_a"]["oci_requests"] == 3
+        assert stats["tools"]["tool_a"]["retries"] == 2
+        assert stats["tools"]["tool_a"]["oci_errors"] == 2
+        assert stats["tools"]["tool_b"]["calls"] == 2
+        assert stats["tools"]["tool_b"]["oci_requests"] == 6
+        assert stats["tools"]["tool_b"]["response_bytes"] == 800
+        assert stats["tools"]["tool_b"]["response_tokens"] == 200
+        assert stats["oci_requests"] == 9
+
+    def test_errors_are_counted(self):
+        metrics = ToolMetrics()
+
+        async def failing(args):
+            raise RuntimeError("boom")
+
+        async def error_result(args):
+            return {"content": [{"type": "text", "text": "bad"}], "is_error": True}
+
+        raising = metrics.wrap(SdkMcpTool(name="t", description="", input_schema={}, handler=failing))
+        erroring = metrics.wrap(SdkMcpTool(name="t", description="", input_schema={}, handler=error_result))
+
+        try:
+            asyncio.run(raising.handler({}))
+        except RuntimeError:
+            pass
+        asyncio.run(erroring.handler({}))
+
+        assert metrics.stats()["tools"]["t"]["errors"] == 2
+
+    def test_calls_outside_a_tool_are_not_attributed(self):
+        metrics = ToolMetrics()
+        client = _limited_client()
+
+        asyncio.run(run_blocking(client.list_things))
+
+        assert metrics.stats()["oci_requests"] == 0
+
+    def test_since_reports_only_the_calls_between_snapshots(self):
+        metrics = ToolMetrics()
+        a = metrics.wrap(_tool("tool_a", _limited_client()))
+        b = metrics.wrap(_tool("tool_b", _limited_client(), calls=2))
+        asyncio.run(a.handler({}))
+        before = metrics.stats()
+
+        asyncio.run(b.handler({}))
+        asyncio.run(b.handler({}))
+        delta = ToolMetrics.since(before, metrics.stats())
+
+        assert list(delta["tools"]) == ["tool_b"]
+        assert delta["tools"]["tool_b"]["calls"] == 2
+        assert delta["calls"] == 2 and delta["oci_requests"] == 4
+        assert "tool_a" not in metrics.summary(delta)
+
+    def test_summary_and_prometheus(self, tmp_path):
+        metrics = ToolMetrics()
+        tool = metrics.wrap(_tool("list_vcns", _limited_client()))
+        asyncio.run(tool.handler({}))
+        metrics.record_session(duration_ms=2500, duration_api_ms=1500, num_turns=3, total_cost_usd=0.0123)
+
+        summary = metrics.summary()
+        assert "session=2.5s model_api=1.5s" in summary
+        assert "cost=$0.0123" in summary
+        assert "list_vcns" in summary
+
+        path = tmp_path / "metrics.prom"
+        metrics.write_prometheus(str(path))
+        text = path.read_text()
+        assert "# TYPE oci_agent_tool_calls_total counter" in text
+        assert 'oci_agent_tool_calls_total{tool="list_vcns"} 1' in text
+        assert 'oci_agent_tool_oci_requests_total{tool="list_vcns"} 1' in text
+        assert 'oci_agent_tool_duration_seconds_bucket{tool="list_vcns",le="+Inf"} 1' in text
+        assert 'oci_agent_tool_duration_seconds_count{tool="list_vcns"} 1' in text
+        assert "oci_agent_session_num_turns 3" in text
@@ -0,0 +1,294 @@
+"""Tests for the security-list rule index and the exposure/reachability tools."""
+
+import asyncio
+import random
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.netindex import (
+    IntervalIndex,
+    SecurityRuleIndexCache,
+    VcnRuleIndex,
+    normalize_protocol,
+    rules_from_security_list,
+)
+from src.oci_agent.output import decode
+
+VCN = "ocid1.vcn.oc1..v"
+
+
+def _ports(low, high=None):
+    return SimpleNamespace(destination_port_range=SimpleNamespace(min=low, max=high or low), source_port_range=None)
+
+
+def _rule(cidr, protocol="6", ports=None, egress=False, description=None):
+    rule = SimpleNamespace(
+        protocol=protocol,
+        tcp_options=ports if protocol == "6" else None,
+        udp_options=ports if protocol == "17" else None,
+        icmp_options=None,
+        is_stateless=False,
+        description=description,
+    )
+    if egress:
+        rule.destination, rule.destination_type = cidr, "CIDR_BLOCK"
+    else:
+        rule.source, rule.source_type = cidr, "CIDR_BLOCK"
+    return rule
+
+
+def _sl(ocid, name, ingress=(), egress=()):
+    return SimpleNamespace(
+        id=ocid,
+        display_name=name,
+        compartment_id="ocid1.compartment.oc1..c",
+        ingress_security_rules=list(ingress),
+        egress_security_rules=list(egress),
+    )
+
+
+def _subnet(ocid, name, cidr, lists):
+    return SimpleNamespace(id=ocid, display_name=name, cidr_block=cidr, ipv6_cidr_blocks=None, security_list_ids=lists)
+
+
+PUBLIC = _sl(
+    "ocid1.securitylist.oc1..public",
+    "public",
+    ingress=[
+        _rule("0.0.0.0/0", ports=_ports(22), description="ssh"),
+        _rule("0.0.0.0/0", ports=_ports(443)),
+        _rule("10.0.0.0/16", protocol="all"),
+    ],
+    egress=[_rule("0.0.0.0/0", protocol="all", egress=True)],
+)
+PRIVATE = _sl(
+    "ocid1.securitylist.oc1..private",
+    "private",
+    ingress=[_rule("10.0.1.0/24", ports=_ports(5432)), _rule("0.0.0.0/0", protocol="1")],
+    egress=[_rule("10.0.0.0/16", ports=_ports(1, 65535), egress=True)],
+)
+SUBNETS = [
+    _subnet("ocid1.subnet.oc1..web", "web", "10.0.1.0/24", [PUBLIC.id]),
+    _subnet("ocid1.subnet.oc1..db", "db", "10.0.2.0/24", [PRIVATE.id]),
+]
+
+
+def _index():
+    from src.oci_agent.netindex import _make_security_list_entry, _make_subnet_entry
+
+    return VcnRuleIndex(
+        {"id": VCN, "display_name": "vcn", "compartment_id": "c"},
+        [_make_security_list_entry(sl) for sl in (PUBLIC, PRIVATE)],
+        [_make_subnet_entry(s) for s in SUBNETS],
+    )
+
+
+class TestIntervalIndex:
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        intervals = []
+        for i in range(300):
+            lo = rng.randrange(0, 10_000)
+            intervals.append((lo, lo + rng.randrange(0, 500), i))
+        index = IntervalIndex(intervals)
+        for _ in range(200):
+            lo = rng.randrange(0, 10_500)
+            hi = lo + rng.randrange(0, 50)
+            expected = {i for a, b, i in intervals if a <= hi and b >= lo}
+            assert set(index.overlapping(lo, hi)) == expected
+
+    def test_empty(self):
+        assert IntervalIndex([]).stab(5) == []
+
+
+class TestRuleNormalisation:
+    def test_protocols(self):
+        assert normalize_protocol("TCP") == "6"
+        assert normalize_protocol(17) == "17"
+        assert normalize_protocol(None) == "all"
+        with pytest.raises(ValueError):
+            normalize_protocol("smtp")
+
+    def test_ports_default_to_all(self):
+        rules = rules_from_security_list(PUBLIC)
+        assert [r.direction for r in rules] == ["ingress"] * 3 + ["egress"]
+        assert rules[0].ports == (22, 22)
+        assert rules[2].ports == (0, 65535)
+        assert rules[0].to_dict()["source"] == "0.0.0.0/0"
+        assert rules[0].to_dict()["protocol"] == "tcp"
+
+
+class TestVcnRuleIndex:
+    def test_internet_exposure_on_port(self):
+        index = _index()
+
+        found = index.query("ingress", "0.0.0.0/0", ports=(22, 22), protocol="6")
+
+        assert [(r.security_list_id, r.ports) for r in found] == [(PUBLIC.id, (22, 22))]
+        row = index.describe(found[0])
+        assert row["subnets"] == ["web"]
+        assert row["security_list_name"] == "public"
+
+    def test_contains_vs_overlaps(self):
+        index = _index()
+
+        contained = index.query("ingress", "10.0.1.7", ports=(5432, 5432))
+        overlapping = index.query("ingress", "10.0.0.0/8", ports=(5432, 5432), match="overlaps")
+
+        # The /16 "all" rule and the /24 postgres rule both admit 10.0.1.7.
+        assert {r.security_list_id for r in contained} == {PUBLIC.id, PRIVATE.id}
+        assert len(index.query("ingress", "10.0.0.0/8", ports=(5432, 5432))) == 0
+        assert len(overlapping) == 2
+
+    def test_icmp_rules_have_no_ports(self):
+        index = _index()
+        assert index.query("ingress", "0.0.0.0/0", protocol="1", security_list_ids=[PRIVATE.id])
+        assert not index.query("ingress", "0.0.0.0/0", ports=(80, 80), security_list_ids=[PRIVATE.id])
+
+    def test_subnet_lookup(self):
+        index = _index()
+        assert index.subnet_containing("10.0.2.9") == "ocid1.subnet.oc1..db"
+        assert index.subnet_containing("192.168.0.1") is None
+
+    def test_bad_direction(self):
+        with pytest.raises(ValueError, match="direction"):
+            _index().query("sideways")
+
+
+def _page(items):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = False
+    return response
+
+
+def _vn_client(lists=(PUBLIC, PRIVATE), subnets=SUBNETS):
+    client = MagicMock()
+    client.get_vcn.return_value = MagicMock(
+        data=SimpleNamespace(id=VCN, display_name="vcn", compartment_id="ocid1.compartment.oc1..c")
+    )
+    client.list_security_lists.return_value = _page(list(lists))
+    client.list_subnets.return_value = _page(list(subnets))
+    return client
+
+
+class TestSecurityRuleIndexCache:
+    def _auth(self, client):
+        auth = MagicMock()
+        auth.profile = f"TEST-{uuid.uuid4()}"
+        auth.region = None
+        auth.virtual_network_client.return_value = client
+        return auth
+
+    def test_revalidates_by_digest_after_ttl(self):
+        client = _vn_client()
+        auth = self._auth(client)
+        cache = SecurityRuleIndexCache(ttl=0.0)
+
+        first = asyncio.run(cache.get(auth, VCN))
+        second = asyncio.run(cache.get(auth, VCN))
+
+        assert second is first
+        assert cache.stats()["builds"] == 1
+        assert cache.stats()["revalidated"] == 1
+
+        closed = _sl(PUBLIC.id, "public", ingress=PUBLIC.ingress_security_rules[1:])
+        client.list_security_lists.return_value = _page([closed, PRIVATE])
+        third = asyncio.run(cache.get(auth, VCN))
+        assert third is not first
+        assert cache.stats()["builds"] == 2
+        assert not third.query("ingress", ports=(22, 22))
+
+    def test_fresh_entry_skips_oci(self):
+        client = _vn_client()
+        auth = self._auth(client)
+        cache = SecurityRuleIndexCache(ttl=300.0)
+
+        asyncio.run(cache.get(auth, VCN))
+        asyncio.run(cache.get(auth, VCN))
+
+        assert client.get_vcn.call_count == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_fetches_lists_from_other_compartments(self):
+        client = _vn_client(lists=[PUBLIC])
+        client.get_security_list.return_value = MagicMock(data=PRIVATE)
+        cache = SecurityRuleIndexCache(ttl=300.0)
+
+        index = asyncio.run(cache.get(self._auth(client), VCN))
+
+        client.get_security_list.assert_called_once_with(PRIVATE.id)
+        assert set(index.security_lists) == {PUBLIC.id, PRIVATE.id}
+
+
+class TestNetworkTools:
+    def _call(self, tool, args, client):
+        with patch("src.oci_agent.tools.network.OCIAuth") as MockAuth:
+            MockAuth.return_value.profile = f"TEST-{uuid.uuid4()}"
+            MockAuth.return_value.region = None
+            MockAuth.return_value.virtual_network_client.return_value = client
+            return asyncio.run(tool.handler(args))
+
+    def test_find_security_exposure(self):
+        from src.oci_agent.tools.network import find_security_exposure
+
+        result = self._call(find_security_exposure, {"vcn_id": VCN, "port": 22, "protocol": "tcp"}, _vn_client())
+
+        rows = decode(result["content"][0]["text"])
+        assert [(r["security_list_name"], r["ports"], r["subnets"]) for r in rows] == [("public", "22", ["web"])]
+
+    def test_find_security_exposure_needs_scope(self):
+        from src.oci_agent.tools.network import find_security_exposure
+
+        result = self._call(find_security_exposure, {"port": 22}, _vn_client())
+
+        assert result["is_error"]
+
+    def test_reachability(self):
+        from src.oci_agent.tools.network import check_security_reachability
+
+        web_to_db = self._call(
+            check_security_reachability,
+            {"vcn_id": VCN, "source": "10.0.1.5", "destination": "10.0.2.10", "port": 5432},
+            _vn_client(),
+        )
+        internet_to_db = self._call(
+            check_security_reachability,
+            {"vcn_id": VCN, "source": "0.0.0.0/0", "destination": "ocid1.subnet.oc1..db", "port": 5432},
+            _vn_client(),
+        )
+
+        allowed = decode(web_to_db["content"][0]["text"])
+        assert allowed["allowed"] is True
+        assert allowed["source_subnet"] == "web"
+        assert allowed["egress_rules"][0]["destination"] == "0.0.0.0/0"
+        assert decode(internet_to_db["content"][0]["text"])["allowed"] is False
+
+    def test_find_security_exposure_scans_only_available_vcns(self):
+        from src.oci_agent.tools.network import find_security_exposure
+
+        client = _vn_client()
+        client.list_vcns.return_value = _page([
+            SimpleNamespace(id=VCN, display_name="vcn", compartment_id="c", cidr_block="10.0.0.0/16",
+                            lifecycle_state="AVAILABLE", dns_label="vcn", time_created=None),
+        ])
+        result = self._call(find_security_exposure, {"compartment_id": "ocid1.compartment.oc1..c", "port": 22}, client)
+
+        assert not result.get("is_error"), result
+        assert client.list_vcns.call_args.kwargs["lifecycle_state"] == "AVAILABLE"
+
+    def test_repeat_refresh_revalidates_through_the_response_cache(self):
+        from src.oci_agent.cache import ResponseCache
+        from src.oci_agent.tools.network import find_security_exposure
+
+        client = _vn_client()
+        tool = ResponseCache(ttl=60, max_entries=10).wrap(find_security_exposure)
+        args = {"vcn_id": VCN, "port": 22, "refresh": True}
+        with patch("src.oci_agent.tools.network.security_rule_index", SecurityRuleIndexCache(ttl=300.0)):
+            self._call(tool, args, client)
+            self._call(tool, args, client)
+
+        assert client.list_security_lists.call_count == 2
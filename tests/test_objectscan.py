@@ -0,0 +1,242 @@
+"""Tests for streaming object listing and aggregation."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.objectscan import ObjectAggregate, size_bucket
+from src.oci_agent.output import decode
+
+
+def _obj(name, size=0, tier="Standard"):
+    o = MagicMock()
+    o.name = name
+    o.size = size
+    o.storage_tier = tier
+    o.md5 = "x"
+    o.etag = "e"
+    o.time_modified = "2024-01-01T00:00:00Z"
+    return o
+
+
+def _bucket_client(names_and_sizes, page_size=2, prefixes=()):
+    """A list_objects fake that honours prefix/start/end/limit like OCI does."""
+    calls = []
+    objects = sorted(names_and_sizes)
+
+    def list_objects(**kwargs):
+        calls.append(kwargs)
+        selected = [
+            (n, s) for n, s in objects
+            if n.startswith(kwargs.get("prefix", ""))
+            and n >= kwargs.get("start", "")
+            and ("end" not in kwargs or n < kwargs["end"])
+        ]
+        limit = min(kwargs.get("limit", page_size), page_size)
+        page, rest = selected[:limit], selected[limit:]
+        response = MagicMock()
+        response.data.objects = [_obj(n, s) for n, s in page]
+        response.data.prefixes = list(prefixes)
+        response.data.next_start_with = rest[0][0] if rest else None
+        return response
+
+    client = MagicMock()
+    client.get_namespace.return_value.data = "ns"
+    client.list_objects.side_effect = list_objects
+    return client, calls
+
+
+def _run(client, args):
+    with patch("src.oci_agent.tools.storage.OCIAuth") as MockAuth:
+        MockAuth.return_value.object_storage_client.return_value = client
+
+        from src.oci_agent.tools.storage import list_objects
+
+        return asyncio.run(list_objects.handler({"bucket_name": "logs", "namespace": "ns", **args}))
+
+
+LOGS = [
+    ("app/2024/a.log", 500),
+    ("app/2024/b.log", 2048),
+    ("app/2025/c.log", 5 << 20),
+    ("db/x.dump", 2 << 30),
+    ("readme", 10),
+]
+
+
+class TestObjectAggregate:
+    def test_groups_by_next_prefix_level(self):
+        agg = ObjectAggregate("prefix", "app/")
+        for name, size in LOGS[:3]:
+            agg.add(_obj(name, size))
+
+        result = agg.to_dict()
+        assert result["count"] == 3
+        assert [g["group"] for g in result["groups"]] == ["app/2025/", "app/2024/"]
+        assert result["groups"][1]["size_histogram"] == {"<1KiB": 1, "<1MiB": 1}
+
+    def test_merge_and_other_groups(self):
+        a, b = ObjectAggregate("storage_tier"), ObjectAggregate("storage_tier")
+        a.add(_obj("x", 10, "Standard"))
+        b.add(_obj("y", 20, "Archive"))
+        b.add(_obj("z", 5, "InfrequentAccess"))
+        a.merge(b)
+
+        result = a.to_dict(max_groups=1)
+        assert result["total_bytes"] == 35
+        assert result["groups"] == [
+            {"group": "Archive", "count": 1, "total_bytes": 20, "total_gb": 0.0, "size_histogram": {"<1KiB": 1}}
+        ]
+        assert result["other_groups"]["groups"] == 2
+        assert result["other_groups"]["count"] == 2
+
+    def test_size_buckets_and_bad_group(self):
+        assert size_bucket(0) == "<1KiB"
+        assert size_bucket(1 << 30) == ">=1GiB"
+        with pytest.raises(ValueError):
+            ObjectAggregate("owner")
+
+
+class TestListObjects:
+    def test_prefix_start_and_field_projection(self):
+        client, calls = _bucket_client(LOGS)
+
+        result = _run(client, {"prefix": "app/", "start": "app/2024/b", "fields": ["size"]})
+
+        assert decode(result["content"][0]["text"]) == [
+            {"name": "app/2024/b.log", "size": 2048},
+            {"name": "app/2025/c.log", "size": 5 << 20},
+        ]
+        assert calls[0]["prefix"] == "app/"
+        assert calls[0]["start"] == "app/2024/b"
+        assert calls[0]["fields"] == "name,size"
+
+    def test_delimiter_returns_prefixes(self):
+        client, calls = _bucket_client([("readme", 10)], prefixes=["app/", "db/"])
+
+        result = _run(client, {"delimiter": "/"})
+
+        data = decode(result["content"][0]["text"])
+        assert data["prefixes"] == ["app/", "db/"]
+        assert [o["name"] for o in data["objects"]] == ["readme"]
+        assert calls[0]["delimiter"] == "/"
+
+    def test_aggregate_streams_every_page_without_rows(self):
+        client, calls = _bucket_client(LOGS, page_size=2)
+
+        result = _run(client, {"aggregate": True})
+
+        data = decode(result["content"][0]["text"])
+        assert data["complete"] is True
+        assert data["count"] == 5
+        assert data["pages"] == 3
+        assert {g["group"]: g["count"] for g in data["groups"]} == {"app/": 3, "db/": 1, "": 1}
+        assert calls[0]["fields"] == "name,size,storageTier"
+        assert "objects" not in data
+
+
+def _scan(client, **kwargs):
+    from src.oci_agent.objectscan import scan_objects
+
+    return asyncio.run(scan_objects(client, "ns", "logs", **kwargs))
+
+
+def _delimited_client(objects, page_size=2):
+    """A list_objects fake that also implements delimiter='/' like OCI."""
+    import threading
+    import time
+
+    state = {"in_flight": 0, "peak": 0, "calls": []}
+    lock = threading.Lock()
+    names = sorted(objects)
+
+    def list_objects(**kwargs):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            state["calls"].append(kwargs)
+        time.sleep(0.01)
+        prefix = kwargs.get("prefix", "")
+        entries = []  # (sort key, object or None, prefix or None)
+        seen = set()
+        for n in names:
+            if not n.startswith(prefix) or n < kwargs.get("start", "") or ("end" in kwargs and n >= kwargs["end"]):
+                continue
+            rest = n[len(prefix):]
+            if kwargs.get("delimiter") and "/" in rest:
+                p = prefix + rest[: rest.index("/") + 1]
+                if p not in seen:
+                    seen.add(p)
+                    entries.append((n, None, p))
+                continue
+            entries.append((n, (n, objects[n]), None))
+        page, rest = entries[:page_size], entries[page_size:]
+        response = MagicMock()
+        response.data.objects = [_obj(*o) for _, o, _ in page if o]
+        response.data.prefixes = [p for _, _, p in page if p]
+        response.data.next_start_with = rest[0][0] if rest else None
+        with lock:
+            state["in_flight"] -= 1
+        return response
+
+    client = MagicMock()
+    client.list_objects.side_effect = list_objects
+    return client, state
+
+
+BIG = {f"{d}/{i:03d}.log": 100 for d in ("a", "b", "c", "d", "e") for i in range(6)}
+BIG["top.txt"] = 7
+
+
+class TestScanObjects:
+    def test_prefix_partitions_match_serial_totals(self):
+        client, state = _delimited_client(BIG)
+
+        result = _scan(client, max_workers=3)
+
+        assert result.mode == "prefix"
+        assert result.complete
+        summary = result.aggregate.to_dict()
+        assert summary["count"] == 31
+        assert summary["total_bytes"] == 30 * 100 + 7
+        assert {g["group"]: g["count"] for g in summary["groups"]} == {
+            "a/": 6, "b/": 6, "c/": 6, "d/": 6, "e/": 6, "": 1,
+        }
+        assert 1 < state["peak"] <= 3
+
+    def test_flat_key_space_uses_ranges(self):
+        flat = {f"{c}{i}": 1 for c in "0aAzZ~" for i in range(3)}
+        client, _ = _delimited_client(flat)
+
+        result = _scan(client, max_workers=4, group_by="none")
+
+        assert result.mode == "range"
+        assert result.complete
+        assert len(result.partitions) == 8
+        assert result.aggregate.total.count == len(flat)
+
+    def test_time_budget_reports_resume_keys(self):
+        client, _ = _delimited_client(BIG, page_size=1)
+
+        result = _scan(client, partition_by="prefix", time_budget=0.0)
+
+        assert not result.complete
+        assert any(p.get("next_start") for p in result.partitions)
+
+    def test_scan_bucket_usage_tool(self):
+        client, _ = _delimited_client(BIG)
+
+        from src.oci_agent.tools.storage import scan_bucket_usage
+
+        with patch("src.oci_agent.tools.storage.OCIAuth") as MockAuth:
+            MockAuth.return_value.object_storage_client.return_value = client
+            result = asyncio.run(
+                scan_bucket_usage.handler({"bucket_name": "logs", "namespace": "ns", "max_groups": 2})
+            )
+
+        data = decode(result["content"][0]["text"])
+        assert data["complete"] is True
+        assert data["count"] == 31
+        assert len(data["groups"]) == 2
+        assert data["other_groups"]["groups"] == 4
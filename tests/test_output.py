@@ -0,0 +1,98 @@
+"""Tests for the compact, token-budgeted tool output encoder."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from src.oci_agent.config import settings
+from src.oci_agent.output import decode, encode, estimate_tokens, output_store, render, tool_result
+from src.oci_agent.pagination import Pager
+from src.oci_agent.tools.results import continue_output
+
+
+def _rows(n):
+    return [
+        {"id": f"ocid1.instance.oc1..{i:04d}", "display_name": f"vm-{i}", "lifecycle_state": "RUNNING"}
+        for i in range(n)
+    ]
+
+
+class TestEncode:
+    def test_table_sends_keys_once_and_round_trips(self):
+        rows = _rows(50)
+        table = encode(rows, "table")
+
+        assert table.count('"display_name"') == 1
+        assert "\n" not in table
+        assert len(table) < len(encode(rows, "json")) < len(encode(rows, "pretty"))
+        assert decode(table) == rows
+
+    def test_nested_lists_and_missing_keys(self):
+        payload = {"count": 2, "items": [{"a": 1}, {"a": 2, "b": [{"x": 1}]}]}
+
+        assert decode(encode(payload, "table")) == {
+            "count": 2,
+            "items": [{"a": 1, "b": None}, {"a": 2, "b": [{"x": 1}]}],
+        }
+
+
+class TestBudget:
+    def test_under_budget_is_untouched(self):
+        text, trailer = render(_rows(3), max_tokens=10_000)
+
+        assert trailer is None
+        assert decode(text) == _rows(3)
+
+    def test_truncates_at_row_boundary_with_summary(self):
+        rows = _rows(200)
+        text, trailer = render(rows, max_tokens=500)
+
+        returned = decode(text)
+        assert estimate_tokens(text) <= 500
+        assert returned == rows[: len(returned)]
+        assert trailer["output_truncated"]["returned"] == len(returned)
+        assert trailer["output_truncated"]["omitted"] == 200 - len(returned)
+        assert trailer["output_truncated"]["omitted_by_lifecycle_state"] == {"RUNNING": 200 - len(returned)}
+
+    def test_dict_payload_cut_along_longest_list(self):
+        payload = {"snapshot": {"kind": "instance"}, "count": 200, "items": _rows(200)}
+        text, trailer = render(payload, max_tokens=400)
+
+        body = decode(text)
+        assert body["snapshot"] == {"kind": "instance"}
+        assert 0 < len(body["items"]) < 200
+        assert trailer is not None
+
+    def test_continue_output_pages_through_every_row(self):
+        rows = _rows(120)
+        result = tool_result(rows)
+        collected = decode(result["content"][0]["text"])
+        assert len(collected) == 120  # default budget fits
+
+        output_store.clear()
+        text, trailer = render(rows, max_tokens=300)
+        collected = decode(text)
+        while trailer and "output_token" in trailer:
+            result = asyncio.run(
+                continue_output.handler({"output_token": trailer["output_token"], "max_output_tokens": 300})
+            )
+            collected += decode(result["content"][0]["text"])
+            trailer = json.loads(result["content"][1]["text"])
+        assert collected == rows
+        assert len(output_store._entries) == 1
+
+    def test_paginated_and_truncated_keeps_both_hints(self, monkeypatch):
+        monkeypatch.setattr(settings, "output_max_tokens", 300)
+        response = MagicMock(data=_rows(200), has_next_page=True, next_page="p2")
+        pager = Pager(lambda **kwargs: response, max_items=200)
+        rows = asyncio.run(pager.collect(lambda r: r))
+
+        trailer = json.loads(tool_result(rows, pager)["content"][1]["text"])
+
+        assert trailer["next_page"] == "p2" and "page=<next_page>" in trailer["page_hint"]
+        assert "output_token" in trailer and "continue_output" in trailer["output_hint"]
+
+    def test_unknown_token_is_error(self):
+        result = asyncio.run(continue_output.handler({"output_token": "nope:3"}))
+
+        assert result["is_error"] is True
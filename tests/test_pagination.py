@@ -0,0 +1,138 @@
+"""Tests for the shared pagination engine."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+from src.oci_agent.output import decode
+from src.oci_agent.pagination import Pager
+
+
+def _page(items, next_page=None):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = next_page is not None
+    response.next_page = next_page
+    return response
+
+
+class FakeListCall:
+    """Serves *records* in pages of at most ``limit``, keyed by a numeric page token."""
+
+    def __init__(self, records, delay=0.0):
+        self.records = records
+        self.delay = delay
+        self.calls: list[dict] = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        time.sleep(self.delay)
+        start = int(kwargs.get("page") or 0)
+        end = start + kwargs["limit"]
+        chunk = self.records[start:end]
+        return _page(chunk, str(end) if end < len(self.records) else None)
+
+
+def _drain(pager):
+    async def go():
+        return [r async for r in pager]
+
+    return asyncio.run(go())
+
+
+class TestPager:
+    def test_follows_every_page(self):
+        call = FakeListCall(list(range(25)))
+        pager = Pager(call, page_size=10, compartment_id="c")
+
+        assert _drain(pager) == list(range(25))
+        assert pager.pages == 3
+        assert pager.continuation() is None
+        assert all(c["compartment_id"] == "c" for c in call.calls)
+
+    def test_clamps_limit_to_page_size(self):
+        call = FakeListCall(list(range(30)))
+        _drain(Pager(call, max_items=5000, page_size=10))
+
+        assert [c["limit"] for c in call.calls] == [10, 10, 10]
+
+    def test_max_items_stops_on_page_boundary(self):
+        call = FakeListCall(list(range(25)))
+        pager = Pager(call, max_items=12, page_size=10)
+
+        assert _drain(pager) == list(range(12))
+        assert [c["limit"] for c in call.calls] == [10, 2]
+        assert pager.continuation()["stopped_by"] == "max_items"
+        assert pager.next_page == "12"
+
+    def test_resumes_from_page_token(self):
+        call = FakeListCall(list(range(25)))
+        first = Pager(call, max_items=12, page_size=10)
+        _drain(first)
+
+        rest = _drain(Pager(call, page=first.next_page, page_size=10))
+
+        assert rest == list(range(12, 25))
+
+    def test_time_budget_stops_with_token(self):
+        call = FakeListCall(list(range(50)), delay=0.03)
+        pager = Pager(call, time_budget=0.05, page_size=10)
+
+        records = _drain(pager)
+
+        assert 0 < len(records) < 50
+        assert pager.continuation()["stopped_by"] == "time_budget"
+        assert pager.next_page == str(len(records))
+
+    def test_from_args_applies_default_cap(self):
+        with patch("src.oci_agent.pagination.settings") as mock_settings:
+            mock_settings.list_max_items = 7
+            mock_settings.list_page_size = 1000
+            mock_settings.list_time_budget_seconds = 60.0
+            pager = Pager.from_args(FakeListCall([]), {})
+
+        assert pager.max_items == 7
+        assert pager.page_size == 1000
+
+
+class TestListObjectsPagination:
+    def test_maps_next_start_with_to_start(self):
+        def obj(name):
+            o = MagicMock()
+            o.name = name
+            o.size = 1
+            o.time_modified = "2024-01-01T00:00:00Z"
+            o.md5 = "md5"
+            o.storage_tier = "Standard"
+            return o
+
+        pages = {
+            None: (["a", "b"], "c"),
+            "c": (["c", "d"], None),
+        }
+        calls = []
+
+        def list_objects(**kwargs):
+            calls.append(kwargs)
+            names, next_start = pages[kwargs.get("start")]
+            response = MagicMock()
+            response.data.objects = [obj(n) for n in names]
+            response.data.next_start_with = next_start
+            return response
+
+        mock_client = MagicMock()
+        mock_client.get_namespace.return_value.data = "ns"
+        mock_client.list_objects.side_effect = list_objects
+
+        with patch("src.oci_agent.tools.storage.OCIAuth") as MockAuth:
+            MockAuth.return_value.object_storage_client.return_value = mock_client
+
+            from src.oci_agent.tools.storage import list_objects as list_objects_tool
+
+            result = asyncio.run(list_objects_tool.handler({"bucket_name": "logs"}))
+
+        data = decode(result["content"][0]["text"])
+        assert [o["name"] for o in data] == ["a", "b", "c", "d"]
+        assert "start" not in calls[0]
+        assert calls[1]["start"] == "c"
+        assert len(result["content"]) == 1
@@ -0,0 +1,221 @@
+"""Tests for the IAM policy statement parser and inverted index."""
+
+import asyncio
+import json
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.oci_agent.compartments import CompartmentTree
+from src.oci_agent.output import decode
+from src.oci_agent.policies import PolicyIndexCache, build_policy_index, parse_statement, resource_covers
+
+TENANCY = "ocid1.tenancy.oc1..t"
+PROD = "ocid1.compartment.oc1..prod"
+NETWORK = "ocid1.compartment.oc1..network"
+DEV = "ocid1.compartment.oc1..dev"
+
+TREE = CompartmentTree(
+    TENANCY,
+    [
+        {"id": PROD, "name": "Prod", "compartment_id": TENANCY, "lifecycle_state": "ACTIVE"},
+        {"id": NETWORK, "name": "Network", "compartment_id": PROD, "lifecycle_state": "ACTIVE"},
+        {"id": DEV, "name": "Dev", "compartment_id": TENANCY, "lifecycle_state": "ACTIVE"},
+    ],
+)
+
+POLICIES = [
+    {
+        "id": "ocid1.policy.oc1..root",
+        "name": "root-policy",
+        "compartment_id": TENANCY,
+        "statements": [
+            "Allow group Administrators to manage all-resources in tenancy",
+            "Allow group 'Default'/'NetAdmins', group Ops to manage virtual-network-family "
+            "in compartment Prod:Network where request.user.mfaTotpVerified = 'true'",
+            "Allow group Auditors to inspect all-resources in tenancy",
+            "Allow any-user to read objects in compartment Dev",
+            "Define tenancy Partner as ocid1.tenancy.oc1..partner",
+            "this is not a policy statement",
+        ],
+    },
+    {
+        "id": "ocid1.policy.oc1..prod",
+        "name": "prod-policy",
+        "compartment_id": PROD,
+        "statements": [
+            "Allow group Developers to use instance-family in compartment Network",
+            "Allow dynamic-group Functions to {BUCKET_READ, OBJECT_READ} in compartment id " + DEV,
+            "Allow group id ocid1.group.oc1..ops to manage instances in compartment Network",
+        ],
+    },
+]
+
+
+class TestParseStatement:
+    def test_full_statement(self):
+        s = parse_statement(POLICIES[0]["statements"][1], compartment_id=TENANCY, tree=TREE)
+
+        assert s.action == "allow"
+        assert s.subjects == [
+            {"type": "group", "name": "NetAdmins", "domain": "Default"},
+            {"type": "group", "name": "Ops"},
+        ]
+        assert (s.verb, s.resource) == ("manage", "virtual-network-family")
+        assert s.location == "compartment Prod:Network"
+        assert s.location_id == NETWORK
+        assert s.conditions == "request.user.mfaTotpVerified = 'true'"
+
+    def test_location_is_relative_to_policy_compartment(self):
+        s = parse_statement(POLICIES[1]["statements"][0], compartment_id=PROD, tree=TREE)
+        assert s.location_id == NETWORK
+
+    def test_permissions_and_ids(self):
+        s = parse_statement(POLICIES[1]["statements"][1], compartment_id=PROD, tree=TREE)
+        assert s.permissions == ["BUCKET_READ", "OBJECT_READ"]
+        assert s.subjects == [{"type": "dynamic-group", "name": "Functions"}]
+        assert s.location_id == DEV
+
+        s = parse_statement(POLICIES[1]["statements"][2], compartment_id=PROD, tree=TREE)
+        assert s.subjects == [{"type": "group", "id": "ocid1.group.oc1..ops"}]
+
+    def test_admit_subject_in_other_tenancy(self):
+        s = parse_statement("Admit group Support of tenancy Partner to read instances in tenancy")
+        assert s.action == "admit"
+        assert s.subjects == [{"type": "group", "name": "Support", "tenancy": "Partner"}]
+
+    def test_not_a_statement(self):
+        assert parse_statement("hello world") is None
+        assert parse_statement("Allow group X to fly kites in tenancy") is None
+
+    def test_resource_families(self):
+        assert resource_covers("instance-family", "instances")
+        assert resource_covers("all-resources", "buckets")
+        assert not resource_covers("object-family", "instances")
+
+
+class TestPolicyIndex:
+    def setup_method(self):
+        self.index = build_policy_index(POLICIES, TREE)
+
+    def _groups(self, statements):
+        return sorted({s["name"] for st in statements for s in st.subjects if "name" in s})
+
+    def test_unparsed_and_define_statements(self):
+        assert len(self.index.statements) == 7
+        assert [u["statement"] for u in self.index.unparsed] == ["this is not a policy statement"]
+
+    def test_who_can_manage_instance_family_anywhere(self):
+        found = self.index.query(verb="manage", resource="instance-family")
+        assert self._groups(found) == ["Administrators"]
+
+    def test_verbs_are_cumulative(self):
+        found = self.index.query(verb="use", resource="instances")
+        assert self._groups(found) == ["Administrators", "Developers"]
+        assert len(self.index.query(verb="inspect", resource="instances")) == 4
+
+    def test_group_in_compartment(self):
+        in_network = self.index.query(group="Ops", compartment_id=NETWORK)
+        in_dev = self.index.query(group="Ops", compartment_id=DEV)
+
+        assert [s.resource for s in in_network] == ["virtual-network-family"]
+        # any-user grants apply to every group.
+        assert [s.resource for s in in_dev] == ["objects"]
+
+    def test_group_by_name_or_ocid(self):
+        found = self.index.query(group=["ocid1.group.oc1..ops", "Ops"], resource="instances")
+        assert [s.policy_name for s in found] == ["prod-policy"]
+
+    def test_conditional_statements_can_be_excluded(self):
+        with_conditions = self.index.query(group="NetAdmins")
+        without = self.index.query(group="NetAdmins", include_conditional=False)
+
+        assert [s.resource for s in with_conditions] == ["virtual-network-family", "objects"]
+        assert [s.resource for s in without] == ["objects"]
+
+    def test_bad_verb(self):
+        with pytest.raises(ValueError, match="verb"):
+            self.index.query(verb="own")
+
+
+def _page(items):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = False
+    return response
+
+
+def _policy(p):
+    m = MagicMock()
+    m.id = p["id"]
+    m.name = p["name"]
+    m.description = ""
+    m.lifecycle_state = "ACTIVE"
+    m.statements = p["statements"]
+    m.time_created = "2024-01-01"
+    return m
+
+
+def _identity_client():
+    client = MagicMock()
+    by_compartment = {p["compartment_id"]: [_policy(p)] for p in POLICIES}
+    client.list_policies.side_effect = lambda compartment_id, **kw: _page(by_compartment.get(compartment_id, []))
+    return client
+
+
+class TestQueryPoliciesTool:
+    def test_fetches_tree_once_and_queries(self):
+        from src.oci_agent.tools.identity import query_policies
+
+        client = _identity_client()
+        cache = PolicyIndexCache(ttl=300.0)
+        with (
+            patch("src.oci_agent.tools.identity.OCIAuth") as MockAuth,
+            patch("src.oci_agent.tools.identity.policy_index", cache),
+            patch("src.oci_agent.policies.compartment_index") as index,
+        ):
+            MockAuth.return_value.profile = f"TEST-{uuid.uuid4()}"
+            MockAuth.return_value.identity_client.return_value = client
+
+            async def get_tree(auth, refresh=False):
+                return TREE
+
+            index.get.side_effect = get_tree
+            first = asyncio.run(query_policies.handler({"verb": "manage", "resource": "instance-family"}))
+            second = asyncio.run(query_policies.handler({"group": "Developers"}))
+
+        assert client.list_policies.call_count == 4  # one per compartment, first call only
+        rows = decode(first["content"][0]["text"])
+        assert [r["policy_name"] for r in rows] == ["root-policy"]
+        assert rows[0]["location_path"] == "/"
+        assert "Prod/Network" in [r["location_path"] for r in decode(second["content"][0]["text"])]
+        meta = json.loads(first["content"][1]["text"])
+        assert meta["statements_indexed"] == 7
+        assert meta["unparsed_statements"] == 1
+
+    def test_repeat_refresh_rebuilds_the_index_through_the_response_cache(self):
+        from src.oci_agent.cache import ResponseCache
+        from src.oci_agent.tools.identity import query_policies
+
+        client = _identity_client()
+        tool = ResponseCache(ttl=60, max_entries=10).wrap(query_policies)
+        with (
+            patch("src.oci_agent.tools.identity.OCIAuth") as MockAuth,
+            patch("src.oci_agent.tools.identity.policy_index", PolicyIndexCache(ttl=300.0)),
+            patch("src.oci_agent.policies.compartment_index") as index,
+        ):
+            MockAuth.return_value.profile = f"TEST-{uuid.uuid4()}"
+            MockAuth.return_value.identity_client.return_value = client
+
+            async def get_tree(auth, refresh=False):
+                return TREE
+
+            index.get.side_effect = get_tree
+            args = {"verb": "manage", "resource": "instance-family"}
+            asyncio.run(tool.handler(args))
+            asyncio.run(tool.handler({**args, "refresh": True}))
+            asyncio.run(tool.handler({**args, "refresh": True}))
+            asyncio.run(tool.handler(args))
+
+        assert client.list_policies.call_count == 12  # initial build plus two rebuilds, then a cache hit
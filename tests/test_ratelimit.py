@@ -0,0 +1,150 @@
+"""Tests for the shared OCI rate limiter and retry engine."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import oci
+import pytest
+
+from src.oci_agent.ratelimit import (
+    BACKOFF_MAX_SECONDS,
+    RateLimitedClient,
+    RateLimiter,
+    TokenBucket,
+    _backoff_delay,
+)
+
+
+def _service_error(status, code="Error", headers=None):
+    return oci.exceptions.ServiceError(status, code, headers or {}, f"{code} message")
+
+
+class _Sleeps(list):
+    def __call__(self, seconds):
+        self.append(seconds)
+
+
+class TestBackoffDelay:
+    def test_retry_after_seconds(self):
+        assert _backoff_delay(_service_error(429, headers={"retry-after": "2"}), 0) == 2.0
+
+    def test_retry_after_http_date(self):
+        from email.utils import formatdate
+
+        header = formatdate(time.time() + 5, usegmt=True)
+        assert 3 <= _backoff_delay(_service_error(429, headers={"retry-after": header}), 0) <= 5
+
+    def test_delay_is_capped(self):
+        assert _backoff_delay(_service_error(429, headers={"retry-after": "3600"}), 0) == BACKOFF_MAX_SECONDS
+        assert _backoff_delay(_service_error(503), 20) <= BACKOFF_MAX_SECONDS
+
+
+class TestTokenBucket:
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=10, burst=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_throttle_halves_rate_and_success_recovers(self):
+        bucket = TokenBucket(rate=10, burst=1)
+
+        bucket.throttled(None)
+        bucket.throttled(None)
+        assert bucket.rate == 2.5
+        for _ in range(100):
+            bucket.succeeded()
+        assert bucket.rate == 10
+
+    def test_retry_after_pauses_bucket(self):
+        bucket = TokenBucket(rate=1000, burst=10)
+
+        bucket.throttled(2.0)
+
+        assert 1.9 < bucket.reserve() <= 2.0
+
+
+class TestRateLimiter:
+    def test_retries_throttled_call_and_records_metrics(self):
+        sleeps = _Sleeps()
+        limiter = RateLimiter(rate=0, max_attempts=5, sleep=sleeps)
+        fn = MagicMock(side_effect=[_service_error(429), _service_error(429), "ok"])
+
+        assert limiter.call("compute", "r1", "list_instances", fn) == "ok"
+
+        stats = limiter.stats()
+        assert fn.call_count == 3
+        assert stats["throttled"] == 2 and stats["retries"] == 2 and stats["requests"] == 3
+        assert stats["backoff_seconds"] == pytest.approx(sum(sleeps), abs=0.001)
+
+    def test_retry_after_is_waited_once_through_the_bucket(self):
+        sleeps = _Sleeps()
+        limiter = RateLimiter(rate=1000, burst=10, sleep=sleeps)
+        fn = MagicMock(side_effect=[_service_error(429, headers={"retry-after": "3"}), "ok"])
+
+        assert limiter.call("compute", "r1", "get_instance", fn) == "ok"
+
+        assert len(sleeps) == 1 and 2.9 < sleeps[0] <= 3.0
+        assert limiter.stats()["clients"]["compute/r1"]["rate"] < 1000
+
+    def test_writes_are_not_replayed_on_5xx(self):
+        limiter = RateLimiter(rate=0, sleep=lambda s: None)
+        fn = MagicMock(side_effect=_service_error(503))
+
+        with pytest.raises(oci.exceptions.ServiceError):
+            limiter.call("compute", "r1", "instance_action", fn)
+        assert fn.call_count == 1
+
+        reads = MagicMock(side_effect=[oci.exceptions.RequestException("reset"), _service_error(502), "ok"])
+        assert limiter.call("compute", "r1", "get_instance", reads) == "ok"
+
+    def test_gives_up_after_max_attempts_and_skips_non_retryable(self):
+        limiter = RateLimiter(rate=0, max_attempts=3, sleep=lambda s: None)
+        throttled = MagicMock(side_effect=_service_error(429))
+        missing = MagicMock(side_effect=_service_error(404))
+
+        with pytest.raises(oci.exceptions.ServiceError):
+            limiter.call("compute", "r1", "list_instances", throttled)
+        with pytest.raises(oci.exceptions.ServiceError):
+            limiter.call("compute", "r1", "get_instance", missing)
+
+        assert throttled.call_count == 3
+        assert missing.call_count == 1
+        assert limiter.stats()["failed"] == 2
+
+    def test_buckets_are_per_service_and_region(self):
+        limiter = RateLimiter(rate=5, burst=1, sleep=lambda s: None)
+        limiter.call("compute", "r1", "list_instances", lambda: None)
+        limiter.call("compute", "r2", "list_instances", lambda: None)
+        limiter.call("identity", "r1", "list_users", lambda: None)
+
+        assert set(limiter.stats()["clients"]) == {"compute/r1", "compute/r2", "identity/r1"}
+        assert limiter.stats()["queued_seconds"] == 0
+
+
+class TestRateLimitedClient:
+    def test_proxies_operations_through_limiter(self):
+        inner = MagicMock()
+        inner.list_instances.return_value = "page"
+        inner.base_client = "base"
+        limiter = RateLimiter(rate=0)
+        client = RateLimitedClient(inner, "compute", "r1", limiter)
+
+        assert client.list_instances(compartment_id="c") == "page"
+        assert client.base_client == "base"
+        inner.list_instances.assert_called_once_with(compartment_id="c")
+        assert limiter.stats()["requests"] == 1
+
+    def test_oci_auth_wraps_clients_and_disables_sdk_retries(self):
+        from src.oci_agent.auth import OCIAuth, registry
+
+        registry.clear()
+        factory = MagicMock()
+        with patch.object(registry, "get_config", return_value={"region": "us-ashburn-1"}):
+            client = OCIAuth("TEST-RL")._client("compute", factory)
+        registry.clear()
+
+        assert isinstance(client, RateLimitedClient)
+        assert client.wrapped is factory.return_value
+        assert isinstance(factory.call_args.kwargs["retry_strategy"], oci.retry.NoneRetryStrategy)
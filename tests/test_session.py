@@ -0,0 +1,120 @@
+"""Tests for the interactive multi-turn session."""
+
+import asyncio
+import io
+import os
+import signal
+from types import SimpleNamespace
+
+from src.oci_agent.session import InteractiveSession
+
+
+class FakeClient:
+    def __init__(self, n):
+        self.n = n
+        self.queries = []
+        self.disconnected = False
+        self.interrupted = asyncio.Event()
+
+    async def disconnect(self):
+        self.disconnected = True
+
+    async def interrupt(self):
+        self.interrupted.set()
+
+
+def _result(is_error=False):
+    return SimpleNamespace(is_error=is_error, result="stopped" if is_error else "ok", duration_ms=5,
+                           duration_api_ms=4, num_turns=1, total_cost_usd=0.002)
+
+
+class FakeAgent:
+    """Stands in for OCIAgent; "interrupt me" and "stuck" send themselves SIGINT."""
+
+    profile = "DEFAULT"
+    model = "test-model"
+    stats = True
+
+    def __init__(self):
+        self.clients = []
+        self.reports = 0
+
+    async def connect(self):
+        self.clients.append(FakeClient(len(self.clients)))
+        return self.clients[-1]
+
+    async def ask(self, client, query, on_text):
+        client.queries.append(query)
+        if query == "interrupt me":
+            on_text("partial")
+            os.kill(os.getpid(), signal.SIGINT)
+            await client.interrupted.wait()
+            return _result(is_error=True)
+        if query == "stuck":
+            os.kill(os.getpid(), signal.SIGINT)
+            await client.interrupted.wait()
+            os.kill(os.getpid(), signal.SIGINT)
+            await asyncio.Event().wait()
+        on_text(f"[{client.n}#{len(client.queries)}] {query}")
+        return _result()
+
+    def report(self):
+        self.reports += 1
+
+
+def _run(lines, first_query=None):
+    agent, out, err = FakeAgent(), io.StringIO(), io.StringIO()
+    inputs = iter(lines)
+
+    def read_line(prompt):
+        try:
+            return next(inputs)
+        except StopIteration:
+            raise EOFError from None
+
+    session = InteractiveSession(agent, first_query=first_query, read_line=read_line, out=out, err=err)
+    asyncio.run(session.run())
+    return agent, out.getvalue(), err.getvalue()
+
+
+def test_turns_share_one_client():
+    agent, out, err = _run(["first", "", "second"], first_query="zeroth")
+
+    assert len(agent.clients) == 1
+    assert agent.clients[0].queries == ["zeroth", "first", "second"]
+    assert "[0#3] second" in out
+    assert "[turn 3:" in err and "$0.0020" in err
+    assert agent.clients[0].disconnected and agent.reports == 1
+
+
+def test_new_conversation_and_exit():
+    agent, out, err = _run(["one", "/new", "two", "/stats", "/exit", "never"])
+
+    assert [c.queries for c in agent.clients] == [["one"], ["two"]]
+    assert agent.clients[0].disconnected
+    assert "[1#1] two" in out and "never" not in out
+    assert "[new conversation]" in err
+
+
+def test_ctrl_c_interrupts_the_turn_and_keeps_the_conversation():
+    agent, out, err = _run(["interrupt me", "after"])
+
+    assert len(agent.clients) == 1 and agent.clients[0].interrupted.is_set()
+    assert "partial" in out and "[0#2] after" in out
+    assert "[Error]" not in out
+    assert "interrupting" in err
+
+
+def test_second_ctrl_c_abandons_the_turn():
+    agent, out, err = _run(["stuck", "after"])
+
+    assert len(agent.clients) == 2 and agent.clients[0].disconnected
+    assert "[1#1] after" in out
+    assert "turn abandoned" in err
+
+
+def test_ctrl_c_at_the_prompt_does_not_exit():
+    session = InteractiveSession(FakeAgent(), out=io.StringIO(), err=io.StringIO())
+    session.cancel()
+
+    assert "/exit" in session.err.getvalue()
@@ -0,0 +1,78 @@
+"""Import-time guards for CLI start-up.
+
+Each check runs a fresh interpreter under ``-X importtime`` and inspects
+which modules were loaded and what they cost. The package's own import time
+must stay under ``OCI_STARTUP_BUDGET_MS`` (default 300); the ``oci`` SDK must
+not be imported until a tool builds a client.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src.oci_agent import auth
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET_MS = float(os.environ.get("OCI_STARTUP_BUDGET_MS", "300"))
+
+
+def _import_profile(*args: str) -> dict[str, tuple[int, int]]:
+    """Run ``python -X importtime *args`` and return ``{module: (self_us, cumulative_us)}``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():
+            profile[name.strip()] = (int(own), int(cumulative))
+    return profile
+
+
+def _loaded(profile: dict, package: str) -> list[str]:
+    return [m for m in profile if m == package or m.startswith(package + ".")]
+
+
+def test_agent_import_does_not_load_the_oci_sdk():
+    profile = _import_profile("-c", "import src.oci_agent.agent")
+
+    assert "src.oci_agent.agent" in profile
+    assert _loaded(profile, "oci") == []
+
+
+def test_agent_import_within_budget():
+    profile = _import_profile("-c", "import src.oci_agent.agent")
+
+    own_ms = sum(own for name, (own, _) in profile.items() if name.startswith("src.")) / 1000
+    assert own_ms < BUDGET_MS, f"package modules took {own_ms:.0f}ms to import (budget {BUDGET_MS:.0f}ms)"
+
+
+def test_help_and_thin_client_load_neither_sdk():
+    for args in (["main.py", "--help"], ["-c", "import src.oci_agent.daemon"]):
+        profile = _import_profile(*args)
+
+        assert _loaded(profile, "oci") == [], args
+        assert _loaded(profile, "claude_agent_sdk") == [], args
+
+
+def test_inventory_refresh_path_does_not_load_the_agent_sdk():
+    profile = _import_profile("-c", "import src.oci_agent.inventory")
+
+    assert _loaded(profile, "claude_agent_sdk") == []
+
+
+def test_preload_imports_the_client_modules():
+    thread = auth.preload_sdk()
+    if thread is not None:
+        thread.join(60)
+
+    assert all(name in sys.modules for name in auth.SDK_MODULES)
+    assert auth.preload_sdk() is None
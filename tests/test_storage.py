@@ -0,0 +1,153 @@
+"""Tests for storage tools."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import oci
+
+from src.oci_agent.output import decode
+from src.oci_agent.ratelimit import RateLimitedClient, RateLimiter
+
+
+def _make_mock_summary(name, created_by="ocid1.user.oc1..alice"):
+    s = MagicMock()
+    s.name = name
+    s.created_by = created_by
+    return s
+
+
+def _make_mock_bucket(name, size, count=10, created_by="ocid1.user.oc1..alice"):
+    b = MagicMock()
+    b.name = name
+    b.created_by = created_by
+    b.approximate_size = size
+    b.approximate_count = count
+    b.storage_tier = "Standard"
+    b.time_created = "2024-01-01T00:00:00Z"
+    return b
+
+
+def _list_response(items):
+    response = MagicMock()
+    response.data = items
+    response.has_next_page = False
+    response.next_page = None
+    return response
+
+
+def _service_error(status, code="Error"):
+    return oci.exceptions.ServiceError(status, code, {}, f"{code} message")
+
+
+class TestGetBucketSizesByUser:
+    def _run(self, mock_client, args=None):
+        with patch("src.oci_agent.tools.storage.OCIAuth") as MockAuth:
+            MockAuth.return_value.object_storage_client.return_value = mock_client
+
+            from src.oci_agent.tools.storage import get_bucket_sizes_by_user
+
+            result = asyncio.run(
+                get_bucket_sizes_by_user.handler(args or {"compartment_id": "ocid1.compartment.oc1..xxx"})
+            )
+        return decode(result["content"][0]["text"])
+
+    def test_groups_sizes_by_creator(self):
+        buckets = {
+            "a": _make_mock_bucket("a", 1024),
+            "b": _make_mock_bucket("b", 4096, created_by="ocid1.user.oc1..bob"),
+            "c": _make_mock_bucket("c", 2048),
+        }
+        mock_client = MagicMock()
+        mock_client.get_namespace.return_value.data = "ns"
+        mock_client.list_buckets.return_value = _list_response([_make_mock_summary(n) for n in buckets])
+        mock_client.get_bucket.side_effect = lambda **kw: MagicMock(data=buckets[kw["bucket_name"]])
+
+        data = self._run(mock_client)
+
+        assert data["total_buckets"] == 3
+        assert [u["created_by"] for u in data["by_user"]] == ["ocid1.user.oc1..bob", "ocid1.user.oc1..alice"]
+        assert data["by_user"][1]["total_bytes"] == 3072
+        assert "failed_buckets" not in data
+        assert mock_client.get_bucket.call_args.kwargs["fields"] == ["approximateSize", "approximateCount"]
+
+    def test_fetches_details_concurrently(self):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def get_bucket(**kw):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return MagicMock(data=_make_mock_bucket(kw["bucket_name"], 1))
+
+        mock_client = MagicMock()
+        mock_client.get_namespace.return_value.data = "ns"
+        mock_client.list_buckets.return_value = _list_response([_make_mock_summary(f"b{i}") for i in range(12)])
+        mock_client.get_bucket.side_effect = get_bucket
+
+        data = self._run(mock_client, {"compartment_id": "ocid1.compartment.oc1..xxx", "max_concurrency": 3})
+
+        assert data["by_user"][0]["bucket_count"] == 12
+        assert 1 < peak <= 3
+
+    def test_retries_throttled_and_reports_failures(self):
+        attempts: dict[str, int] = {}
+
+        def get_bucket(**kw):
+            name = kw["bucket_name"]
+            attempts[name] = attempts.get(name, 0) + 1
+            if name == "throttled" and attempts[name] == 1:
+                raise _service_error(429, "TooManyRequests")
+            if name == "gone":
+                raise _service_error(404, "BucketNotFound")
+            return MagicMock(data=_make_mock_bucket(name, 100))
+
+        mock_client = MagicMock()
+        mock_client.get_namespace.return_value.data = "ns"
+        mock_client.list_buckets.return_value = _list_response(
+            [_make_mock_summary(n) for n in ("ok", "throttled", "gone")]
+        )
+        mock_client.get_bucket.side_effect = get_bucket
+        limiter = RateLimiter(rate=0, sleep=lambda seconds: None)
+
+        data = self._run(RateLimitedClient(mock_client, "object_storage", "us-ashburn-1", limiter))
+
+        assert attempts["throttled"] == 2
+        assert limiter.stats()["throttled"] == 1
+        assert attempts["gone"] == 1
+        assert data["by_user"][0]["bucket_count"] == 2
+        assert data["failed_buckets"] == [
+            {"name": "gone", "status": 404, "code": "BucketNotFound", "message": "BucketNotFound message"}
+        ]
+
+    def test_transport_errors_become_failures(self):
+        def get_bucket(**kw):
+            if kw["bucket_name"] == "timeout":
+                raise oci.exceptions.RequestException("timeout")
+            if kw["bucket_name"] == "garbled":
+                raise ValueError("unexpected payload")
+            return MagicMock(data=_make_mock_bucket(kw["bucket_name"], 100))
+
+        mock_client = MagicMock()
+        mock_client.get_namespace.return_value.data = "ns"
+        mock_client.list_buckets.return_value = _list_response(
+            [_make_mock_summary(n) for n in ("ok", "timeout", "garbled")]
+        )
+        mock_client.get_bucket.side_effect = get_bucket
+        limiter = RateLimiter(rate=0, sleep=lambda seconds: None)
+
+        data = self._run(RateLimitedClient(mock_client, "object_storage", "us-ashburn-1", limiter))
+
+        assert data["total_buckets"] == 3
+        assert data["fetched_buckets"] == 1
+        assert [(f["name"], f["code"]) for f in data["failed_buckets"]] == [
+            ("garbled", "ValueError"),
+            ("timeout", "RequestException"),
+        ]